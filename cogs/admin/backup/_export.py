@@ -0,0 +1,214 @@
+# cogs/admin/backup/_export.py
+from __future__ import annotations
+
+import asyncio
+import gzip
+import html
+import json
+import os
+from dataclasses import dataclass
+
+import discord
+
+from configs.config_logging import logging
+from utils.utils_json import load_json, save_json
+
+EXPORT_DIR = "database/exports"
+CURSOR_FILE = "database/export_cursors.json"
+
+EXPORT_FORMATS = ("jsonl", "html")
+BATCH_SIZE = 500                 # messages per compressed chunk / cursor save
+ATTACHMENT_CONCURRENCY = 4       # parallel attachment downloads
+MAX_MESSAGE_CHARS = 2000
+
+_HTML_HEAD = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>#{name}</title>
+<style>
+body{{font-family:sans-serif;background:#313338;color:#dbdee1}}
+.m{{padding:4px 8px}} .a{{font-weight:bold;color:#fff}} .t{{color:#949ba4;font-size:.8em}}
+.c{{white-space:pre-wrap}} a{{color:#00a8fc}}
+</style></head><body>
+<h2>#{name}</h2>
+"""
+
+
+@dataclass
+class ExportResult:
+    path: str
+    exported: int
+    total: int
+    attachments_saved: int
+
+
+def export_path(channel_id: int, fmt: str) -> str:
+    return os.path.join(EXPORT_DIR, f"{channel_id}.{fmt}.gz")
+
+
+def _attachment_dir(channel_id: int) -> str:
+    return os.path.join(EXPORT_DIR, f"{channel_id}_attachments")
+
+
+def _record(m: discord.Message, saved: dict[int, str]) -> dict:
+    return {
+        "id": m.id,
+        "channel_id": m.channel.id,
+        "author_id": m.author.id,
+        "author": m.author.name,
+        "created_at": m.created_at.isoformat(),
+        "edited_at": m.edited_at.isoformat() if m.edited_at else None,
+        "content": m.content,
+        "reply_to": m.reference.message_id if m.reference else None,
+        "embeds": len(m.embeds),
+        "attachments": [
+            {"filename": a.filename, "url": a.url, "size": a.size, "saved": saved.get(a.id)}
+            for a in m.attachments
+        ],
+    }
+
+
+def _html_row(rec: dict) -> str:
+    files = "".join(
+        f'<br><a href="{html.escape(a["saved"] or a["url"])}">{html.escape(a["filename"])}</a>'
+        for a in rec["attachments"]
+    )
+    return (
+        f'<div class="m" id="m{rec["id"]}"><span class="a">{html.escape(rec["author"])}</span> '
+        f'<span class="t">{rec["created_at"]}</span>'
+        f'<div class="c">{html.escape(rec["content"])}{files}</div></div>\n'
+    )
+
+
+def _append_chunk(path: str, text: str) -> int:
+    # Each batch is its own gzip member, so `gzip.open(path)` reads the
+    # concatenated members back as one stream. Returns the new file length,
+    # which the cursor records once the batch is durable.
+    with open(path, "ab") as f:
+        f.write(gzip.compress(text.encode("utf-8")))
+        f.flush()
+        os.fsync(f.fileno())
+        return f.tell()
+
+
+def _reset_file(path: str, size: int) -> None:
+    """Cut the transcript back to `size` bytes (0 = start over)."""
+    with open(path, "r+b" if size else "wb") as f:
+        f.truncate(size)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+async def _save_attachments(
+    messages: list[discord.Message], channel_id: int, sem: asyncio.Semaphore
+) -> dict[int, str]:
+    folder = _attachment_dir(channel_id)
+    os.makedirs(folder, exist_ok=True)
+    saved: dict[int, str] = {}
+
+    async def fetch(a: discord.Attachment) -> None:
+        path = os.path.join(folder, f"{a.id}_{a.filename}")
+        if not os.path.exists(path):
+            async with sem:
+                try:
+                    await a.save(path)
+                except (discord.HTTPException, OSError) as e:
+                    logging.warning(f"[Export] Attachment {a.id} download failed: {e}")
+                    return
+        saved[a.id] = path
+
+    await asyncio.gather(*(fetch(a) for m in messages for a in m.attachments))
+    return saved
+
+
+async def export_channel(
+    channel: discord.TextChannel,
+    fmt: str = "jsonl",
+    *,
+    download_attachments: bool = False,
+) -> ExportResult:
+    """
+    Stream a channel's full history (oldest first) into a gzip'd JSONL or HTML
+    transcript under EXPORT_DIR. A per-channel cursor (last exported message id
+    and the transcript's length at that point) is saved after every batch, so
+    re-running continues where the last run stopped and later runs only append
+    new messages.
+
+    Crash safety: on resume the file is cut back to the cursor's length, which
+    drops a batch that was written but never recorded. Without a usable cursor
+    the transcript is rewritten from scratch instead of appended to.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"format must be one of {EXPORT_FORMATS}")
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+
+    key = f"{channel.id}:{fmt}"
+    path = export_path(channel.id, fmt)
+    cursors = load_json(CURSOR_FILE, default_value={})
+    cursor = cursors.get(key) if os.path.exists(path) else None
+    if cursor and not 0 < cursor.get("bytes", 0) <= os.path.getsize(path):
+        cursor = None  # no recorded length, or the file is shorter than recorded
+    last_id = cursor["last_id"] if cursor else None
+    total = cursor["count"] if cursor else 0
+
+    await asyncio.to_thread(_reset_file, path, cursor["bytes"] if cursor else 0)
+    if fmt == "html" and cursor is None:
+        await asyncio.to_thread(_append_chunk, path, _HTML_HEAD.format(name=html.escape(channel.name)))
+
+    sem = asyncio.Semaphore(ATTACHMENT_CONCURRENCY)
+    exported = attachments_saved = 0
+    batch: list[discord.Message] = []
+
+    async def flush() -> None:
+        nonlocal exported, attachments_saved, total, last_id
+        saved = await _save_attachments(batch, channel.id, sem) if download_attachments else {}
+        records = [_record(m, saved) for m in batch]
+        if fmt == "jsonl":
+            text = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+        else:
+            text = "".join(_html_row(r) for r in records)
+        # compression + fsync off the event loop
+        size = await asyncio.to_thread(_append_chunk, path, text)
+
+        exported += len(batch)
+        total += len(batch)
+        attachments_saved += len(saved)
+        last_id = batch[-1].id
+        cursors = load_json(CURSOR_FILE, default_value={})
+        cursors[key] = {"last_id": last_id, "count": total, "bytes": size}
+        save_json(CURSOR_FILE, cursors)
+        batch.clear()
+
+    after = discord.Object(id=last_id) if last_id else None
+    async for m in channel.history(limit=None, after=after, oldest_first=True):
+        batch.append(m)
+        if len(batch) >= BATCH_SIZE:
+            await flush()
+    if batch:
+        await flush()
+
+    return ExportResult(path=path, exported=exported, total=total, attachments_saved=attachments_saved)
+
+
+def pack_lines(lines: list[str], limit: int = MAX_MESSAGE_CHARS) -> list[str]:
+    """Join lines into as few Discord messages as possible (splitting any overlong line)."""
+    chunks: list[str] = []
+    cur = ""
+    for line in lines:
+        while len(line) > limit:
+            if cur:
+                chunks.append(cur)
+                cur = ""
+            chunks.append(line[:limit])
+            line = line[limit:]
+        if cur and len(cur) + 1 + len(line) > limit:
+            chunks.append(cur)
+            cur = line
+        else:
+            cur = f"{cur}\n{line}" if cur else line
+    if cur:
+        chunks.append(cur)
+    return chunks
+
+
+def transcript_lines(m: discord.Message) -> list[str]:
+    """The lines the repost backups have always produced for one message."""
+    return [f"**{m.author.name}:** {m.content}", *(a.url for a in m.attachments)]
@@ -3,11 +3,15 @@ import re
 import discord
 from discord.ext import commands
 
-def _split_message(s: str, max_len: int = 2000):
-    return [s[i:i+max_len] for i in range(0, len(s), max_len)]
+from cogs.admin.backup._export import (
+    EXPORT_FORMATS, export_channel, pack_lines, transcript_lines,
+)
 
 class BackupCategoryCog(commands.Cog):
-    """sudo_backup_category <category_id> #destination — Backup all ticket channels in a category."""
+    """
+    sudo_backup_category <category_id> #destination — Backup all ticket channels in a category.
+    sudo_export_category <category_id> [jsonl|html] [attachments] — Stream every channel to gzip transcripts.
+    """
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot
@@ -29,23 +33,42 @@ class BackupCategoryCog(commands.Cog):
             first = messages[-1]
             mention = re.findall(r"<@!?(\d+)>", first.content)
             if mention:
-                await destination_channel.send(f"🎟️ **Ticket opened by:** <@{mention[0]}>")
+                header = f"🎟️ **Ticket opened by:** <@{mention[0]}>"
             else:
-                await destination_channel.send(f"🎟️ **Ticket opened in:** #{ch.name} (User not found)")
-
-            for m in reversed(messages):
-                content = f"**{m.author.name}:** {m.content}"
-                if len(content) > 2000:
-                    for part in _split_message(content):
-                        await destination_channel.send(part)
-                else:
-                    await destination_channel.send(content)
-                for a in m.attachments:
-                    await destination_channel.send(a.url)
+                header = f"🎟️ **Ticket opened in:** #{ch.name} (User not found)"
+
+            lines = [header] + [line for m in reversed(messages) for line in transcript_lines(m)]
+            for chunk in pack_lines(lines):
+                await destination_channel.send(chunk)
 
             await destination_channel.send("-------------------------------------------------------------------")
 
         await ctx.send(f"Backup for `{category.name}` completed in {destination_channel.mention}!")
 
+    @commands.command(name="sudo_export_category")
+    @commands.has_permissions(administrator=True)
+    async def sudo_export_category(self, ctx: commands.Context, category_id: int, fmt: str = "jsonl", attachments: str = ""):
+        category = discord.utils.get(ctx.guild.categories, id=category_id)
+        if not category:
+            await ctx.send("Invalid category ID. Please check and try again.")
+            return
+        fmt = fmt.lower()
+        if fmt not in EXPORT_FORMATS:
+            await ctx.send(f"🙅 Format must be one of: {', '.join(EXPORT_FORMATS)}.")
+            return
+
+        status = await ctx.send(f"Exporting `{category.name}` ({len(category.text_channels)} channels)...")
+        exported = 0
+        async with ctx.typing():
+            for i, ch in enumerate(category.text_channels, 1):
+                result = await export_channel(ch, fmt, download_attachments=attachments.lower() == "attachments")
+                exported += result.exported
+                try:
+                    await status.edit(content=f"Exporting `{category.name}`: {i}/{len(category.text_channels)} channels, {exported} messages")
+                except discord.HTTPException:
+                    pass
+
+        await ctx.send(f"✅ Exported **{exported}** new message(s) from `{category.name}` to `database/exports/`.")
+
 async def setup(bot: commands.Bot):
     await bot.add_cog(BackupCategoryCog(bot))
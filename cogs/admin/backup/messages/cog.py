@@ -1,9 +1,20 @@
 from __future__ import annotations
+import os
 import discord
 from discord.ext import commands
 
+from cogs.admin.backup._export import (
+    EXPORT_FORMATS, export_channel, pack_lines, transcript_lines,
+)
+
+# Attach the transcript to the reply when it fits the upload limit
+EXPORT_UPLOAD_LIMIT = 8 * 1024 * 1024
+
 class BackupMessagesCog(commands.Cog):
-    """sudo_backup_messages #source #destination — Copy recent messages from one channel to another."""
+    """
+    sudo_backup_messages #source #destination — Copy recent messages from one channel to another.
+    sudo_export_messages #source [jsonl|html] [attachments] — Stream full history to a gzip transcript.
+    """
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot
@@ -12,12 +23,43 @@ class BackupMessagesCog(commands.Cog):
     @commands.has_permissions(administrator=True)
     async def sudo_backup_messages(self, ctx: commands.Context, source_channel: discord.TextChannel, destination_channel: discord.TextChannel):
         await ctx.send(f"Starting backup from {source_channel.mention} to {destination_channel.mention}...")
-        async for msg in source_channel.history(limit=1000):
-            content = f"**{msg.author.name}:** {msg.content}"
-            await destination_channel.send(content)
-            for attachment in msg.attachments:
-                await destination_channel.send(attachment.url)
+        messages = [m async for m in source_channel.history(limit=1000)]
+        lines = [line for m in reversed(messages) for line in transcript_lines(m)]
+        for chunk in pack_lines(lines):
+            await destination_channel.send(chunk)
         await ctx.send(f"Backup from {source_channel.mention} to {destination_channel.mention} completed!")
 
+    @commands.command(name="sudo_export_messages")
+    @commands.has_permissions(administrator=True)
+    async def sudo_export_messages(
+        self,
+        ctx: commands.Context,
+        source_channel: discord.TextChannel,
+        fmt: str = "jsonl",
+        attachments: str = "",
+    ):
+        fmt = fmt.lower()
+        if fmt not in EXPORT_FORMATS:
+            await ctx.send(f"🙅 Format must be one of: {', '.join(EXPORT_FORMATS)}.")
+            return
+
+        await ctx.send(f"Exporting {source_channel.mention} to `{fmt}.gz`...")
+        async with ctx.typing():
+            result = await export_channel(
+                source_channel, fmt, download_attachments=attachments.lower() == "attachments"
+            )
+
+        msg = (
+            f"✅ Exported **{result.exported}** new message(s) from {source_channel.mention} "
+            f"({result.total} total) to `{result.path}`."
+        )
+        if result.attachments_saved:
+            msg += f"\n📎 Saved {result.attachments_saved} attachment(s)."
+        # an empty channel never creates the jsonl file
+        if os.path.exists(result.path) and os.path.getsize(result.path) <= EXPORT_UPLOAD_LIMIT:
+            await ctx.send(msg, file=discord.File(result.path))
+        else:
+            await ctx.send(msg)
+
 async def setup(bot: commands.Bot):
     await bot.add_cog(BackupMessagesCog(bot))
@@ -2,6 +2,8 @@ from __future__ import annotations
 import discord
 from discord.ext import commands
 
+from utils.rest_scheduler import schedule_mutation, channel_route, PRIORITY_USER_FACING
+
 class RenameChannelCog(commands.Cog):
     """sudo_rename_channel <channel_id> <new_name>"""
 
@@ -17,7 +19,10 @@ class RenameChannelCog(commands.Cog):
             return
         try:
             old = channel.name
-            await channel.edit(name=new_name)
+            await schedule_mutation(
+                channel_route(channel.id), lambda: channel.edit(name=new_name),
+                priority=PRIORITY_USER_FACING,
+            )
             await ctx.send(f"✅ {channel.mention} renamed from **{old}** to **{new_name}**.")
         except discord.Forbidden:
             await ctx.send("🙅 I don't have permission to rename this channel.")
@@ -2,6 +2,9 @@ from __future__ import annotations
 import discord
 from discord.ext import commands
 
+from cogs.stats.message_stats.message_index.crawler import crawl_channel
+from cogs.stats.message_stats.message_index.store import get_message_index
+
 class CountMentionsCog(commands.Cog):
     """sudo_count_mentions <channel_id> <search_phrase> — Count mentions in matching messages."""
 
@@ -16,12 +19,10 @@ class CountMentionsCog(commands.Cog):
             await ctx.send("Channel not found!")
             return
 
-        counts = {}
-        async for m in channel.history(limit=None):
-            if search_phrase in m.content and m.mentions:
-                for mem in m.mentions:
-                    uid = str(mem.id)
-                    counts[uid] = counts.get(uid, 0) + 1
+        # Incremental: only messages newer/older than the stored cursor are fetched
+        async with ctx.typing():
+            await crawl_channel(channel)
+        counts = get_message_index().count_mentions(channel.id, search_phrase)
 
         await ctx.send(f"Counts: {counts}")
 
@@ -3,6 +3,8 @@ import discord
 from discord.ext import commands
 import logging
 
+from .range import purge_range
+
 log = logging.getLogger(__name__)
 
 class PurgeCog(commands.Cog):
@@ -43,12 +45,29 @@ class PurgeCog(commands.Cog):
                     await ctx.send("Fourth argument must be a valid text channel.")
                     return
 
-            def check(msg: discord.Message):
-                return start_id <= msg.id <= end_id and (not target_member or msg.author.id == target_member.id)
+            if start_id > end_id:
+                start_id, end_id = end_id, start_id
+
+            status = await ctx.send(f"🧹 Purging {target_channel.mention}...")
+            if target_channel.id == status.channel.id:
+                end_id = min(end_id, status.id - 1)  # never purge our own progress message
+
+            async def progress(deleted: int, failed: int):
+                try:
+                    await status.edit(content=f"🧹 Purging {target_channel.mention}: {deleted} deleted, {failed} failed...")
+                except discord.HTTPException:
+                    pass
 
             try:
-                deleted = await target_channel.purge(limit=None, check=check)
-                await ctx.send(f"🧹 Purged {len(deleted)} messages from {target_channel.mention}.", delete_after=5)
+                deleted, failed = await purge_range(
+                    target_channel,
+                    start_id,
+                    end_id,
+                    author_id=target_member.id if target_member else None,
+                    progress=progress,
+                )
+                note = f" ({failed} failed)" if failed else ""
+                await status.edit(content=f"🧹 Purged {deleted} messages from {target_channel.mention}.{note}", delete_after=5)
             except Exception as e:
                 log.exception("[Purge] range mode failed", exc_info=e)
                 await ctx.send("An error occurred while purging messages.")
@@ -0,0 +1,98 @@
+# cogs/admin/delete/purge/range.py
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable
+
+import discord
+
+# Bulk delete refuses messages older than 14 days; keep a margin for clock skew
+# and for the time the range takes to fetch.
+BULK_DELETE_MAX_AGE = timedelta(days=14) - timedelta(minutes=10)
+BULK_DELETE_MAX = 100
+# Old messages are deleted one by one on a tight per-channel bucket
+OLD_DELETE_CONCURRENCY = 3
+PROGRESS_EVERY_SECONDS = 5.0
+
+ProgressCallback = Callable[[int, int], Awaitable[None]]
+
+
+async def purge_range(
+    channel: discord.TextChannel,
+    start_id: int,
+    end_id: int,
+    *,
+    author_id: int | None = None,
+    progress: ProgressCallback | None = None,
+) -> tuple[int, int]:
+    """
+    Delete messages with start_id <= id <= end_id (optionally only by author_id).
+
+    Only the range is fetched (after/before snowflake bounds). Messages younger
+    than 14 days go out in bulk deletes of up to 100; older ones are deleted
+    individually with limited concurrency. Returns (deleted, failed).
+    `progress(deleted, failed)` is awaited at most every PROGRESS_EVERY_SECONDS.
+    """
+    cutoff = datetime.now(timezone.utc) - BULK_DELETE_MAX_AGE
+    sem = asyncio.Semaphore(OLD_DELETE_CONCURRENCY)
+    deleted = failed = 0
+    young: list[discord.Message] = []
+    old_tasks: list[asyncio.Task] = []
+    last_report = time.monotonic()
+
+    async def report(force: bool = False) -> None:
+        nonlocal last_report
+        now = time.monotonic()
+        if progress and (force or now - last_report >= PROGRESS_EVERY_SECONDS):
+            last_report = now
+            await progress(deleted, failed)
+
+    async def bulk(chunk: list[discord.Message]) -> None:
+        nonlocal deleted, failed
+        try:
+            await channel.delete_messages(chunk)
+            deleted += len(chunk)
+        except discord.HTTPException:
+            failed += len(chunk)
+
+    async def single(msg: discord.Message) -> None:
+        nonlocal deleted, failed
+        async with sem:
+            try:
+                await msg.delete()
+                deleted += 1
+            except discord.NotFound:
+                pass
+            except discord.HTTPException:
+                failed += 1
+
+    history = channel.history(
+        limit=None,
+        after=discord.Object(id=start_id - 1),
+        before=discord.Object(id=end_id + 1),
+        oldest_first=False,
+    )
+    async for msg in history:
+        if author_id is not None and msg.author.id != author_id:
+            continue
+        if msg.created_at > cutoff:
+            young.append(msg)
+            if len(young) >= BULK_DELETE_MAX:
+                await bulk(young)
+                young = []
+        else:
+            old_tasks.append(asyncio.create_task(single(msg)))
+            # keep the number of outstanding tasks bounded on huge ranges
+            if len(old_tasks) >= BULK_DELETE_MAX:
+                await asyncio.gather(*old_tasks)
+                old_tasks = []
+        await report()
+
+    if young:
+        await bulk(young)
+    if old_tasks:
+        await asyncio.gather(*old_tasks)
+    await report(force=True)
+    return deleted, failed
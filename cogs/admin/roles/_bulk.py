@@ -0,0 +1,203 @@
+# cogs/admin/roles/_bulk.py
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Iterable
+
+import discord
+from discord.ext import commands
+
+from utils.rest_scheduler import PRIORITY_BOOKKEEPING, member_route, schedule_mutation
+from utils.utils_json import load_json, save_json
+
+log = logging.getLogger(__name__)
+
+CHECKPOINT_FILE = "database/bulk_role_jobs.json"
+
+# Members queued on the mutation scheduler at once; it serializes the guild
+# member bucket, this just keeps the queue fed without flooding it.
+CONCURRENCY = 4
+CHECKPOINT_EVERY = 25          # completed members between checkpoint writes
+PROGRESS_EVERY_SECONDS = 5.0   # min gap between progress message edits
+CHECKPOINT_MAX_AGE = 6 * 3600  # seconds; older saved runs are discarded, not resumed
+
+DRY_RUN_FLAGS = {"--dry-run", "dry-run", "dryrun", "dry"}
+
+
+def is_dry_run(flag: str | None) -> bool:
+    return (flag or "").lower() in DRY_RUN_FLAGS
+
+
+@dataclass
+class BulkResult:
+    changed: int = 0
+    failed: list[str] = field(default_factory=list)
+    resumed_from: int = 0
+    targets: int = 0
+
+
+def _job_key(op: str, guild_id: int, role_id: int) -> str:
+    return f"{op}:{guild_id}:{role_id}"
+
+
+def _fingerprint(member_ids: Iterable[int]) -> str:
+    joined = ",".join(str(i) for i in sorted(member_ids))
+    return hashlib.sha256(joined.encode()).hexdigest()
+
+
+def _load_checkpoints() -> dict:
+    return load_json(CHECKPOINT_FILE, default_value={})
+
+
+def _save_checkpoint(key: str, entry: dict | None) -> None:
+    data = _load_checkpoints()
+    if entry is None:
+        data.pop(key, None)
+    else:
+        data[key] = entry
+    save_json(CHECKPOINT_FILE, data)
+
+
+def format_failed(failed: list[str], limit: int = 20) -> str:
+    preview = ", ".join(failed[:limit])
+    extra = "" if len(failed) <= limit else f" …and {len(failed) - limit} more"
+    return f"{preview}{extra}"
+
+
+async def run_bulk_role_job(
+    ctx: commands.Context,
+    *,
+    op: str,
+    role: discord.Role,
+    targets: Iterable[discord.Member],
+    reason: str,
+    dry_run: bool = False,
+) -> BulkResult:
+    """
+    Add (op="add") or remove (op="remove") `role` on every member in `targets`.
+
+    - Edits go through the mutation scheduler (guild member route), up to
+      CONCURRENCY queued at once.
+    - Completed member ids are checkpointed to CHECKPOINT_FILE; re-running the
+      same command after a crash/restart skips members already handled. A
+      saved run is only resumed if it is younger than CHECKPOINT_MAX_AGE and
+      covers the same members (fingerprint of done + remaining targets).
+    - Progress is shown in one message that is edited in place.
+    - dry_run only counts who would change.
+    """
+    key = _job_key(op, role.guild.id, role.id)
+    targets = list(targets)
+    target_ids = {m.id for m in targets}
+
+    entry = _load_checkpoints().get(key)
+    if entry:
+        # members already handled drop out of the caller's target list, so the
+        # job's member set is what's left plus what the checkpoint finished
+        fresh = time.time() - float(entry.get("started_at", 0)) <= CHECKPOINT_MAX_AGE
+        if not fresh or entry.get("fingerprint") != _fingerprint(target_ids | set(entry["done"])):
+            log.info("Discarding %s checkpoint for %s (stale or different members)", op, role.id)
+            entry = None
+    if not entry:
+        entry = {
+            "done": [], "changed": 0, "failed": [],
+            "started_at": time.time(), "fingerprint": _fingerprint(target_ids),
+        }
+    done: set[int] = set(entry["done"])
+
+    pending = [m for m in targets if m.id not in done]
+    result = BulkResult(
+        changed=int(entry["changed"]),
+        failed=list(entry["failed"]),
+        resumed_from=len(done),
+        targets=len(target_ids | done),
+    )
+    verb = "Adding" if op == "add" else "Removing"
+
+    if dry_run:
+        resume = f" ({len(done)} already done in a saved run)" if done else ""
+        await ctx.send(f"🧪 Dry run: {verb.lower()} **{role.name}** would change **{len(pending)}** member(s){resume}.")
+        return result
+    if not pending:
+        _save_checkpoint(key, None)
+        return result
+
+    progress = await ctx.send(
+        f"⏳ {verb} **{role.name}**: {len(done)}/{result.targets}"
+        + (" (resuming)" if done else "")
+    )
+    queue: asyncio.Queue[discord.Member] = asyncio.Queue()
+    for m in pending:
+        queue.put_nowait(m)
+
+    started = time.monotonic()
+    last_edit = started
+    since_checkpoint = 0
+
+    def snapshot() -> dict:
+        return {
+            "done": list(done), "changed": result.changed, "failed": result.failed,
+            "started_at": entry["started_at"], "fingerprint": entry["fingerprint"],
+        }
+
+    async def report() -> None:
+        nonlocal last_edit
+        now = time.monotonic()
+        if now - last_edit < PROGRESS_EVERY_SECONDS:
+            return
+        last_edit = now
+        handled = len(done) - result.resumed_from
+        rate = handled / (now - started) if now > started else 0
+        left = (result.targets - len(done)) / rate if rate else 0
+        try:
+            await progress.edit(
+                content=f"⏳ {verb} **{role.name}**: {len(done)}/{result.targets}"
+                f" · {len(result.failed)} failed · ~{int(left)}s left"
+            )
+        except discord.HTTPException:
+            pass
+
+    async def worker() -> None:
+        nonlocal since_checkpoint
+        while True:
+            try:
+                member = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                # serialized with XP role syncs and nick edits for the same member
+                if op == "add":
+                    factory = lambda m=member: m.add_roles(role, reason=reason)
+                else:
+                    factory = lambda m=member: m.remove_roles(role, reason=reason)
+                await schedule_mutation(
+                    member_route(role.guild.id, member.id), factory,
+                    key=("bulk_role", op, role.id, member.id), priority=PRIORITY_BOOKKEEPING,
+                )
+                result.changed += 1
+            except Exception as e:
+                result.failed.append(member.display_name)
+                log.exception("Bulk %s of role %s failed for %s", op, role.id, member, exc_info=e)
+            done.add(member.id)
+            since_checkpoint += 1
+            if since_checkpoint >= CHECKPOINT_EVERY:
+                since_checkpoint = 0
+                _save_checkpoint(key, snapshot())
+            await report()
+
+    try:
+        await asyncio.gather(*(worker() for _ in range(min(CONCURRENCY, len(pending)))))
+    except BaseException:
+        # Cancelled or crashed mid-run: keep what we finished for the next attempt.
+        _save_checkpoint(key, snapshot())
+        raise
+
+    _save_checkpoint(key, None)
+    try:
+        await progress.delete()
+    except discord.HTTPException:
+        pass
+    return result
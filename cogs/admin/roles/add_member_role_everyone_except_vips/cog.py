@@ -5,11 +5,13 @@ from typing import Iterable
 import discord
 from discord.ext import commands
 
+from cogs.admin.roles._bulk import run_bulk_role_job, is_dry_run, format_failed
+
 log = logging.getLogger(__name__)
 
 class AddMemberRoleEveryoneExceptVIPs(commands.Cog):
     """
-    !sudo_add_member_role_everyone_except_vips <role_id> <vip_role_id ...>
+    !sudo_add_member_role_everyone_except_vips <role_id> <vip_role_id ...> [--dry-run]
     Add <role_id> to all non-bot members who don't already have it,
     excluding anyone who has ANY of the listed VIP roles.
     """
@@ -24,7 +26,8 @@ class AddMemberRoleEveryoneExceptVIPs(commands.Cog):
         self,
         ctx: commands.Context,
         role_id: int,
-        *vip_role_ids: int,
+        vip_role_ids: commands.Greedy[int],
+        flag: str = "",
     ):
         guild: discord.Guild = ctx.guild
         assert guild is not None
@@ -58,8 +61,8 @@ class AddMemberRoleEveryoneExceptVIPs(commands.Cog):
 
         excluded_ids = members_with_any(vip_roles) if vip_roles else set()
 
-        added = 0
-        failed = []
+        targets: list[discord.Member] = []
+        skipped: list[str] = []
 
         # Iterate all guild members
         for member in guild.members:
@@ -69,22 +72,30 @@ class AddMemberRoleEveryoneExceptVIPs(commands.Cog):
 
             # Extra safety: bot cannot modify members with >= bot's top role
             if member.top_role >= guild.me.top_role and member != guild.owner:
-                failed.append(member.display_name)
+                skipped.append(member.display_name)
                 log.info(
                     "Skipping %s due to role hierarchy (member.top_role >= bot.top_role)",
                     member,
                 )
                 continue
 
-            try:
-                await member.add_roles(
-                    target_role,
-                    reason=f"Bulk add (exclude VIPs) by {ctx.author} [{ctx.author.id}]",
-                )
-                added += 1
-            except Exception as e:
-                failed.append(member.display_name)
-                log.exception("Failed to add role to %s", member, exc_info=e)
+            targets.append(member)
+
+        dry_run = is_dry_run(flag)
+        result = await run_bulk_role_job(
+            ctx,
+            op="add",
+            role=target_role,
+            targets=targets,
+            reason=f"Bulk add (exclude VIPs) by {ctx.author} [{ctx.author.id}]",
+            dry_run=dry_run,
+        )
+        if dry_run:
+            if skipped:
+                await ctx.send(f"⚠️ {len(skipped)} member(s) would be skipped (role hierarchy).")
+            return
+        added = result.changed
+        failed = skipped + result.failed
 
         # Build response
         vip_info = (
@@ -99,9 +110,7 @@ class AddMemberRoleEveryoneExceptVIPs(commands.Cog):
 
         if failed:
             # Keep message tidy if there are many failures
-            failed_preview = ", ".join(failed[:20])
-            extra = "" if len(failed) <= 20 else f" …and {len(failed) - 20} more"
-            msg += f"\n⚠️ Failed for: {failed_preview}{extra}"
+            msg += f"\n⚠️ Failed for: {format_failed(failed)}"
 
         await ctx.send(msg)
 
@@ -3,34 +3,35 @@ import discord
 from discord.ext import commands
 import logging
 
+from cogs.admin.roles._bulk import run_bulk_role_job, is_dry_run, format_failed
+
 log = logging.getLogger(__name__)
 
 class RemoveRoleEveryoneCog(commands.Cog):
-    """sudo_remove_role_everyone <role_id> — Remove role from all members that have it."""
+    """sudo_remove_role_everyone <role_id> [--dry-run] — Remove role from all members that have it."""
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot
 
     @commands.command(name="sudo_remove_role_everyone")
     @commands.has_permissions(administrator=True)
-    async def sudo_remove_role_everyone(self, ctx: commands.Context, role_id: int):
+    async def sudo_remove_role_everyone(self, ctx: commands.Context, role_id: int, flag: str = ""):
         role = ctx.guild.get_role(role_id)
         if role is None:
             await ctx.send(f"🙅 Role with ID `{role_id}` not found.")
             return
 
-        removed, failed = 0, []
-        for m in list(role.members):
-            try:
-                await m.remove_roles(role, reason=f"Bulk remove by {ctx.author}")
-                removed += 1
-            except Exception as e:
-                failed.append(m.display_name)
-                log.exception("Failed to remove role", exc_info=e)
-
-        msg = f"Removed **{role.mention}** from {removed} members."
-        if failed:
-            msg += f"\nFailed: {', '.join(failed)}"
+        dry_run = is_dry_run(flag)
+        result = await run_bulk_role_job(
+            ctx, op="remove", role=role, targets=list(role.members),
+            reason=f"Bulk remove by {ctx.author}", dry_run=dry_run,
+        )
+        if dry_run:
+            return
+
+        msg = f"Removed **{role.mention}** from {result.changed} members."
+        if result.failed:
+            msg += f"\nFailed: {format_failed(result.failed)}"
         await ctx.send(msg)
 
 async def setup(bot: commands.Bot):
@@ -8,7 +8,7 @@ from cogs.economy.coin.service import get_total_coins
 from cogs.economy.orb.service import get_total_orbs
 from cogs.economy.star.service import get_total_stars
 from cogs.economy.diamond.service import get_total_diamonds
-from configs.helper import send_as_webhook
+from utils.webhook_pool import send_as_webhook
 from configs.config_general import BOT_USER_ID
 
 class BankCog(commands.Cog):
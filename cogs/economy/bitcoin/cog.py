@@ -7,7 +7,7 @@ import aiohttp
 import discord
 from discord.ext import commands, tasks
 
-from configs.helper import send_as_webhook
+from utils.webhook_pool import send_as_webhook
 BITCOIN_CHANNEL_ID = 1445105788329791558
 
 COINBASE_API_URL = "https://api.coinbase.com/v2/prices/BTC-USD/spot"
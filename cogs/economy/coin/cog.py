@@ -7,7 +7,7 @@ from discord.ext import commands
 
 from .service import get_total_coins, update_coins
 from cogs.economy._shared import is_confirmation_enabled
-from configs.helper import send_as_webhook
+from utils.webhook_pool import send_as_webhook
 from utils.utils import log_coin_transaction  # keep existing logger utility
 
 class CoinsCog(commands.Cog):
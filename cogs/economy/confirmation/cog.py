@@ -4,7 +4,7 @@ from __future__ import annotations
 import discord
 from discord.ext import commands
 from cogs.economy._shared import set_confirmation
-from configs.helper import send_as_webhook
+from utils.webhook_pool import send_as_webhook
 
 class ConfirmationCog(commands.Cog):
     """!confirmation on/off — toggle receiver approval for incoming coin transfers."""
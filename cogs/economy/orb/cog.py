@@ -4,7 +4,7 @@ from __future__ import annotations
 import discord
 from discord.ext import commands
 from .service import get_total_orbs
-from configs.helper import send_as_webhook
+from utils.webhook_pool import send_as_webhook
 
 class OrbsCog(commands.Cog):
     """!orbs — show total orbs for a user (or yourself)."""
@@ -13,7 +13,8 @@ from cogs.economy.dollar.service import get_total_dollars
 
 from cogs.server.roles.rank import get_highest_loot_legends_role_index
 from cogs.economy.xp.service import get_total_xp
-from configs.helper import send_as_webhook, PERSONAS
+from configs.helper import PERSONAS
+from utils.webhook_pool import send_as_webhook
 from configs.config_roles import LOOT_AND_LEGENDS_ROLES, MEMBER_ROLE_ID
 from configs.config_general import BOT_USER_ID
 
@@ -12,7 +12,7 @@ from cogs.economy.diamond.service import update_diamonds, get_total_diamonds
 
 from configs.config_channels import LOGS_CHANNEL_ID
 from configs.config_general import AUTHORIZED_USER_ID
-from configs.helper import send_as_webhook
+from utils.webhook_pool import send_as_webhook
 
 
 class CurrencyExchangeShopView(discord.ui.View):
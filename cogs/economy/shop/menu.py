@@ -7,7 +7,7 @@ from .subscription import build_subscription_shop
 from .collectibles import build_collectibles_shop
 from .exchange import build_currency_exchange_shop
 from .custom_roles import build_custom_roles_shop
-from configs.helper import send_as_webhook
+from utils.webhook_pool import send_as_webhook
 
 
 class ShopMenu(discord.ui.View):
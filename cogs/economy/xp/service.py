@@ -1,6 +1,7 @@
 # cogs/xp/service.py
 from __future__ import annotations
 
+import asyncio
 from typing import Dict, Any, Optional
 from datetime import datetime, timezone, date
 
@@ -163,6 +164,9 @@ def update_xp(user_id: int | str, amount: int | float, activity_type: str = "mes
         from configs.config_general import BOT_GUILD_ID
         from cogs.server.roles.assign import assign_role_based_on_xp
         from cogs.fun.nickname.service import refresh_suffix_if_present
+        from utils.rest_scheduler import (
+            schedule_mutation, member_route, PRIORITY_BOOKKEEPING, PRIORITY_COSMETIC,
+        )
         try:
             from configs.config_logging import xp_logger as _logger
         except Exception:
@@ -186,8 +190,29 @@ def update_xp(user_id: int | str, amount: int | float, activity_type: str = "mes
                 _logger.debug(f"update_xp: member {user_id} not in guild; skipping side-effects")
             return new_val
 
-        bot.loop.create_task(assign_role_based_on_xp(member, guild))
-        bot.loop.create_task(refresh_suffix_if_present(member))
+        # Latest-wins per member: a burst of XP grants becomes one role sync + one nick edit
+        route = member_route(guild.id, member.id)
+
+        def _schedule() -> None:
+            schedule_mutation(
+                route, lambda: assign_role_based_on_xp(member, guild),
+                key=("xp_roles", member.id), priority=PRIORITY_BOOKKEEPING,
+            )
+            schedule_mutation(
+                route, lambda: refresh_suffix_if_present(member),
+                key=("nick_suffix", member.id), priority=PRIORITY_COSMETIC,
+            )
+
+        # update_xp is sync and may be called from a worker thread; the
+        # scheduler lives on the bot loop, so hop there when we're not on it
+        try:
+            on_bot_loop = asyncio.get_running_loop() is bot.loop
+        except RuntimeError:
+            on_bot_loop = False
+        if on_bot_loop:
+            _schedule()
+        else:
+            bot.loop.call_soon_threadsafe(_schedule)
 
         if _logger:
             _logger.info(f"User {user_id} +{amount} to '{activity_type}' (daily-limited for vc). New={new_val}")
@@ -5,6 +5,7 @@ import logging
 import discord
 from discord.ext import commands
 
+from utils.rest_scheduler import schedule_mutation, reaction_route, PRIORITY_COSMETIC
 from .mapping import REACTION_MAP, NICE, SLOTH_USER_ID
 
 class AutomaticReactionsCog(commands.Cog):
@@ -40,12 +41,12 @@ class AutomaticReactionsCog(commands.Cog):
         if channel_id in NICE and message.author.id == SLOTH_USER_ID:
             reactions.append('🦥')
 
-        # Add reactions
-        try:
-            for emoji in reactions:
-                await message.add_reaction(emoji)
-        except discord.HTTPException as e:
-            self.log.debug(f"[AutoReact] Failed to add reactions in #{message.channel.name}: {e}")
+        # Add reactions (queued per channel; failures are logged by the scheduler)
+        route = reaction_route(channel_id)
+        for emoji in reactions:
+            schedule_mutation(
+                route, lambda e=emoji: message.add_reaction(e), priority=PRIORITY_COSMETIC,
+            )
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(AutomaticReactionsCog(bot))
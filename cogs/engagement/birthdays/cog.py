@@ -6,7 +6,7 @@ from datetime import datetime, time as dtime
 import discord
 from discord.ext import commands, tasks
 
-from configs.helper import send_as_webhook
+from utils.webhook_pool import send_as_webhook
 from configs.config_channels import (
     BIRTHDAY_CHANNEL_ID,
     ANNOUNCEMENTS_CHANNEL_ID,
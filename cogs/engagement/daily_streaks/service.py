@@ -13,7 +13,7 @@ from configs.config_channels import LOGS_CHANNEL_ID
 from cogs.economy.coin.service import update_coins, get_total_coins
 
 from configs.config_logging import logging
-from configs.helper import send_as_webhook
+from utils.log_sink import queue_log, LOG_PRIORITY_NORMAL
 
 DAILY_STREAK_FILE = "database/daily_streaks.json"
 
@@ -169,19 +169,15 @@ async def process_daily_streak_for(
         logging.info("[DailyStreaks] No logs channel available; skipping embed.")
         return
 
-    try:
-        # Mention only on day 2+
-        content = f"<@{user.id}> your daily reward is here!" if new_streak >= 2 else ""
-        allowed = discord.AllowedMentions(users=True, roles=False, everyone=False)
-        dedupe = f"streak:{uid_str}:{today.isoformat()}"
-
-        await send_as_webhook(
-            channel,
-            "daily_streak_reward",
-            content=content,
-            embed=embed,
-            deduplication_id=dedupe,
-            allowed_mentions=allowed,
-        )
-    except Exception as e:
-        logging.error(f"[DailyStreaks] send_as_webhook failed: {e}")
+    # Mention only on day 2+ (the sink sends with user mentions allowed, roles/everyone off)
+    content = f"<@{user.id}> your daily reward is here!" if new_streak >= 2 else ""
+    dedupe = f"streak:{uid_str}:{today.isoformat()}"
+
+    queue_log(
+        channel,
+        embed,
+        content=content or None,
+        persona="daily_streak_reward",
+        priority=LOG_PRIORITY_NORMAL,
+        deduplication_id=dedupe,
+    )
@@ -4,17 +4,15 @@ from __future__ import annotations
 import logging
 import discord
 from discord.ext import commands
-from openai import OpenAI
 
-from configs.config_general import OPENAI_API_KEY
-from configs.helper import send_as_webhook
+from utils.webhook_pool import send_as_webhook
 from configs.config_pets import (
     HUMAN_PERSONAS,            # dict: pet_type -> { name, description, ... }
-    HUMAN_PERSONAS_ROLE_IDS,   # dict: pet_type -> role_id
-    HUMAN_PERSONAS_USER_IDS,   # dict: pet_type -> user_id
 )
 
-from .history import build_conversation_history
+from .engine import PersonaBusy, get_persona_engine
+from .history import build_conversation_history, get_history_buffer
+from .triggers import needs_reference, resolve_persona, persona_name as persona_name_for
 
 
 class PersonaCog(commands.Cog):
@@ -25,52 +23,60 @@ class PersonaCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.log = logging.getLogger(__name__)
-        # One OpenAI client for the whole cog
-        self.client = OpenAI(api_key=OPENAI_API_KEY)
+        # Shared async completion pipeline (concurrency cap, single-flight, cache)
+        self.engine = get_persona_engine()
+        self.history = get_history_buffer()
 
-    # ---- Listener ------------------------------------------------------------
+    # ---- Listeners -----------------------------------------------------------
     @commands.Cog.listener("on_message")
     async def on_message_listener(self, message: discord.Message):
-        # Ignore DMs and bots
-        if not isinstance(message.channel, discord.TextChannel) or message.author.bot:
+        # Ignore DMs
+        if not isinstance(message.channel, discord.TextChannel):
+            return
+        # Every message (bots and persona webhooks included) feeds the history buffer
+        self.history.add(message)
+        if message.author.bot:
             return
 
-        # Try each configured persona
-        for pet_type in HUMAN_PERSONAS.keys():
-            try:
-                handled = await self._maybe_handle_persona(message, pet_type)
-                if handled:
-                    return  # one persona per message
-            except Exception as e:
-                self.log.error(f"[Persona:{pet_type}] error: {e}", exc_info=True)
-                # keep looping other personas if one fails
+        ref_msg = await self._referenced_message(message) if needs_reference(message) else None
+        pet_type = resolve_persona(message, ref_msg)
+        if pet_type is None:
+            return  # one persona per message, and most messages have none
+
+        try:
+            await self._handle_persona(message, pet_type)
+        except Exception as e:
+            self.log.error(f"[Persona:{pet_type}] error: {e}", exc_info=True)
+
+    @commands.Cog.listener("on_raw_message_delete")
+    async def on_raw_message_delete_listener(self, payload: discord.RawMessageDeleteEvent):
+        self.history.remove(payload.channel_id, {payload.message_id})
+
+    @commands.Cog.listener("on_raw_bulk_message_delete")
+    async def on_raw_bulk_message_delete_listener(self, payload: discord.RawBulkMessageDeleteEvent):
+        self.history.remove(payload.channel_id, set(payload.message_ids))
+
+    async def _referenced_message(self, message: discord.Message) -> discord.Message | None:
+        """The replied-to message: from the gateway payload or cache, else one fetch."""
+        ref = message.reference
+        if isinstance(ref.resolved, discord.Message):
+            return ref.resolved
+        if ref.cached_message is not None:
+            return ref.cached_message
+        try:
+            return await message.channel.fetch_message(ref.message_id)
+        except Exception as e:
+            self.log.debug(f"[Persona] Could not fetch reply reference: {e}")
+            return None
 
     # ---- Core handling -------------------------------------------------------
-    async def _maybe_handle_persona(self, message: discord.Message, pet_type: str) -> bool:
-        persona = HUMAN_PERSONAS.get(pet_type)
-        if not persona:
-            self.log.warning(f"[Persona] Unknown pet type: {pet_type}")
-            return False
-
-        persona_name: str = persona.get("name") or pet_type
-        role_id = HUMAN_PERSONAS_ROLE_IDS.get(pet_type)
-        persona_user_id = HUMAN_PERSONAS_USER_IDS.get(pet_type)
-
-        # Was the persona mentioned directly (role or user) or replied to?
-        mentioned_directly = any(getattr(role, "id", 0) == role_id for role in message.role_mentions) \
-            or any(getattr(user, "id", 0) == persona_user_id for user in message.mentions)
-
-        replying_to_persona = False
-        if message.reference and message.reference.message_id:
-            try:
-                ref_msg = await message.channel.fetch_message(message.reference.message_id)
-                if ref_msg.webhook_id and ref_msg.author and ref_msg.author.name == persona_name:
-                    replying_to_persona = True
-            except Exception as e:
-                self.log.debug(f"[Persona:{pet_type}] Could not fetch reply reference: {e}")
+    async def _handle_persona(self, message: discord.Message, pet_type: str) -> None:
+        persona = HUMAN_PERSONAS.get(pet_type) or {}
+        persona_name: str = persona_name_for(pet_type)
 
-        if not (mentioned_directly or replying_to_persona):
-            return False
+        if self.engine.is_busy(message.channel.id, pet_type):
+            self.log.debug(f"[Persona:{pet_type}] Reply already pending in #{message.channel.id}; skipping.")
+            return
 
         # Build short history and ask the model
         try:
@@ -80,17 +86,14 @@ class PersonaCog(commands.Cog):
                 f"Speak really casually and really briefly like a real human, with the style of: {persona.get('description', '')}"
             )
 
-            resp = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "system", "content": system_prompt}, *history],
-                max_tokens=50,
-            )
-            reply = (resp.choices[0].message.content or "").strip()
+            reply = await self.engine.reply(message.channel.id, pet_type, system_prompt, history)
             if not reply:
                 reply = "…"
 
             await send_as_webhook(message, pet_type=pet_type, content=reply)
             self.log.info(f"[{persona_name}] Replied.")
+        except PersonaBusy:
+            self.log.debug(f"[Persona:{pet_type}] Reply already pending in #{message.channel.id}; skipping.")
         except Exception as e:
             self.log.error(f"[Persona:{pet_type}] OpenAI/webhook error: {e}", exc_info=True)
             try:
@@ -98,8 +101,6 @@ class PersonaCog(commands.Cog):
             except Exception:
                 pass
 
-        return True
-
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(PersonaCog(bot))
@@ -0,0 +1,124 @@
+# cogs/engagement/persona/engine.py
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from openai import AsyncOpenAI
+
+from configs.config_general import OPENAI_API_KEY
+
+log = logging.getLogger(__name__)
+
+PERSONA_MODEL = os.getenv("PERSONA_OPENAI_MODEL", "gpt-4o-mini")
+MAX_TOKENS = 50
+
+# Completions in flight across all channels and personas
+MAX_CONCURRENT_REPLIES = 4
+# Hard cap on one reply, queueing for the semaphore included
+REQUEST_TIMEOUT_SECONDS = 20.0
+# Identical prompts within this window reuse the previous reply
+CACHE_TTL_SECONDS = 60.0
+CACHE_MAX_ENTRIES = 256
+
+
+class PersonaBusy(Exception):
+    """A reply for this persona is already being generated in this channel."""
+
+
+class PersonaEngine:
+    """
+    Async completion pipeline for persona replies.
+
+    - AsyncOpenAI, so a slow completion never blocks the gateway
+    - global semaphore (MAX_CONCURRENT_REPLIES)
+    - single-flight per (channel, persona): a second trigger while a reply
+      is pending raises PersonaBusy instead of stacking another request
+    - every call bounded by REQUEST_TIMEOUT_SECONDS
+    - short TTL cache keyed by the exact prompt
+
+    PERSONA_OPENAI_BASE_URL points it at any OpenAI-compatible server (e.g.
+    a local fake for offline benchmarks).
+    """
+
+    def __init__(self, client: Optional[AsyncOpenAI] = None) -> None:
+        self.client = client or AsyncOpenAI(
+            api_key=OPENAI_API_KEY,
+            base_url=os.getenv("PERSONA_OPENAI_BASE_URL") or None,
+            timeout=REQUEST_TIMEOUT_SECONDS,
+            max_retries=1,
+        )
+        self._sem = asyncio.Semaphore(MAX_CONCURRENT_REPLIES)
+        self._in_flight: set[tuple[int, str]] = set()
+        self._cache: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    @staticmethod
+    def _cache_key(messages: list[dict]) -> str:
+        raw = json.dumps([PERSONA_MODEL, messages], separators=(",", ":"), ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _cache_get(self, key: str) -> Optional[str]:
+        hit = self._cache.get(key)
+        if hit is None:
+            return None
+        stored_at, reply = hit
+        if time.monotonic() - stored_at > CACHE_TTL_SECONDS:
+            del self._cache[key]
+            return None
+        return reply
+
+    def _cache_put(self, key: str, reply: str) -> None:
+        self._cache[key] = (time.monotonic(), reply)
+        self._cache.move_to_end(key)
+        while len(self._cache) > CACHE_MAX_ENTRIES:
+            self._cache.popitem(last=False)
+
+    async def _complete(self, messages: list[dict]) -> str:
+        async with self._sem:
+            resp = await self.client.chat.completions.create(
+                model=PERSONA_MODEL,
+                messages=messages,
+                max_tokens=MAX_TOKENS,
+            )
+        return (resp.choices[0].message.content or "").strip()
+
+    def is_busy(self, channel_id: int, pet_type: str) -> bool:
+        return (channel_id, pet_type) in self._in_flight
+
+    async def reply(self, channel_id: int, pet_type: str, system_prompt: str, history: list[dict]) -> str:
+        """Persona reply text. Raises PersonaBusy, asyncio.TimeoutError or API errors."""
+        flight = (channel_id, pet_type)
+        if flight in self._in_flight:
+            raise PersonaBusy(pet_type)
+
+        messages = [{"role": "system", "content": system_prompt}, *history]
+        key = self._cache_key(messages)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
+        self._in_flight.add(flight)
+        try:
+            reply = await asyncio.wait_for(self._complete(messages), timeout=REQUEST_TIMEOUT_SECONDS)
+        finally:
+            self._in_flight.discard(flight)
+
+        if reply:
+            self._cache_put(key, reply)
+        return reply
+
+
+_engine: PersonaEngine | None = None
+
+
+def get_persona_engine() -> PersonaEngine:
+    global _engine
+    if _engine is None:
+        _engine = PersonaEngine()
+    return _engine
@@ -2,10 +2,84 @@
 from __future__ import annotations
 
 import logging
+from collections import OrderedDict, deque
 import discord
 
 from configs.config_pets import HUMAN_PERSONAS_ROLE_IDS
 
+# Recent messages kept per channel, fed from gateway events
+BUFFER_PER_CHANNEL = 30
+# Channels tracked at once (least recently active dropped first)
+MAX_BUFFERED_CHANNELS = 500
+
+
+class ChannelHistoryBuffer:
+    """
+    Per-channel ring buffer of recent messages, filled from on_message and
+    pruned on deletes. Edits need no handling for gateway-delivered messages:
+    they are the objects discord.py updates in place.
+
+    A channel's buffer is trusted once it holds enough messages or has been
+    seeded from channel.history(), so REST is only needed for channels that
+    went quiet since startup.
+    """
+
+    def __init__(self) -> None:
+        self._channels: OrderedDict[int, deque[discord.Message]] = OrderedDict()
+        self._seeded: set[int] = set()
+
+    def _buffer(self, channel_id: int) -> deque[discord.Message]:
+        buf = self._channels.get(channel_id)
+        if buf is None:
+            buf = self._channels[channel_id] = deque(maxlen=BUFFER_PER_CHANNEL)
+            while len(self._channels) > MAX_BUFFERED_CHANNELS:
+                dropped, _ = self._channels.popitem(last=False)
+                self._seeded.discard(dropped)
+        else:
+            self._channels.move_to_end(channel_id)
+        return buf
+
+    def add(self, message: discord.Message) -> None:
+        buf = self._buffer(message.channel.id)
+        if buf and buf[-1].id >= message.id:
+            return  # duplicate or out of order (already seen via a seed)
+        buf.append(message)
+
+    def remove(self, channel_id: int, message_ids: set[int]) -> None:
+        buf = self._channels.get(channel_id)
+        if not buf:
+            return
+        kept = [m for m in buf if m.id not in message_ids]
+        if len(kept) != len(buf):
+            buf.clear()
+            buf.extend(kept)
+
+    async def recent(self, channel: discord.abc.Messageable, before_id: int, limit: int) -> list[discord.Message]:
+        """Up to `limit` messages older than before_id, newest first."""
+        buf = self._buffer(channel.id)
+        older = [m for m in buf if m.id < before_id]
+        if channel.id in self._seeded or len(older) >= limit:
+            return older[::-1][:limit]
+
+        fetched = [m async for m in channel.history(limit=limit, before=discord.Object(id=before_id))]
+        # merge: the seed is older than anything the gateway delivered since
+        newer = [m for m in buf if m.id not in {f.id for f in fetched}]
+        buf.clear()
+        buf.extend(sorted(fetched + newer, key=lambda m: m.id)[-BUFFER_PER_CHANNEL:])
+        self._seeded.add(channel.id)
+        return fetched
+
+
+_history_buffer: ChannelHistoryBuffer | None = None
+
+
+def get_history_buffer() -> ChannelHistoryBuffer:
+    global _history_buffer
+    if _history_buffer is None:
+        _history_buffer = ChannelHistoryBuffer()
+    return _history_buffer
+
+
 async def build_conversation_history(
     message: discord.Message,
     bot_user: discord.User | discord.ClientUser,
@@ -20,7 +94,7 @@ async def build_conversation_history(
 
     relevant: list[dict] = []
 
-    async for msg in message.channel.history(limit=limit):
+    for msg in await get_history_buffer().recent(message.channel, message.id, limit):
         if msg.id == message.id:
             continue
 
@@ -0,0 +1,63 @@
+# cogs/engagement/persona/triggers.py
+from __future__ import annotations
+
+from typing import Optional
+
+import discord
+
+from configs.config_pets import (
+    HUMAN_PERSONAS,
+    HUMAN_PERSONAS_ROLE_IDS,
+    HUMAN_PERSONAS_USER_IDS,
+)
+
+# Built once from config: id / webhook name -> pet_type. When one message
+# triggers several personas, the first in HUMAN_PERSONAS order wins.
+_ORDER: dict[str, int] = {pet_type: i for i, pet_type in enumerate(HUMAN_PERSONAS)}
+_BY_ROLE_ID: dict[int, str] = {}
+_BY_USER_ID: dict[int, str] = {}
+_BY_NAME: dict[str, str] = {}
+
+for _pet_type, _persona in HUMAN_PERSONAS.items():
+    if not _persona:
+        continue
+    _role_id = HUMAN_PERSONAS_ROLE_IDS.get(_pet_type)
+    _user_id = HUMAN_PERSONAS_USER_IDS.get(_pet_type)
+    if _role_id:
+        _BY_ROLE_ID.setdefault(int(_role_id), _pet_type)
+    if _user_id:
+        _BY_USER_ID.setdefault(int(_user_id), _pet_type)
+    _BY_NAME.setdefault(_persona.get("name") or _pet_type, _pet_type)
+
+
+def persona_name(pet_type: str) -> str:
+    return (HUMAN_PERSONAS.get(pet_type) or {}).get("name") or pet_type
+
+
+def needs_reference(message: discord.Message) -> bool:
+    """Whether resolving this message depends on the message it replies to."""
+    return bool(_BY_NAME and message.reference and message.reference.message_id)
+
+
+def resolve_persona(message: discord.Message, ref_msg: Optional[discord.Message] = None) -> Optional[str]:
+    """
+    The persona a message is addressed to (role/user mention, or a reply to a
+    persona's webhook message), in one pass over the message's mentions.
+    """
+    hits: set[str] = set()
+    for role in message.role_mentions:
+        pet_type = _BY_ROLE_ID.get(role.id)
+        if pet_type:
+            hits.add(pet_type)
+    for user in message.mentions:
+        pet_type = _BY_USER_ID.get(user.id)
+        if pet_type:
+            hits.add(pet_type)
+    if ref_msg is not None and ref_msg.webhook_id and ref_msg.author:
+        pet_type = _BY_NAME.get(ref_msg.author.name)
+        if pet_type:
+            hits.add(pet_type)
+
+    if not hits:
+        return None
+    return min(hits, key=lambda p: _ORDER.get(p, len(_ORDER)))
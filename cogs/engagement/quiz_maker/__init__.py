@@ -1,2 +1,4 @@
 # cogs/engagement/quiz_maker/__init__.py
-from .cog import setup  # re-export for load_extension("cogs.engagement.quiz_maker")
+async def setup(bot):      # proxy: extraction workers import this package without the cog
+    from .cog import setup as _setup
+    await _setup(bot)
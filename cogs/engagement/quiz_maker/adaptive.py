@@ -1,17 +1,113 @@
 # cogs/engagement/quiz_maker/adaptive.py
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import List, Callable, Awaitable, Optional, Tuple
 
 from openai import AsyncOpenAI
 
 from .question_builder import build_questions_from_text
-from .quiz_session import QuizSession
+from .quiz_session import Question, QuizSession
 
 log = logging.getLogger(__name__)
 
 MAX_ADAPTIVE_BATCH = 5
+# Start prefetching the next batch when this many questions are left in the current one
+PREFETCH_LOOKAHEAD = 2
+LEVELS = ["easy", "medium", "hard"]
+
+
+def _neighbour_levels(session: QuizSession) -> List[str]:
+    """Levels choose_next_difficulty can return next: one step either way."""
+    current = session.current_adaptive_level if session.current_adaptive_level in LEVELS else "medium"
+    idx = LEVELS.index(current)
+    return [current] + [LEVELS[i] for i in (idx - 1, idx + 1) if 0 <= i < len(LEVELS)]
+
+
+def _known_prompts(session: QuizSession) -> List[str]:
+    prompts = [q.prompt for q in session.questions]
+    for batch in session.prefetched.values():
+        prompts.extend(q.prompt for q in batch)
+    return prompts
+
+
+async def _prefetch_level(client: AsyncOpenAI, session: QuizSession, level: str, batch_size: int) -> None:
+    try:
+        questions = await build_questions_from_text(
+            client,
+            session.source_text,
+            num_questions=batch_size,
+            level=level,
+            existing_questions=_known_prompts(session),
+        )
+        session.prefetched.setdefault(level, []).extend(questions)
+    except asyncio.CancelledError:
+        raise
+    except Exception as exc:
+        log.info("Adaptive prefetch for %s failed: %s", level, exc)
+    finally:
+        session.prefetch_tasks.pop(level, None)
+
+
+def schedule_prefetch(client: AsyncOpenAI, session: QuizSession) -> None:
+    """
+    While the user is still answering, generate the next batch in the
+    background at every level the next difficulty step can land on, so the
+    batch is ready whichever way the level moves. Levels that already have a
+    full batch pooled, or a request in flight, are skipped.
+    """
+    if session.level != "adaptive" or session.source_text is None:
+        return
+    remaining = session.total_questions - len(session.questions)
+    if remaining <= 0:
+        return
+    if len(session.questions) - session.current_index > PREFETCH_LOOKAHEAD:
+        return
+
+    batch_size = min(MAX_ADAPTIVE_BATCH, remaining)
+    for level in _neighbour_levels(session):
+        if level in session.prefetch_tasks:
+            continue
+        if len(session.prefetched.get(level, [])) >= batch_size:
+            continue
+        session.prefetch_tasks[level] = asyncio.create_task(
+            _prefetch_level(client, session, level, batch_size)
+        )
+
+
+def cancel_prefetch(session: QuizSession) -> None:
+    """Drop pooled questions and cancel in-flight prefetches once a session ends."""
+    for task in list(session.prefetch_tasks.values()):
+        task.cancel()
+    session.prefetch_tasks.clear()
+    session.prefetched.clear()
+
+
+async def _take_prefetched(session: QuizSession, level: str, batch_size: int) -> List[Question]:
+    """Questions for `level` from the pool, waiting on an in-flight prefetch if there is one."""
+    task = session.prefetch_tasks.get(level)
+    if task is not None and len(session.prefetched.get(level, [])) < batch_size:
+        try:
+            await asyncio.shield(task)
+        except asyncio.CancelledError:
+            current = asyncio.current_task()
+            if not task.cancelled() or (current is not None and current.cancelling()):
+                raise  # we are the one being cancelled
+            # only the prefetch was cancelled: the caller generates live
+        except Exception:
+            pass
+
+    seen = {q.prompt.strip().lower() for q in session.questions}
+    taken: List[Question] = []
+    pool = session.prefetched.get(level, [])
+    while pool and len(taken) < batch_size:
+        q = pool.pop(0)
+        key = q.prompt.strip().lower()
+        if key not in seen:
+            seen.add(key)
+            taken.append(q)
+    return taken
 
 
 async def maybe_generate_more_questions_for_session(
@@ -23,6 +119,9 @@ async def maybe_generate_more_questions_for_session(
     For adaptive mode, generate additional batches of questions as needed.
     Ensures we try to reach the total number the user requested and avoid repeats.
 
+    Batches prefetched by schedule_prefetch are used first, so a level
+    change usually costs no model round-trip.
+
     If status_callback is provided, it will be awaited with human readable updates.
     """
     if session.level != "adaptive":
@@ -30,6 +129,8 @@ async def maybe_generate_more_questions_for_session(
     if session.source_text is None:
         return
 
+    schedule_prefetch(client, session)
+
     # Already have enough questions for the target total
     if len(session.questions) >= session.total_questions:
         return
@@ -48,33 +149,37 @@ async def maybe_generate_more_questions_for_session(
     if status_callback is not None and level_change_message:
         await status_callback(level_change_message)
 
-    if status_callback is not None:
-        await status_callback(
-            f"🧠 Generating **{batch_size}** more `{next_level}` questions "
-            f"for the adaptive quiz..."
-        )
+    new_questions = await _take_prefetched(session, next_level, batch_size)
+    missing = batch_size - len(new_questions)
 
-    existing_prompts: List[str] = [q.prompt for q in session.questions]
-
-    try:
-        new_questions = await build_questions_from_text(
-            client,
-            session.source_text,
-            num_questions=batch_size,
-            level=next_level,
-            existing_questions=existing_prompts,
-        )
-    except Exception as exc:
-        log.error(
-            "Failed to generate more questions for adaptive quiz: %s",
-            exc,
-            exc_info=True,
-        )
+    if missing > 0:
         if status_callback is not None:
             await status_callback(
-                "❌ Failed to generate additional questions for the adaptive quiz."
+                f"🧠 Generating **{missing}** more `{next_level}` questions "
+                f"for the adaptive quiz..."
             )
-        return
+
+        existing_prompts: List[str] = [q.prompt for q in session.questions + new_questions]
+        try:
+            new_questions += await build_questions_from_text(
+                client,
+                session.source_text,
+                num_questions=missing,
+                level=next_level,
+                existing_questions=existing_prompts,
+            )
+        except Exception as exc:
+            log.error(
+                "Failed to generate more questions for adaptive quiz: %s",
+                exc,
+                exc_info=True,
+            )
+            if not new_questions:
+                if status_callback is not None:
+                    await status_callback(
+                        "❌ Failed to generate additional questions for the adaptive quiz."
+                    )
+                return
 
     if not new_questions:
         if status_callback is not None:
@@ -85,7 +190,7 @@ async def maybe_generate_more_questions_for_session(
 
     session.questions.extend(new_questions)
 
-    if status_callback is not None:
+    if status_callback is not None and missing > 0:
         await status_callback(
             f"✅ Added **{len(new_questions)}** `{next_level}` questions. "
             f"Continuing the quiz..."
@@ -0,0 +1,107 @@
+# cogs/engagement/quiz_maker/chunking.py
+from __future__ import annotations
+
+import re
+from typing import List
+
+# Target size of one generation prompt's document excerpt
+SECTION_CHARS = 6000
+# Upper bound on model requests per generation call
+MAX_SECTIONS = 8
+
+_PARAGRAPH_SPLIT_RE = re.compile(r"\n\s*\n")
+_HEADING_RE = re.compile(r"^(#{1,6}\s|\d+(\.\d+)*[\.\)]?\s+[A-Z]|[A-Z][A-Z0-9 ,:&\-]{3,}$|Sheet: )")
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[\.\!\?])\s+")
+
+
+def _blocks(text: str) -> List[str]:
+    """
+    Paragraph-ish blocks. Extractors often emit one line per paragraph with no
+    blank lines, so single lines that look like headings also start a block.
+    """
+    blocks: List[str] = []
+    for para in _PARAGRAPH_SPLIT_RE.split(text):
+        current: List[str] = []
+        for line in para.splitlines():
+            if current and _HEADING_RE.match(line.strip()):
+                blocks.append("\n".join(current))
+                current = []
+            current.append(line)
+        if current:
+            blocks.append("\n".join(current))
+    return [b.strip() for b in blocks if b.strip()]
+
+
+def _split_long(block: str, limit: int) -> List[str]:
+    """Break an oversized block on sentence boundaries (hard cut as last resort)."""
+    parts: List[str] = []
+    current = ""
+    for sentence in _SENTENCE_SPLIT_RE.split(block):
+        while len(sentence) > limit:
+            if current:
+                parts.append(current)
+                current = ""
+            parts.append(sentence[:limit])
+            sentence = sentence[limit:]
+        if current and len(current) + 1 + len(sentence) > limit:
+            parts.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        parts.append(current)
+    return parts
+
+
+def split_into_sections(text: str, section_chars: int = SECTION_CHARS) -> List[str]:
+    """
+    Split a document into coherent sections of at most section_chars each,
+    packing whole paragraphs together and only breaking inside a paragraph
+    when it is too large on its own.
+    """
+    text = text.strip()
+    if not text:
+        return []
+
+    sections: List[str] = []
+    current: List[str] = []
+    size = 0
+    for block in _blocks(text):
+        pieces = _split_long(block, section_chars) if len(block) > section_chars else [block]
+        for piece in pieces:
+            if current and size + len(piece) + 2 > section_chars:
+                sections.append("\n\n".join(current))
+                current, size = [], 0
+            current.append(piece)
+            size += len(piece) + 2
+    if current:
+        sections.append("\n\n".join(current))
+    return sections
+
+
+def allocate_questions(sections: List[str], num_questions: int, max_sections: int = MAX_SECTIONS) -> List[int]:
+    """
+    Questions per section. At most min(num_questions, max_sections) sections
+    get any, picked evenly across the document so the quiz spans all of it;
+    the picked ones share the questions in proportion to their length
+    (largest remainder, at least one each).
+    """
+    n = len(sections)
+    counts = [0] * n
+    slots = min(n, num_questions, max_sections)
+    if slots <= 0:
+        return counts
+    picked = [(k * n) // slots for k in range(slots)]
+
+    total = sum(len(sections[i]) for i in picked) or 1
+    exact = {i: num_questions * len(sections[i]) / total for i in picked}
+    for i in picked:
+        counts[i] = max(1, int(exact[i]))
+    # fix rounding drift: add to the largest remainders / take from the largest overshoots
+    while sum(counts) < num_questions:
+        i = max(picked, key=lambda j: exact[j] - counts[j])
+        counts[i] += 1
+    while sum(counts) > num_questions:
+        i = max((j for j in picked if counts[j] > 1), key=lambda j: counts[j] - exact[j])
+        counts[i] -= 1
+    return counts
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import logging
+import os
 from pathlib import Path
 from typing import Dict, Optional, Tuple
 
@@ -12,8 +13,11 @@ from openai import AsyncOpenAI
 
 from configs.config_general import BOT_GUILD_ID, OPENAI_API_KEY
 
-from .file_loader import extract_text_from_file
+from .adaptive import cancel_prefetch
+from .extraction_pool import get_extraction_pool
+from .question_cache import get_question_cache
 from .quiz_session import QuizSession
+from .runtime_timers import get_timer_wheel
 from .stats import QuizStatsStore
 from .ui import QuizView, QuizSummaryView, QuizSetupView
 from .runtime_start import (
@@ -68,11 +72,29 @@ class QuizMakerCog(commands.Cog):
 
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
-        self.client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+        # QUIZ_OPENAI_BASE_URL points generation at any OpenAI-compatible server
+        self.client = AsyncOpenAI(
+            api_key=OPENAI_API_KEY,
+            base_url=os.getenv("QUIZ_OPENAI_BASE_URL") or None,
+        )
         self.sessions: Dict[SessionKey, QuizSession] = {}
         self.last_completed_sessions: Dict[Tuple[Optional[int], int], QuizSession] = {}
         self.stats_store = QuizStatsStore()
 
+    def cog_unload(self) -> None:
+        for session in self.sessions.values():
+            cancel_prefetch(session)
+        get_timer_wheel().stop()
+        get_extraction_pool().close()
+        try:
+            self.stats_store.flush()
+        except OSError:
+            log.warning("Failed to flush quiz stats index", exc_info=True)
+        try:
+            get_question_cache().flush_now()
+        except OSError:
+            log.warning("Failed to flush quiz question cache", exc_info=True)
+
     @app_commands.command(
         name="quiz_maker",
         description="Generate a multiple choice quiz from an uploaded file.",
@@ -128,7 +150,7 @@ class QuizMakerCog(commands.Cog):
 
         try:
             raw_bytes = await file.read()
-            text = extract_text_from_file(filename, raw_bytes)
+            text = await get_extraction_pool().extract(filename, raw_bytes)
         except Exception as exc:
             log.error("Error reading attachment: %s", exc, exc_info=True)
             message = str(exc).strip() or "Could not read that file."
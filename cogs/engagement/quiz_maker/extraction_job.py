@@ -0,0 +1,49 @@
+# cogs/engagement/quiz_maker/extraction_job.py
+"""
+Entry point for extraction worker processes. A spawn child imports this
+module and, once the memory limit is in place, file_loader; main.py keeps its
+bot setup under __main__, so nothing else comes along.
+"""
+from __future__ import annotations
+
+try:
+    import resource  # POSIX only
+except Exception:  # pragma: no cover
+    resource = None  # type: ignore[assignment]
+
+
+def _limit_memory(limit: int) -> None:
+    if resource is None:
+        return
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ValueError, OSError):
+        pass
+
+
+def serve(conn, memory_limit: int) -> None:
+    """
+    Worker loop: receive (filename, data, max_chars), reply ("ok", text) /
+    ("memory", None) / ("error", message), until the parent closes the pipe.
+    """
+    _limit_memory(memory_limit)
+    # the parser libraries load under the limit too
+    from .file_loader import extract_text_from_file
+
+    while True:
+        try:
+            filename, data, max_chars = conn.recv()
+        except (EOFError, OSError):
+            break
+        try:
+            reply = ("ok", extract_text_from_file(filename, data, max_chars=max_chars))
+        except MemoryError:
+            reply = ("memory", None)
+        except Exception as e:
+            reply = ("error", str(e))
+        del data
+        try:
+            conn.send(reply)
+        except (BrokenPipeError, OSError):
+            break
+    conn.close()
@@ -0,0 +1,124 @@
+# cogs/engagement/quiz_maker/extraction_pool.py
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+
+from .extraction_job import serve
+
+log = logging.getLogger(__name__)
+
+MAX_CONCURRENT_EXTRACTIONS = 2        # worker processes; jobs beyond this wait on the semaphore
+EXTRACTION_TIMEOUT_SECONDS = 30.0
+WORKER_MEMORY_LIMIT_BYTES = 1024 * 1024 * 1024  # address-space cap per worker (POSIX)
+MAX_EXTRACTED_CHARS = 200_000         # stop parsing once this much text is collected
+MAX_JOBS_PER_WORKER = 50              # recycle a worker after this many files (parser leaks)
+
+# spawn: never fork the bot's threads into a worker
+_ctx = multiprocessing.get_context("spawn")
+
+
+class _Worker:
+    """One long-lived extraction process and the parent's end of its pipe."""
+
+    def __init__(self) -> None:
+        self.conn, child_conn = _ctx.Pipe()
+        self.proc = _ctx.Process(target=serve, args=(child_conn, WORKER_MEMORY_LIMIT_BYTES), daemon=True)
+        self.proc.start()
+        child_conn.close()  # the child holds its end now
+        self.jobs = 0
+
+    def stop(self) -> None:
+        try:
+            self.conn.close()
+        except OSError:
+            pass
+        if self.proc.is_alive():
+            self.proc.kill()
+        self.proc.join(timeout=5)
+
+
+class ExtractionPool:
+    """
+    Runs document parsing (PyPDF2, python-docx, python-pptx, openpyxl) in
+    worker processes so a large upload never blocks the event loop.
+
+    - up to MAX_CONCURRENT_EXTRACTIONS long-lived workers, started on demand
+      and reused for later files (recycled after MAX_JOBS_PER_WORKER)
+    - a job cut off after EXTRACTION_TIMEOUT_SECONDS, or one that dies or
+      runs out of memory, only kills its own worker; the next job starts a
+      fresh one, and extractions running alongside are never touched
+    - workers run under an address-space limit; a job that blows it fails
+      with a friendly error instead of taking the bot with it
+    """
+
+    def __init__(self) -> None:
+        self._sem = asyncio.Semaphore(MAX_CONCURRENT_EXTRACTIONS)
+        self._idle: list[_Worker] = []
+        self._workers: set[_Worker] = set()
+
+    async def _checkout(self) -> _Worker:
+        while self._idle:
+            worker = self._idle.pop()
+            if worker.proc.is_alive():
+                return worker
+            self._workers.discard(worker)
+            await asyncio.to_thread(worker.stop)
+        worker = await asyncio.to_thread(_Worker)
+        self._workers.add(worker)
+        return worker
+
+    async def extract(self, filename: str, data: bytes, max_chars: int = MAX_EXTRACTED_CHARS) -> str:
+        async with self._sem:
+            worker = await self._checkout()
+            reusable = False
+            try:
+                try:
+                    await asyncio.to_thread(worker.conn.send, (filename, data, max_chars))
+                except OSError:
+                    raise RuntimeError("Could not read that file.") from None
+
+                ready = await asyncio.to_thread(worker.conn.poll, EXTRACTION_TIMEOUT_SECONDS)
+                if not ready:
+                    log.warning("Extraction of %s timed out after %ss", filename, EXTRACTION_TIMEOUT_SECONDS)
+                    raise RuntimeError("Reading that file took too long. Try a smaller file.")
+                try:
+                    status, payload = await asyncio.to_thread(worker.conn.recv)
+                except (EOFError, OSError):
+                    status, payload = "memory", None  # died without answering
+                worker.jobs += 1
+                # after a MemoryError the process may be in a bad state: replace it
+                reusable = status != "memory" and worker.jobs < MAX_JOBS_PER_WORKER
+            finally:
+                if reusable:
+                    self._idle.append(worker)
+                else:
+                    self._workers.discard(worker)
+                    await asyncio.to_thread(worker.stop)
+
+            if status == "ok":
+                return payload
+            if status == "memory":
+                log.warning("Extraction worker for %s died (memory limit?)", filename)
+                raise RuntimeError("That file is too complex to read. Try a smaller file.")
+            raise RuntimeError(payload or "Could not read that file.")
+
+    def close(self) -> None:
+        for worker in list(self._workers):
+            try:
+                worker.stop()
+            except Exception:
+                pass
+        self._workers.clear()
+        self._idle.clear()
+
+
+_extraction_pool: ExtractionPool | None = None
+
+
+def get_extraction_pool() -> ExtractionPool:
+    global _extraction_pool
+    if _extraction_pool is None:
+        _extraction_pool = ExtractionPool()
+    return _extraction_pool
@@ -4,7 +4,7 @@ from __future__ import annotations
 import csv
 from io import BytesIO, StringIO
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Iterator
 
 try:
     from PyPDF2 import PdfReader
@@ -38,16 +38,16 @@ def _decode_bytes(data: bytes) -> str:
         return data.decode("latin-1", errors="ignore")
 
 
-def _csv_to_text(data: bytes) -> str:
-    """Convert CSV bytes into a rough text representation."""
+def _csv_to_text(data: bytes) -> Iterator[str]:
+    """Convert CSV bytes into a rough text representation, row by row."""
     decoded = _decode_bytes(data)
     reader = csv.reader(StringIO(decoded))
     lines: Iterable[str] = (", ".join(row) for row in reader)
-    return "\n".join(lines)
+    yield from lines
 
 
-def _pdf_to_text(data: bytes) -> str:
-    """Extract text from a PDF file using PyPDF2."""
+def _pdf_to_text(data: bytes) -> Iterator[str]:
+    """Extract text from a PDF file using PyPDF2, page by page."""
     if PdfReader is None:
         raise RuntimeError(
             "PyPDF2 is required for PDF support. Install with 'pip install PyPDF2'."
@@ -55,18 +55,16 @@ def _pdf_to_text(data: bytes) -> str:
 
     bio = BytesIO(data)
     reader = PdfReader(bio)
-    parts: list[str] = []
     for page in reader.pages:
         try:
             txt = page.extract_text() or ""
         except Exception:
             txt = ""
         if txt:
-            parts.append(txt)
-    return "\n".join(parts)
+            yield txt
 
 
-def _docx_to_text(data: bytes) -> str:
+def _docx_to_text(data: bytes) -> Iterator[str]:
     """Extract text from a .docx file using python-docx."""
     if docx is None:
         raise RuntimeError(
@@ -75,13 +73,12 @@ def _docx_to_text(data: bytes) -> str:
 
     bio = BytesIO(data)
     document = docx.Document(bio)
-    parts: list[str] = []
 
     # Paragraphs
     for para in document.paragraphs:
         text = (para.text or "").strip()
         if text:
-            parts.append(text)
+            yield text
 
     # Tables
     for table in document.tables:
@@ -92,12 +89,10 @@ def _docx_to_text(data: bytes) -> str:
                 if (cell.text or "").strip()
             ]
             if cell_texts:
-                parts.append(" | ".join(cell_texts))
+                yield " | ".join(cell_texts)
 
-    return "\n".join(parts)
 
-
-def _pptx_to_text(data: bytes) -> str:
+def _pptx_to_text(data: bytes) -> Iterator[str]:
     """Extract text from a .pptx file using python-pptx."""
     if Presentation is None:
         raise RuntimeError(
@@ -106,19 +101,16 @@ def _pptx_to_text(data: bytes) -> str:
 
     bio = BytesIO(data)
     prs = Presentation(bio)
-    parts: list[str] = []
 
     for slide in prs.slides:
         for shape in slide.shapes:
             text = getattr(shape, "text", "") or ""
             text = text.strip()
             if text:
-                parts.append(text)
-
-    return "\n".join(parts)
+                yield text
 
 
-def _xlsx_to_text(data: bytes) -> str:
+def _xlsx_to_text(data: bytes) -> Iterator[str]:
     """Extract text from an Excel workbook using openpyxl."""
     if openpyxl is None:
         raise RuntimeError(
@@ -127,19 +119,31 @@ def _xlsx_to_text(data: bytes) -> str:
 
     bio = BytesIO(data)
     wb = openpyxl.load_workbook(bio, read_only=True, data_only=True)
-    parts: list[str] = []
-
-    for ws in wb.worksheets:
-        parts.append(f"Sheet: {ws.title}")
-        for row in ws.iter_rows(values_only=True):
-            values = [str(v) for v in row if v is not None]
-            if values:
-                parts.append(", ".join(values))
-
-    return "\n".join(parts)
-
-
-def extract_text_from_file(filename: str, data: bytes) -> str:
+    try:
+        for ws in wb.worksheets:
+            yield f"Sheet: {ws.title}"
+            for row in ws.iter_rows(values_only=True):
+                values = [str(v) for v in row if v is not None]
+                if values:
+                    yield ", ".join(values)
+    finally:
+        wb.close()
+
+
+def _collect(parts: Iterable[str], max_chars: int | None) -> str:
+    """Join streamed parts, stopping as soon as max_chars is reached."""
+    out: list[str] = []
+    size = 0
+    for part in parts:
+        out.append(part)
+        size += len(part) + 1
+        if max_chars is not None and size >= max_chars:
+            break
+    text = "\n".join(out)
+    return text if max_chars is None else text[:max_chars]
+
+
+def extract_text_from_file(filename: str, data: bytes, max_chars: int | None = None) -> str:
     """
     Best effort extraction of text from a file based on extension.
 
@@ -152,6 +156,10 @@ def extract_text_from_file(filename: str, data: bytes) -> str:
     - XLSX and related formats
 
     Falls back to plain decoding for unknown types.
+
+    Paged formats are read part by part (PDF pages, paragraphs, slides, rows),
+    so with max_chars set the parser stops once enough text is collected.
+    CPU heavy for big documents: call it through extraction_pool from async code.
     """
     suffix = Path(filename).suffix.lower()
 
@@ -174,22 +182,22 @@ def extract_text_from_file(filename: str, data: bytes) -> str:
     }
 
     if suffix in text_like:
-        return _decode_bytes(data)
+        return _collect([_decode_bytes(data)], max_chars)
 
     if suffix == ".csv":
-        return _csv_to_text(data)
+        return _collect(_csv_to_text(data), max_chars)
 
     if suffix == ".pdf":
-        return _pdf_to_text(data)
+        return _collect(_pdf_to_text(data), max_chars)
 
     if suffix == ".docx":
-        return _docx_to_text(data)
+        return _collect(_docx_to_text(data), max_chars)
 
     if suffix == ".pptx":
-        return _pptx_to_text(data)
+        return _collect(_pptx_to_text(data), max_chars)
 
     if suffix in {".xlsx", ".xlsm", ".xltx", ".xltm"}:
-        return _xlsx_to_text(data)
+        return _collect(_xlsx_to_text(data), max_chars)
 
     # Generic fallback for anything else
-    return _decode_bytes(data)
+    return _collect([_decode_bytes(data)], max_chars)
@@ -1,21 +1,30 @@
 # cogs/engagement/quiz_maker/question_builder.py
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+import os
 import re
 from typing import List
 
 from openai import AsyncOpenAI
 
+from .chunking import SECTION_CHARS, allocate_questions, split_into_sections
 from .quiz_session import Question
 
 log = logging.getLogger(__name__)
 
 _PREFIX_RE = re.compile(r"^[A-Z]\s*[\)\.\:\-\]]\s*", re.IGNORECASE)
+_NON_WORD_RE = re.compile(r"[^\w]+")
 
+# Model used for generation; overridable so a local stand-in server can be used
+QUIZ_MODEL = os.getenv("QUIZ_OPENAI_MODEL", "gpt-4o-mini")
+# Section requests in flight at once for one quiz
+GENERATION_CONCURRENCY = 4
 
-def _truncate_text(text: str, max_chars: int = 6000) -> str:
+
+def _truncate_text(text: str, max_chars: int = SECTION_CHARS) -> str:
     """Limit input size so prompts do not explode."""
     if len(text) <= max_chars:
         return text
@@ -116,6 +125,11 @@ def _safe_load_json(raw: str) -> dict:
         raise ValueError(f"Model returned invalid JSON: {exc}") from exc
 
 
+def _prompt_key(text: str) -> str:
+    """Dedupe key for a question: case, punctuation and spacing are ignored."""
+    return _NON_WORD_RE.sub(" ", str(text).lower()).strip()
+
+
 def _clean_choice_text(text: str) -> str:
     """
     Strip any leading label like 'A)', 'b.', 'C -' from a choice string.
@@ -126,26 +140,16 @@ def _clean_choice_text(text: str) -> str:
     return text.strip()
 
 
-async def build_questions_from_text(
+async def _generate_for_section(
     client: AsyncOpenAI,
-    source_text: str,
+    section_text: str,
     num_questions: int,
-    *,
-    level: str = "medium",
-    model: str = "gpt-4o-mini",
-    existing_questions: list[str] | None = None,
+    level: str,
+    model: str,
+    existing_questions: list[str] | None,
 ) -> List[Question]:
-    """
-    Use the OpenAI client to generate questions from text.
-
-    This is asynchronous so it does not block the event loop.
-
-    When existing_questions is provided, attempts to avoid generating
-    questions with the same prompt text.
-    """
-    trimmed = _truncate_text(source_text)
-    level_normalized = _normalize_level(level)
-    prompt = _build_prompt(trimmed, num_questions, level_normalized, existing_questions)
+    """One model request over one excerpt; returns parsed, validated questions."""
+    prompt = _build_prompt(_truncate_text(section_text), num_questions, level, existing_questions)
 
     resp = await client.chat.completions.create(
         model=model,
@@ -167,15 +171,6 @@ async def build_questions_from_text(
     if not isinstance(raw_questions, list) or not raw_questions:
         raise ValueError("Model response missing 'questions' list")
 
-    existing_normalized: set[str] = set()
-    if existing_questions:
-        for q in existing_questions:
-            text = str(q).strip().lower()
-            if text:
-                existing_normalized.add(text)
-
-    batch_seen_prompts: set[str] = set()
-
     questions: List[Question] = []
     for item in raw_questions:
         try:
@@ -190,14 +185,6 @@ async def build_questions_from_text(
         if not q_text or len(choices) < 2:
             continue
 
-        normalized_prompt = q_text.strip().lower()
-        if not normalized_prompt:
-            continue
-
-        if normalized_prompt in existing_normalized or normalized_prompt in batch_seen_prompts:
-            continue
-        batch_seen_prompts.add(normalized_prompt)
-
         if correct_index < 0 or correct_index >= len(choices):
             correct_index = 0
 
@@ -211,11 +198,105 @@ async def build_questions_from_text(
                 choices=choices,
                 correct_index=correct_index,
                 explanation=explanation or "No explanation provided.",
-                difficulty=level_normalized,
+                difficulty=level,
             )
         )
+    return questions
+
+
+def _merge_sections(
+    per_section: List[List[Question]],
+    existing_questions: list[str] | None,
+) -> List[Question]:
+    """
+    Interleave section results round-robin so any prefix of the quiz spans the
+    document, dropping repeats of each other and of existing_questions.
+    """
+    seen: set[str] = {_prompt_key(q) for q in existing_questions or []}
+    seen.discard("")
+
+    merged: List[Question] = []
+    depth = max((len(qs) for qs in per_section), default=0)
+    for i in range(depth):
+        for qs in per_section:
+            if i >= len(qs):
+                continue
+            key = _prompt_key(qs[i].prompt)
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            merged.append(qs[i])
+    return merged
+
+
+async def build_questions_from_text(
+    client: AsyncOpenAI,
+    source_text: str,
+    num_questions: int,
+    *,
+    level: str = "medium",
+    model: str | None = None,
+    existing_questions: list[str] | None = None,
+) -> List[Question]:
+    """
+    Use the OpenAI client to generate questions from text.
+
+    Long documents are split into sections (see chunking.py) and questions
+    are allocated across them, so the quiz covers the whole file instead of
+    its first page. Sections are generated concurrently, at most
+    GENERATION_CONCURRENCY requests at a time, then merged and deduplicated.
+    A failed section only costs its share; a short result is topped up once
+    from the sections that did answer.
+
+    When existing_questions is provided, attempts to avoid generating
+    questions with the same prompt text.
+    """
+    level_normalized = _normalize_level(level)
+    model = model or QUIZ_MODEL
+
+    sections = split_into_sections(source_text) or [source_text]
+    counts = allocate_questions(sections, num_questions)
+    jobs = [(s, n) for s, n in zip(sections, counts) if n > 0]
+
+    sem = asyncio.Semaphore(GENERATION_CONCURRENCY)
+
+    async def run(section_text: str, n: int) -> List[Question]:
+        async with sem:
+            return await _generate_for_section(
+                client, section_text, n, level_normalized, model, existing_questions
+            )
+
+    results = await asyncio.gather(*(run(s, n) for s, n in jobs), return_exceptions=True)
+
+    per_section: List[List[Question]] = []
+    answered: List[str] = []
+    errors: List[BaseException] = []
+    for (section_text, _), result in zip(jobs, results):
+        if isinstance(result, BaseException):
+            log.warning("Quiz section generation failed: %s", result)
+            errors.append(result)
+            per_section.append([])
+        else:
+            per_section.append(result)
+            answered.append(section_text)
+
+    questions = _merge_sections(per_section, existing_questions)
+
+    missing = num_questions - len(questions)
+    if missing > 0 and answered and len(jobs) > 1:
+        # top up from the largest section that worked, steering away from what we have
+        avoid = list(existing_questions or []) + [q.prompt for q in questions]
+        try:
+            extra = await _generate_for_section(
+                client, max(answered, key=len), missing, level_normalized, model, avoid
+            )
+            questions += _merge_sections([extra], avoid)
+        except Exception as exc:
+            log.warning("Quiz top-up generation failed: %s", exc)
 
     if not questions:
+        if len(errors) == len(jobs) and errors and isinstance(errors[0], Exception):
+            raise errors[0]
         raise ValueError("No valid questions parsed from model output")
 
     return questions[:num_questions]
@@ -0,0 +1,246 @@
+# cogs/engagement/quiz_maker/question_cache.py
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from openai import AsyncOpenAI
+
+from .question_builder import QUIZ_MODEL, _normalize_level, _prompt_key, build_questions_from_text
+from .quiz_session import Question
+
+log = logging.getLogger(__name__)
+
+MAX_CACHE_BYTES = 8 * 1024 * 1024     # whole file; least recently used documents go first
+MAX_POOL_QUESTIONS = 60               # per (document, level, model); past this we only reshuffle
+SAVE_DELAY_SECONDS = 30.0             # changes are batched into one write per window
+
+
+def _cache_key(text: str, level: str, model: str) -> str:
+    digest = hashlib.sha256(text.encode("utf-8", errors="ignore")).hexdigest()
+    return f"{digest}:{level}:{model}"
+
+
+def _shuffled_copy(item: Dict[str, Any]) -> Question:
+    """Question from a cached dict with its choices reordered."""
+    choices = list(item["choices"])
+    correct = choices[item["correct_index"]]
+    random.shuffle(choices)
+    return Question(
+        prompt=item["prompt"],
+        choices=choices,
+        correct_index=choices.index(correct),
+        explanation=item["explanation"],
+        difficulty=item.get("difficulty", "medium"),
+    )
+
+
+class QuestionCache:
+    """
+    Generated questions keyed by (sha256 of the extracted text, level, model).
+
+    Each entry is a pool of questions plus the ones already served in the
+    current round. Requests are answered from unserved questions first; only
+    when those run out is the model asked for more (up to MAX_POOL_QUESTIONS),
+    after which rounds simply restart. Served questions come back shuffled,
+    choices included.
+
+    Changes only mark the cache dirty; one write per SAVE_DELAY_SECONDS
+    window (and flush_now() at unload) persists them, with the JSON encoding
+    done in a worker thread.
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path or Path(__file__).with_name("question_cache.json")
+        self._entries: Dict[str, Dict[str, Any]] | None = None
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._write_lock = asyncio.Lock()
+        self._dirty = False
+        self._flush_task: asyncio.Task | None = None
+
+    # ---------- storage ----------
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is None:
+            try:
+                with self.path.open("r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self._entries = data if isinstance(data, dict) else {}
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._entries = {}
+        return self._entries
+
+    def _snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Copy of the entry structure, safe to encode off the loop: question dicts
+        are never mutated once cached, so only the containers are copied.
+        """
+        entries = self._load()
+        self._evict(entries)
+        return {
+            key: {**entry, "questions": list(entry["questions"]), "served": list(entry["served"])}
+            for key, entry in entries.items()
+        }
+
+    def _write(self, snapshot: Dict[str, Dict[str, Any]]) -> None:
+        payload = json.dumps(snapshot, separators=(",", ":"))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            f.write(payload)
+        tmp.replace(self.path)
+
+    def _mark_dirty(self) -> None:
+        self._dirty = True
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(SAVE_DELAY_SECONDS)
+        try:
+            await self.flush()
+        except Exception:
+            log.warning("Failed to persist quiz question cache", exc_info=True)
+
+    async def flush(self) -> None:
+        """Write pending changes; encoding and file I/O run in a thread."""
+        if not self._dirty:
+            return
+        self._dirty = False
+        snapshot = self._snapshot()
+        try:
+            async with self._write_lock:
+                await asyncio.to_thread(self._write, snapshot)
+        except Exception:
+            self._dirty = True
+            raise
+
+    def flush_now(self) -> None:
+        """Blocking write of pending changes, for cog unload."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        if self._dirty:
+            self._dirty = False
+            self._write(self._snapshot())
+
+    def _evict(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        total = sum(e.get("size", 0) for e in entries.values())
+        for key in sorted(entries, key=lambda k: entries[k].get("last_used", 0)):
+            if total <= MAX_CACHE_BYTES:
+                break
+            total -= entries.pop(key).get("size", 0)
+            self._drop_lock(key)
+
+    def _drop_lock(self, key: str) -> None:
+        lock = self._locks.get(key)
+        if lock is not None and not lock.locked():
+            del self._locks[key]
+
+    # ---------- serving ----------
+    async def get_questions(
+        self,
+        client: AsyncOpenAI,
+        source_text: str,
+        num_questions: int,
+        *,
+        level: str = "medium",
+        model: str | None = None,
+        existing_questions: list[str] | None = None,
+    ) -> List[Question]:
+        """Drop-in for build_questions_from_text that serves from the cache."""
+        level = _normalize_level(level)
+        model = model or QUIZ_MODEL
+        key = _cache_key(source_text, level, model)
+        lock = self._locks.setdefault(key, asyncio.Lock())
+
+        # one generation per document/level at a time; a second identical
+        # upload waits and is then served from what the first produced
+        try:
+            async with lock:
+                return await self._serve(
+                    client, key, source_text, num_questions, level, model, existing_questions
+                )
+        finally:
+            if key not in self._load():
+                self._drop_lock(key)
+
+    async def _serve(
+        self,
+        client: AsyncOpenAI,
+        key: str,
+        source_text: str,
+        num_questions: int,
+        level: str,
+        model: str,
+        existing_questions: list[str] | None,
+    ) -> List[Question]:
+        entries = self._load()
+        entry = entries.setdefault(key, {"questions": [], "served": [], "size": 0})
+        pool: List[Dict[str, Any]] = entry["questions"]
+        excluded = {_prompt_key(q) for q in existing_questions or []}
+
+        def fresh() -> List[int]:
+            served = set(entry["served"])
+            return [
+                i for i, q in enumerate(pool)
+                if i not in served and _prompt_key(q["prompt"]) not in excluded
+            ]
+
+        available = fresh()
+        generated: List[Question] = []
+        if len(available) < num_questions and len(pool) < MAX_POOL_QUESTIONS:
+            want = min(num_questions - len(available), MAX_POOL_QUESTIONS - len(pool))
+            avoid = [q["prompt"] for q in pool] + list(existing_questions or [])
+            try:
+                generated = await build_questions_from_text(
+                    client,
+                    source_text,
+                    want,
+                    level=level,
+                    model=model,
+                    existing_questions=avoid,
+                )
+            except Exception:
+                if not pool:
+                    entries.pop(key, None)
+                    raise
+                # fall back to what we have (a new round if it's all been served)
+                log.warning("Quiz cache top-up failed; serving from %d cached", len(pool), exc_info=True)
+            if generated:
+                pool.extend(asdict(q) for q in generated)
+                entry["size"] = len(json.dumps(pool, separators=(",", ":")))
+                available = fresh()
+
+        if len(available) < num_questions:
+            # pool can't grow further: start a new round over everything
+            entry["served"] = []
+            rest = [i for i in fresh() if i not in available]
+            random.shuffle(rest)
+            available += rest[: num_questions - len(available)]
+
+        picked = random.sample(available, min(num_questions, len(available)))
+        served = sorted(set(entry["served"]) | set(picked))
+        changed = bool(generated) or served != entry["served"]
+        entry["served"] = served
+        entry["last_used"] = time.time()
+        if changed:  # a bare last_used bump rides along with the next real write
+            self._mark_dirty()
+
+        return [_shuffled_copy(pool[i]) for i in picked]
+
+
+_question_cache: QuestionCache | None = None
+
+
+def get_question_cache() -> QuestionCache:
+    global _question_cache
+    if _question_cache is None:
+        _question_cache = QuestionCache()
+    return _question_cache
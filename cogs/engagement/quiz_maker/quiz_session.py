@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 
 @dataclass
@@ -63,6 +63,11 @@ class QuizSession:
     # For future multi user scoring
     player_scores: Dict[int, int] = field(default_factory=dict)
 
+    # Adaptive prefetch: batches generated ahead per level, and the tasks
+    # still producing them (see adaptive.schedule_prefetch)
+    prefetched: Dict[str, List[Question]] = field(default_factory=dict, repr=False)
+    prefetch_tasks: Dict[str, Any] = field(default_factory=dict, repr=False)
+
     def current_question(self) -> Optional[Question]:
         if 0 <= self.current_index < len(self.questions):
             return self.questions[self.current_index]
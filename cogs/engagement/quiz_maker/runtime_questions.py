@@ -7,7 +7,7 @@ from typing import Tuple
 
 import discord
 
-from .adaptive import maybe_generate_more_questions_for_session
+from .adaptive import cancel_prefetch, maybe_generate_more_questions_for_session
 from .embeds import (
     build_question_embed,
     build_review_embed,
@@ -16,7 +16,7 @@ from .embeds import (
 from .summary import compute_summary_stats
 from .stats import QuizResult
 from .ui import QuizView, QuizSummaryView
-from .runtime_timers import run_question_timer
+from .runtime_timers import apply_time_field, run_question_timer
 
 log = logging.getLogger(__name__)
 
@@ -56,6 +56,7 @@ async def send_next_question(
         question_timeout=session.question_timeout,
     )
     embed = build_question_embed(session, question)
+    apply_time_field(embed, session)
     msg = await channel.send(
         content=f"<@{session.user_id}>",
         embed=embed,
@@ -64,9 +65,7 @@ async def send_next_question(
     view.message = msg
 
     if session.question_timeout or session.total_timeout:
-        cog.bot.loop.create_task(
-            run_question_timer(cog, session, msg, session.current_index)
-        )
+        run_question_timer(cog, session, msg, session.current_index)
 
 
 async def send_summary(
@@ -76,6 +75,7 @@ async def send_summary(
 ) -> None:
     key: SessionKey = (session.channel_id, session.user_id)
     cog.sessions.pop(key, None)
+    cancel_prefetch(session)
 
     summary_stats = compute_summary_stats(session)
     embed = build_summary_embed(session, summary_stats)
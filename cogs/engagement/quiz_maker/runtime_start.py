@@ -7,7 +7,7 @@ from typing import Tuple
 
 import discord
 
-from .question_builder import build_questions_from_text
+from .question_cache import get_question_cache
 from .quiz_session import QuizSession
 from .runtime_questions import send_next_question
 from .runtime_timers import watch_total_timeout
@@ -70,14 +70,14 @@ async def start_quiz_from_setup(
     try:
         if difficulty_mode == "adaptive":
             initial_batch = min(5, num_questions_requested)
-            questions = await build_questions_from_text(
+            questions = await get_question_cache().get_questions(
                 cog.client,
                 text,
                 num_questions=initial_batch,
                 level="medium",
             )
         else:
-            questions = await build_questions_from_text(
+            questions = await get_question_cache().get_questions(
                 cog.client,
                 text,
                 num_questions=num_questions_requested,
@@ -140,9 +140,7 @@ async def start_quiz_from_setup(
 
     # Start total timer watcher if timed
     if total_timeout > 0:
-        cog.bot.loop.create_task(
-            watch_total_timeout(cog, key)
-        )
+        watch_total_timeout(cog, key)
 
     await send_next_question(cog, channel, session)
     await channel.send(
@@ -207,14 +205,14 @@ async def restart_quiz_from_summary(
     try:
         if difficulty_mode == "adaptive":
             initial_batch = min(5, num_questions_requested)
-            questions = await build_questions_from_text(
+            questions = await get_question_cache().get_questions(
                 cog.client,
                 previous_session.source_text,
                 num_questions=initial_batch,
                 level="medium",
             )
         else:
-            questions = await build_questions_from_text(
+            questions = await get_question_cache().get_questions(
                 cog.client,
                 previous_session.source_text,
                 num_questions=num_questions_requested,
@@ -268,9 +266,7 @@ async def restart_quiz_from_summary(
     cog.sessions[key] = session
 
     if total_timeout > 0:
-        cog.bot.loop.create_task(
-            watch_total_timeout(cog, key)
-        )
+        watch_total_timeout(cog, key)
 
     await send_next_question(cog, channel, session)
     await interaction.followup.send(
@@ -4,162 +4,281 @@ from __future__ import annotations
 import asyncio
 import logging
 import time
-from typing import Tuple
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
 
 import discord
 
+from utils.rest_scheduler import PRIORITY_COSMETIC, message_route, schedule_mutation
+
 log = logging.getLogger(__name__)
 
 SessionKey = Tuple[int, int]
 
+# One wheel tick drives every quiz; nothing per session sleeps on its own
+TICK_SECONDS = 1.0
+# Warn this long before the total quiz limit is reached
+TOTAL_WARN_BEFORE = 15
 
-async def run_question_timer(
-    cog: "QuizMakerCog",
-    session,
-    message: discord.Message,
-    question_index: int,
-) -> None:
-    """Periodically update the question embed with remaining time."""
-    try:
-        while True:
-            await asyncio.sleep(1)
 
-            # If we moved on or finished, stop updating
-            if session.current_index != question_index or session.is_finished():
-                break
+def _edit_interval(remaining: float) -> float:
+    """
+    Seconds between "⏱ Time" refreshes. The field carries <t:…:R> timestamps
+    that Discord counts down client side, so edits only refresh the coarse
+    "N s remaining" text: rarely while far from expiry, more often near it.
+    """
+    if remaining > 60:
+        return 30.0
+    if remaining > 20:
+        return 10.0
+    return 5.0
 
-            now = time.perf_counter()
 
-            # Per question remaining time (active time on this question)
-            per_remaining = None
-            if session.question_timeout and session.current_question_started_at is not None:
-                per_left = int(
-                    session.question_timeout
-                    - (now - session.current_question_started_at)
-                )
-                per_remaining = max(0, per_left)
+def _remaining(session, now: float) -> Tuple[Optional[int], Optional[int]]:
+    """(per question, total quiz) seconds left, None where there is no limit."""
+    per_remaining = None
+    if session.question_timeout and session.current_question_started_at is not None:
+        per_remaining = max(0, int(session.question_timeout - (now - session.current_question_started_at)))
 
-            # Total quiz remaining based on cumulative active answering time
-            total_remaining = None
-            if session.total_timeout:
-                used = sum(session.question_durations)
-                if session.current_question_started_at is not None:
-                    used += max(0.0, now - session.current_question_started_at)
+    # Total quiz remaining based on cumulative active answering time
+    total_remaining = None
+    if session.total_timeout:
+        used = sum(session.question_durations)
+        if session.current_question_started_at is not None:
+            used += max(0.0, now - session.current_question_started_at)
+        total_remaining = max(0, int(session.total_timeout - used))
+    return per_remaining, total_remaining
 
-                total_left = int(session.total_timeout - used)
-                total_remaining = max(0, total_left)
 
-            if per_remaining is None and total_remaining is None:
-                break
+def time_field_value(session) -> Optional[str]:
+    """Body of the question embed's "⏱ Time" field, or None for untimed quizzes."""
+    now = time.perf_counter()
+    wall = time.time()
+    per_remaining, total_remaining = _remaining(session, now)
 
-            if not message.embeds:
-                continue
+    timer_lines: List[str] = []
+    if per_remaining is not None:
+        timer_lines.append(
+            f"Per question: ends <t:{int(wall + per_remaining)}:R> · **{per_remaining} s** remaining "
+            f"of **{session.question_timeout} s**."
+        )
+    if total_remaining is not None:
+        # the total clock only runs while a question is open, so this
+        # deadline holds until the question is answered
+        timer_lines.append(
+            f"Total quiz: ends <t:{int(wall + total_remaining)}:R> · **{total_remaining} s** remaining "
+            f"of **{session.total_timeout} s**."
+        )
+    return "\n".join(timer_lines) or None
 
-            embed = message.embeds[0]
 
-            timer_lines = []
-            if per_remaining is not None and session.question_timeout:
-                timer_lines.append(
-                    f"Per question: **{per_remaining} s** remaining "
-                    f"of **{session.question_timeout} s**."
-                )
-            if total_remaining is not None and session.total_timeout:
-                timer_lines.append(
-                    f"Total quiz: **{total_remaining} s** remaining "
-                    f"of **{session.total_timeout} s**."
-                )
+def apply_time_field(embed: discord.Embed, session) -> None:
+    """Set (or add) the "⏱ Time" field on a question embed."""
+    timer_value = time_field_value(session)
+    if timer_value is None:
+        return
+    for i, field_ in enumerate(embed.fields):
+        if field_.name == "⏱ Time":
+            embed.set_field_at(index=i, name="⏱ Time", value=timer_value, inline=False)
+            return
+    embed.add_field(name="⏱ Time", value=timer_value, inline=False)
 
-            if not timer_lines:
-                continue
-
-            field_index = None
-            for i, field in enumerate(embed.fields):
-                if field.name == "⏱ Time":
-                    field_index = i
-                    break
-
-            timer_value = "\n".join(timer_lines)
-            if field_index is not None:
-                embed.set_field_at(
-                    index=field_index,
-                    name="⏱ Time",
-                    value=timer_value,
-                    inline=False,
-                )
-            else:
-                embed.add_field(
-                    name="⏱ Time",
-                    value=timer_value,
-                    inline=False,
-                )
 
-            try:
-                await message.edit(embed=embed)
-            except Exception:
-                log.exception("Failed to update quiz timer embed")
-                break
-    except asyncio.CancelledError:
-        return
-    except Exception:
-        log.exception("Error in quiz question timer task")
+@dataclass
+class _QuestionTimer:
+    session: object
+    message: discord.Message
+    question_index: int
+    next_edit_at: float = 0.0
+    pending: Optional[asyncio.Future] = field(default=None, repr=False)
 
 
-async def watch_total_timeout(
-    cog: "QuizMakerCog",
-    session_key: SessionKey,
-) -> None:
+@dataclass
+class _TotalWatch:
+    cog: object
+    session_key: SessionKey
+    warned: bool = False
+
+
+class QuizTimerWheel:
     """
-    Watch the overall quiz time limit based on active answering time.
+    Single ticking task behind every quiz timer.
 
-    Total limit is:
-        total_timeout = question_timeout * total_questions
+    - question embeds: refreshed at _edit_interval cadence through the REST
+      mutation scheduler as cosmetic work keyed per message, so a message has
+      at most one edit queued and a slow edit is never stacked on
+    - total quiz limits: checked every tick (warning, then ending the quiz)
 
-    but instead of wall clock, we count the same "time spent" that the
-    summary uses so they cannot disagree.
+    The task runs only while something is registered.
     """
-    warn_before = 15
-    warned = False
 
-    try:
-        while True:
-            await asyncio.sleep(1)
+    def __init__(self) -> None:
+        self._questions: Dict[int, _QuestionTimer] = {}
+        self._totals: Dict[SessionKey, _TotalWatch] = {}
+        self._task: Optional[asyncio.Task] = None
 
-            session = cog.sessions.get(session_key)
-            if session is None or session.is_finished():
-                return
+    def track_question(self, session, message: discord.Message, question_index: int) -> None:
+        now = time.perf_counter()
+        per, total = _remaining(session, now)
+        first = min((x for x in (per, total) if x is not None), default=0)
+        self._questions[message.id] = _QuestionTimer(
+            session=session,
+            message=message,
+            question_index=question_index,
+            next_edit_at=now + _edit_interval(first),
+        )
+        self._ensure_running()
 
-            total_limit = session.total_timeout
-            if not total_limit or total_limit <= 0:
-                return
+    def watch_total(self, cog, session_key: SessionKey) -> None:
+        self._totals[session_key] = _TotalWatch(cog=cog, session_key=session_key)
+        self._ensure_running()
 
-            # Active time used so far
-            used = sum(session.question_durations)
-            if session.current_question_started_at is not None:
-                used += max(0.0, time.perf_counter() - session.current_question_started_at)
+    def _ensure_running(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
 
-            remaining = total_limit - used
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._questions.clear()
+        self._totals.clear()
 
-            if remaining <= 0:
-                channel = cog.bot.get_channel(session.channel_id)
-                if channel is None:
-                    return
+    async def _run(self) -> None:
+        try:
+            while self._questions or self._totals:
+                await asyncio.sleep(TICK_SECONDS)
+                now = time.perf_counter()
+                for key in list(self._totals):
+                    try:
+                        self._tick_total(self._totals[key], now)
+                    except Exception:
+                        # If this blows up, do not kill the whole bot
+                        log.exception("Error in quiz total timer")
+                        self._totals.pop(key, None)
+                for mid in list(self._questions):
+                    try:
+                        self._tick_question(self._questions[mid], now)
+                    except Exception:
+                        log.exception("Error in quiz question timer")
+                        self._questions.pop(mid, None)
+        except asyncio.CancelledError:
+            return
 
-                await channel.send(
-                    f"⏰ Quiz time limit reached for <@{session.user_id}>. Ending the quiz."
-                )
-                await cog._send_summary(channel, session)
+    # ---------- per question embeds ----------
+    def _tick_question(self, timer: _QuestionTimer, now: float) -> None:
+        session = timer.session
+        # If we moved on or finished, stop updating
+        if session.current_index != timer.question_index or session.is_finished():
+            self._questions.pop(timer.message.id, None)
+            return
+
+        per, total = _remaining(session, now)
+        if per is None and total is None:
+            self._questions.pop(timer.message.id, None)
+            return
+        if now < timer.next_edit_at:
+            return
+        if timer.pending is not None and not timer.pending.done():
+            return  # previous refresh still queued or in flight
+
+        timer.next_edit_at = now + _edit_interval(min((x for x in (per, total) if x is not None), default=0))
+        message = timer.message
+
+        async def refresh() -> None:
+            # render when the edit actually runs, not when it was queued
+            if session.current_index != timer.question_index or not message.embeds:
                 return
+            embed = message.embeds[0]
+            apply_time_field(embed, session)
+            try:
+                await message.edit(embed=embed)
+            except discord.NotFound:
+                self._questions.pop(message.id, None)
+            except Exception:
+                log.exception("Failed to update quiz timer embed")
+                self._questions.pop(message.id, None)
+
+        timer.pending = schedule_mutation(
+            message_route(message.channel.id),
+            refresh,
+            key=("quiz_timer", message.id),
+            priority=PRIORITY_COSMETIC,
+        )
 
-            if remaining <= warn_before and not warned:
-                channel = cog.bot.get_channel(session.channel_id)
-                if channel is not None:
-                    await channel.send(
-                        f"⏰ Quiz time limit will be reached in {int(remaining)} seconds "
-                        f"for <@{session.user_id}>."
+    # ---------- total quiz limit ----------
+    def _tick_total(self, watch: _TotalWatch, now: float) -> None:
+        cog = watch.cog
+        session = cog.sessions.get(watch.session_key)
+        if session is None or session.is_finished() or not session.total_timeout:
+            self._totals.pop(watch.session_key, None)
+            return
+
+        _, remaining = _remaining(session, now)
+        if remaining is None:
+            return
+
+        if remaining <= 0:
+            self._totals.pop(watch.session_key, None)
+            asyncio.get_running_loop().create_task(_end_on_total_timeout(cog, session))
+            return
+
+        if remaining <= TOTAL_WARN_BEFORE and not watch.warned:
+            watch.warned = True
+            channel = cog.bot.get_channel(session.channel_id)
+            if channel is not None:
+                asyncio.get_running_loop().create_task(
+                    _send_quietly(
+                        channel,
+                        f"⏰ Quiz time limit will be reached in {remaining} seconds "
+                        f"for <@{session.user_id}>.",
                     )
-                warned = True
-    except asyncio.CancelledError:
+                )
+
+
+async def _send_quietly(channel, content: str) -> None:
+    try:
+        await channel.send(content)
+    except Exception:
+        log.exception("Failed to send quiz timer notice")
+
+
+async def _end_on_total_timeout(cog: "QuizMakerCog", session) -> None:
+    channel = cog.bot.get_channel(session.channel_id)
+    if channel is None:
         return
+    try:
+        await channel.send(
+            f"⏰ Quiz time limit reached for <@{session.user_id}>. Ending the quiz."
+        )
+        await cog._send_summary(channel, session)
     except Exception:
-        # If this blows up, do not kill the whole bot
-        log.exception("Error in quiz total timer task")
+        log.exception("Error ending quiz on total timeout")
+
+
+_timer_wheel: QuizTimerWheel | None = None
+
+
+def get_timer_wheel() -> QuizTimerWheel:
+    global _timer_wheel
+    if _timer_wheel is None:
+        _timer_wheel = QuizTimerWheel()
+    return _timer_wheel
+
+
+def run_question_timer(cog: "QuizMakerCog", session, message: discord.Message, question_index: int) -> None:
+    """Keep the question embed's time field current (driven by the shared wheel)."""
+    get_timer_wheel().track_question(session, message, question_index)
+
+
+def watch_total_timeout(cog: "QuizMakerCog", session_key: SessionKey) -> None:
+    """
+    Watch the overall quiz time limit based on active answering time.
+
+    Total limit is:
+        total_timeout = question_timeout * total_questions
+
+    but instead of wall clock, we count the same "time spent" that the
+    summary uses so they cannot disagree.
+    """
+    get_timer_wheel().watch_total(cog, session_key)
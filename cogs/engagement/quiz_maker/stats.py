@@ -1,11 +1,19 @@
 # cogs/engagement/quiz_maker/stats.py
 from __future__ import annotations
 
+import heapq
 import json
-from dataclasses import dataclass
+import logging
+from dataclasses import asdict, dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+log = logging.getLogger(__name__)
+
+# Rewrite the aggregate index after this many appends; anything newer is
+# replayed from the log on load
+INDEX_FLUSH_EVERY = 20
+
 
 @dataclass
 class QuizResult:
@@ -25,103 +33,165 @@ class QuizResult:
 
 class QuizStatsStore:
     """
-    Tiny JSON backed stats store.
+    Append-only JSONL result log plus per-(guild, user) aggregates.
+
+    add_result appends one line and updates one aggregate in memory. The
+    aggregates are snapshotted to an index file every INDEX_FLUSH_EVERY
+    results together with the log offset they cover; on load the index is
+    read and only the log tail past that offset is replayed. Stats lookups
+    are a dict hit, the leaderboard only looks at the guild's players.
 
-    This is intentionally simple. If you ever care about performance,
-    you can replace this with a database like an adult.
+    A legacy quiz_stats.json list is imported into the log on first use.
     """
 
     def __init__(self, path: Optional[Path] = None) -> None:
-        self.path = path or Path(__file__).with_name("quiz_stats.json")
+        base = path or Path(__file__).with_name("quiz_stats.json")
+        self.legacy_path = base
+        self.log_path = base.with_suffix(".jsonl")
+        self.index_path = base.with_name(base.stem + "_index.json")
+        # guild key -> user id -> aggregate
+        self._aggs: Dict[str, Dict[int, Dict[str, Any]]] = {}
+        self._offset = 0
+        self._unflushed = 0
+        self._loaded = False
+
+    # ---------- aggregates ----------
+    @staticmethod
+    def _guild_key(guild_id: Optional[int]) -> str:
+        return str(guild_id) if guild_id is not None else "none"
+
+    def _apply(self, item: Dict[str, Any]) -> None:
+        entry = self._aggs.setdefault(self._guild_key(item.get("guild_id")), {}).setdefault(
+            int(item["user_id"]),
+            {
+                "quizzes_played": 0,
+                "total_score": 0,
+                "total_questions": 0,
+                "best_percent": 0.0,
+                "best_score": 0,
+                "overall_fastest_time": None,
+            },
+        )
+        entry["quizzes_played"] += 1
+        entry["total_score"] += item["score"]
+        entry["total_questions"] += item["total_questions"]
+        entry["best_percent"] = max(entry["best_percent"], item["percent"])
+        entry["best_score"] = max(entry["best_score"], item["score"])
+        fastest = item.get("fastest_time")
+        if fastest is not None and (
+            entry["overall_fastest_time"] is None or fastest < entry["overall_fastest_time"]
+        ):
+            entry["overall_fastest_time"] = fastest
+
+    # ---------- storage ----------
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+
+        if not self.log_path.exists():
+            self._import_legacy()
 
-    def _load_all(self) -> List[Dict[str, Any]]:
         try:
-            with self.path.open("r", encoding="utf-8") as f:
-                data = json.load(f)
-            if isinstance(data, list):
-                return data
-            return []
+            with self.index_path.open("r", encoding="utf-8") as f:
+                index = json.load(f)
+            self._offset = int(index["offset"])
+            self._aggs = {
+                g: {int(uid): agg for uid, agg in users.items()}
+                for g, users in index["aggregates"].items()
+            }
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, ValueError, TypeError):
+            self._offset, self._aggs = 0, {}
+
+        try:
+            with self.log_path.open("rb") as f:
+                f.seek(0, 2)
+                if self._offset > f.tell():  # log replaced under us: rebuild
+                    self._offset, self._aggs = 0, {}
+                f.seek(self._offset)
+                for raw in f:
+                    if not raw.endswith(b"\n"):
+                        break  # torn final write; the next append starts a fresh line
+                    self._offset += len(raw)
+                    try:
+                        self._apply(json.loads(raw))
+                        self._unflushed += 1
+                    except (ValueError, KeyError, TypeError):
+                        continue
         except FileNotFoundError:
-            return []
-        except json.JSONDecodeError:
-            return []
+            pass
 
-    def _save_all(self, items: List[Dict[str, Any]]) -> None:
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-        with self.path.open("w", encoding="utf-8") as f:
-            json.dump(items, f, indent=2)
+    def _import_legacy(self) -> None:
+        try:
+            with self.legacy_path.open("r", encoding="utf-8") as f:
+                items = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        if not isinstance(items, list):
+            return
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.log_path.open("w", encoding="utf-8") as f:
+            for it in items:
+                f.write(json.dumps(it, separators=(",", ":")) + "\n")
+
+    def _flush_index(self) -> None:
+        index = {
+            "offset": self._offset,
+            "aggregates": {
+                g: {str(uid): agg for uid, agg in users.items()}
+                for g, users in self._aggs.items()
+            },
+        }
+        tmp = self.index_path.with_suffix(".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(index, f, separators=(",", ":"))
+        tmp.replace(self.index_path)
+        self._unflushed = 0
 
     def add_result(self, result: QuizResult) -> None:
-        items = self._load_all()
-        items.append(result.__dict__)
-        self._save_all(items)
+        self._ensure_loaded()
+        item = asdict(result)
+        line = (json.dumps(item, separators=(",", ":")) + "\n").encode("utf-8")
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.log_path.open("ab") as f:
+            if f.tell() != self._offset:
+                # skip past a torn line left by a crash
+                f.write(b"\n")
+            f.write(line)
+            self._offset = f.tell()
+        self._apply(item)
+
+        self._unflushed += 1
+        if self._unflushed >= INDEX_FLUSH_EVERY:
+            try:
+                self._flush_index()
+            except OSError:
+                log.warning("Failed to write quiz stats index", exc_info=True)
 
     def get_user_stats(
         self, guild_id: Optional[int], user_id: int
     ) -> Optional[Dict[str, Any]]:
-        items = self._load_all()
-        user_items = [
-            it
-            for it in items
-            if it.get("user_id") == user_id and it.get("guild_id") == guild_id
-        ]
-        if not user_items:
+        self._ensure_loaded()
+        entry = self._aggs.get(self._guild_key(guild_id), {}).get(user_id)
+        if entry is None:
             return None
 
-        quizzes_played = len(user_items)
-        total_score = sum(it["score"] for it in user_items)
-        total_questions = sum(it["total_questions"] for it in user_items)
-        best_percent = max(it["percent"] for it in user_items)
-        best_score = max(it["score"] for it in user_items)
+        total_questions = entry["total_questions"]
         avg_percent = (
-            total_score * 100.0 / total_questions if total_questions else 0.0
-        )
-
-        overall_fastest = min(
-            (
-                it.get("fastest_time")
-                for it in user_items
-                if it.get("fastest_time") is not None
-            ),
-            default=None,
+            entry["total_score"] * 100.0 / total_questions if total_questions else 0.0
         )
-
-        return {
-            "quizzes_played": quizzes_played,
-            "total_score": total_score,
-            "total_questions": total_questions,
-            "best_percent": best_percent,
-            "best_score": best_score,
-            "avg_percent": avg_percent,
-            "overall_fastest_time": overall_fastest,
-        }
+        return {**entry, "avg_percent": avg_percent}
 
     def get_leaderboard(
         self, guild_id: Optional[int], limit: int = 10
     ) -> List[Dict[str, Any]]:
-        items = self._load_all()
-        guild_items = [it for it in items if it.get("guild_id") == guild_id]
-        if not guild_items:
+        self._ensure_loaded()
+        users = self._aggs.get(self._guild_key(guild_id))
+        if not users:
             return []
 
-        agg: Dict[int, Dict[str, Any]] = {}
-        for it in guild_items:
-            uid = it["user_id"]
-            entry = agg.setdefault(
-                uid,
-                {
-                    "user_id": uid,
-                    "total_score": 0,
-                    "total_questions": 0,
-                    "quizzes_played": 0,
-                },
-            )
-            entry["total_score"] += it["score"]
-            entry["total_questions"] += it["total_questions"]
-            entry["quizzes_played"] += 1
-
         leaderboard: List[Dict[str, Any]] = []
-        for uid, entry in agg.items():
+        for uid, entry in users.items():
             total_q = entry["total_questions"]
             avg_percent = (
                 entry["total_score"] * 100.0 / total_q if total_q else 0.0
@@ -136,5 +206,9 @@ class QuizStatsStore:
                 }
             )
 
-        leaderboard.sort(key=lambda e: e["avg_percent"], reverse=True)
-        return leaderboard[:limit]
+        return heapq.nlargest(limit, leaderboard, key=lambda e: e["avg_percent"])
+
+    def flush(self) -> None:
+        """Write the aggregate index now (e.g. on unload)."""
+        if self._loaded and self._unflushed:
+            self._flush_index()
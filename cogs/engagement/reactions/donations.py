@@ -10,7 +10,8 @@ from cogs.economy.orb.service import update_orbs, get_total_orbs
 from cogs.economy.star.service import update_stars, get_total_stars
 
 from configs.config_general import COIN_EMOJI, ORB_EMOJI, STAR_EMOJI
-from configs.helper import send_as_webhook
+from utils.log_sink import queue_log, LOG_PRIORITY_NORMAL
+from utils.rest_scheduler import schedule_mutation, reaction_route, PRIORITY_BOOKKEEPING
 
 # Shared with the listener to ignore mirrored removals
 ignored_reactions: set[tuple[int, int, str]] = set()
@@ -44,7 +45,11 @@ async def handle_donation_reaction(
         if action == "add":
             try:
                 ignored_reactions.add(key)
-                await message.remove_reaction(emoji_str, discord.Object(id=donor_id))
+                await schedule_mutation(
+                    reaction_route(message.channel.id),
+                    lambda: message.remove_reaction(emoji_str, discord.Object(id=donor_id)),
+                    key=("donation_unreact", *key), priority=PRIORITY_BOOKKEEPING,
+                )
             except Exception as e:
                 logging.warning(f"[Donate] Failed to remove self-reaction: {e}")
         return True
@@ -55,7 +60,11 @@ async def handle_donation_reaction(
             logging.info(f"[Donate] Insufficient balance for {donor_id}; removing reaction.")
             try:
                 ignored_reactions.add(key)
-                await message.remove_reaction(emoji_str, discord.Object(id=donor_id))
+                await schedule_mutation(
+                    reaction_route(message.channel.id),
+                    lambda: message.remove_reaction(emoji_str, discord.Object(id=donor_id)),
+                    key=("donation_unreact", *key), priority=PRIORITY_BOOKKEEPING,
+                )
             except Exception as e:
                 logging.warning(f"[Donate] Failed to remove reaction: {e}")
             return True
@@ -72,7 +81,7 @@ async def handle_donation_reaction(
                 ),
                 color=discord.Color.green(),
             )
-            await send_as_webhook(logs_channel, "donation", embed=embed)
+            queue_log(logs_channel, embed, persona="donation", priority=LOG_PRIORITY_NORMAL)
         return True
 
     if action == "remove":
@@ -88,7 +97,7 @@ async def handle_donation_reaction(
                 ),
                 color=discord.Color.red(),
             )
-            await send_as_webhook(logs_channel, "donation", embed=embed)
+            queue_log(logs_channel, embed, persona="donation", priority=LOG_PRIORITY_NORMAL)
         return True
 
     return False
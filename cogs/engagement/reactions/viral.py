@@ -10,7 +10,7 @@ from configs.config_channels import (
     VIRAL_POSTS_CHANNEL_ID,
     HOME_CATEGORY_ID
 )
-from configs.helper import send_as_webhook
+from utils.webhook_pool import send_as_webhook
 
 EXCLUDED_CHANNELS = {JUDGE_ZONE_CHANNEL_ID}
 EXCLUDED_CATEGORIES = {HOME_CATEGORY_ID}
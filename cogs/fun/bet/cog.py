@@ -5,7 +5,7 @@ import discord
 from discord.ext import commands
 
 from cogs.economy.coin.service import update_coins, get_total_coins
-from configs.helper import send_as_webhook
+from utils.webhook_pool import send_as_webhook
 
 class BetCog(commands.Cog):
     """Challenge another user to a coin bet. Winner takes the pot."""
@@ -10,7 +10,7 @@ from datetime import datetime
 
 # Optional: route through your pet-styled sender if you have it
 try:
-    from configs.helper import send_as_webhook
+    from utils.webhook_pool import send_as_webhook
     async def send_embed(ctx, embed: discord.Embed, **kwargs):
         return await send_as_webhook(ctx, "clans", embed=embed, **kwargs)
 except Exception:
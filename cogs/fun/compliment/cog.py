@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import discord
 from discord.ext import commands
-from configs.helper import send_as_webhook
+from utils.webhook_pool import send_as_webhook
 from cogs.fun._shared import safe_random_from_json, COMPLIMENTS_PATH
 
 class ComplimentCog(commands.Cog):
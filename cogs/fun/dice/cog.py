@@ -4,7 +4,7 @@ import random, asyncio
 import discord
 from discord.ext import commands
 from configs.config_logging import logging
-from configs.helper import send_as_webhook
+from utils.webhook_pool import send_as_webhook
 
 class DiceCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
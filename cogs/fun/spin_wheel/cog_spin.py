@@ -19,7 +19,7 @@ from cogs.economy.orb.service import update_orbs
 from cogs.economy.star.service import update_stars
 from cogs.economy.diamond.service import update_diamonds
 
-from configs.helper import send_as_webhook
+from utils.webhook_pool import send_as_webhook
 
 # In-memory cooldown tracker {user_id: last_spin_unix_ts}
 _spin_cooldowns: Dict[int, float] = {}
@@ -8,7 +8,7 @@ import discord
 from discord.ext import commands, tasks
 
 from configs.config_channels import GROW_A_TREE_CHANNEL_ID, LOGS_CHANNEL_ID
-from configs.helper import send_as_webhook
+from utils.webhook_pool import send_as_webhook
 
 # Use in-package pings helpers
 from cogs.networking.pings.filters import select_eligible_users, shuffled_mentions
@@ -5,7 +5,7 @@ import re
 from typing import Iterable, Tuple, List, Optional
 import discord
 
-from configs.helper import send_as_webhook
+from utils.webhook_pool import send_as_webhook
 
 from cogs.economy.orb.service import update_orbs
 from cogs.economy.xp.service import update_xp
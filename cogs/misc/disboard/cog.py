@@ -10,7 +10,7 @@ import discord
 from discord.ext import commands, tasks
 
 from utils.utils_json import load_json
-from configs.helper import send_as_webhook
+from utils.webhook_pool import send_as_webhook
 from configs.config_channels import BUMP_US_CHANNEL_ID
 
 from cogs.networking.pings.filters import select_eligible_users, shuffled_mentions
@@ -7,7 +7,7 @@ from discord.ext import commands
 
 from configs.config_general import BOT_GUILD_ID
 from configs.config_channels import LOGS_CHANNEL_ID
-from configs.helper import send_as_webhook
+from utils.log_sink import queue_log, LOG_PRIORITY_LOW
 
 from .filters import has_allowed_role, OFFLINE_STATES, ONLINE_DEST_STATES
 
@@ -62,10 +62,8 @@ class PresenceLogger(commands.Cog):
             icon_url=after.display_avatar.url,
         )
 
-        try:
-            await send_as_webhook(logs_channel, "online", embed=embed)
-        except Exception:
-            self.log.error("[PresenceLogger] Failed to send presence embed", exc_info=True)
+        # Coalesced with other log traffic; lowest priority, first to go on overflow
+        queue_log(logs_channel, embed, persona="online", priority=LOG_PRIORITY_LOW)
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(PresenceLogger(bot))
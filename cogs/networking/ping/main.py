@@ -17,7 +17,7 @@ from .ratelimit import (
 )
 from .messages import embed_err, embed_info, embed_ok
 from .notify import send_ping
-from configs.helper import send_as_webhook
+from utils.webhook_pool import send_as_webhook
 
 class PingCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
@@ -3,7 +3,7 @@ from __future__ import annotations
 import discord
 
 from .config import MAX_PING_SIZE, ALLOW_OPTIONAL_MESSAGE
-from configs.helper import send_as_webhook
+from utils.webhook_pool import send_as_webhook
 
 def _sanitize_message(msg: str) -> str:
     if not msg:
@@ -7,7 +7,7 @@ from typing import Optional, Dict
 import discord
 from discord.ext import commands
 
-from configs.helper import send_as_webhook
+from utils.webhook_pool import send_as_webhook
 from configs.config_channels import BOTS_PLAYGROUND_CHANNEL_ID
 
 from .storage import (
@@ -10,7 +10,7 @@ from cogs.onboarding.invites_handler.data import (
 from cogs.economy.diamond.service import update_diamonds
 
 from configs.config_channels import LOGS_CHANNEL_ID
-from configs.helper import send_as_webhook
+from utils.log_sink import queue_log, LOG_PRIORITY_NORMAL
 
 # Map proxy inviter IDs to a main account if desired
 PROXY_INVITE_MAPPING: dict[str, str] = {
@@ -68,4 +68,4 @@ async def handle_invite_reward(guild: discord.Guild, inviter: discord.abc.User,
                 f"💎 **<@{actual_id}>** has invited **{invites_to_record}** new member(s) "
                 f"and earned **{new_diamonds} Diamond(s)**! 🎉"
             )
-            await send_as_webhook(channel, "diamonds", content=content)
+            queue_log(channel, content=content, persona="diamonds", priority=LOG_PRIORITY_NORMAL)
@@ -4,7 +4,8 @@ from __future__ import annotations
 import discord
 from discord.ext import commands
 
-from configs.helper import send_as_webhook, PERSONAS
+from configs.helper import PERSONAS
+from utils.webhook_pool import send_as_webhook
 
 FALLBACK_IMAGE_PATH = "database/images/server_profile.png"
 FALLBACK_IMAGE_NAME = "server_profile.png"
@@ -16,10 +16,10 @@ def _load(path: Path) -> dict:
     try: return json.loads(path.read_text(encoding="utf-8"))
     except Exception: return {}
 
-def _save(path: Path, data: dict) -> None:
-    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+def _save(path: Path, data: dict, indent: int | None = 2) -> None:
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=indent), encoding="utf-8")
 
 async def load_activity() -> dict: return await _io(_load, ACTIVITY_PATH)
-async def save_activity(data: dict) -> None: await _io(_save, ACTIVITY_PATH, data)
+async def save_activity(data: dict) -> None: await _io(_save, ACTIVITY_PATH, data, None)  # compact: rewritten often
 async def load_positions() -> dict: return await _io(_load, POSITIONS_PATH)
 async def save_positions(data: dict) -> None: await _io(_save, POSITIONS_PATH, data)
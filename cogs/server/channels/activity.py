@@ -1,68 +1,132 @@
 # cogs/server/channels/activity.py
 from __future__ import annotations
-import discord, asyncio
-from datetime import datetime, timedelta, timezone
+import discord, asyncio, time
+from datetime import datetime, timezone
 from ._storage import load_activity, save_activity
 from .archive_config import (
     INACTIVITY_DAYS, ARCHIVE_TEXT, ARCHIVE_VOICE, REQUIRE_PUBLIC,
     VC_REQUIRE_RECENT_MESSAGE
 )
 
-# Use STRING KEYS for channel IDs to avoid duplicate JSON keys
-_last_text_ts: dict[str, str] = {}
-_last_voice_ts: dict[str, str] = {}
+# Use STRING KEYS for channel IDs to avoid duplicate JSON keys.
+# Values are epoch seconds (int); archiving works at day granularity.
+_last_text_ts: dict[str, int] = {}
+_last_voice_ts: dict[str, int] = {}
 _bootstrapped = False
 _save_lock = asyncio.Lock()
 
-def _now() -> datetime: return datetime.now(timezone.utc)
-def _iso(dt: datetime) -> str: return dt.astimezone(timezone.utc).isoformat()
-def _parse(s: str) -> datetime: return datetime.fromisoformat(s)
+# Updates only mark the state dirty; the archive cog flushes it every
+# FLUSH_INTERVAL_SECONDS and on unload. Losing a few seconds of activity on a
+# crash can't change a 7-day inactivity decision.
+FLUSH_INTERVAL_SECONDS = 60
+_dirty = False
+
+# history(limit=1) fallbacks in flight at once (only for channels with no last_message_id)
+HISTORY_CONCURRENCY = 5
+_history_sem = asyncio.Semaphore(HISTORY_CONCURRENCY)
+
+def _now() -> int: return int(time.time())
+def _epoch(dt: datetime) -> int:
+    return int((dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)).timestamp())
 def _key_id(cid: int | str) -> str: return str(cid)
 
+def _coerce_ts(v) -> int | None:
+    # files written before epoch ints stored ISO strings
+    if isinstance(v, (int, float)): return int(v)
+    try: return _epoch(datetime.fromisoformat(v))
+    except Exception: return None
+
+def _load_ts_map(raw: dict | None) -> dict[str, int]:
+    out = {}
+    for k, v in (raw or {}).items():
+        ts = _coerce_ts(v)
+        if ts is not None:
+            out[_key_id(k)] = ts
+    return out
+
 def _is_public(ch: discord.abc.GuildChannel) -> bool:
     try: return ch.permissions_for(ch.guild.default_role).view_channel
     except Exception: return False
 
-async def _persist():
+async def _fetch_last_message_ts(ch: discord.abc.GuildChannel) -> int | None:
+    """
+    Last message time for a messageable channel. The cached last_message_id
+    snowflake already encodes it, so REST is only hit when that's missing.
+    """
+    last_id = getattr(ch, "last_message_id", None)
+    if last_id:
+        return _epoch(discord.utils.snowflake_time(last_id))
+    if not hasattr(ch, "history"):
+        return None
+    async with _history_sem:
+        try:
+            async for m in ch.history(limit=1, oldest_first=False):
+                return _epoch(m.created_at)
+        except Exception:
+            pass
+    return None
+
+def _remember_text_ts(kid: str, ts: int) -> int:
+    # keep whichever is newer: persisted value vs. what Discord reports now
+    old = _last_text_ts.get(kid)
+    if old is None or old < ts:
+        _last_text_ts[kid] = ts
+        _mark_dirty()
+    return _last_text_ts[kid]
+
+def _mark_dirty() -> None:
+    global _dirty
+    _dirty = True
+
+async def flush(force: bool = False) -> bool:
+    """Write the activity file if anything changed since the last flush."""
+    global _dirty
+    if not (_dirty or force):
+        return False
     async with _save_lock:
-        await save_activity({"text": _last_text_ts, "voice": _last_voice_ts})
+        _dirty = False
+        snapshot = {"text": dict(_last_text_ts), "voice": dict(_last_voice_ts)}
+        try:
+            await save_activity(snapshot)
+        except Exception:
+            _dirty = True
+            raise
+    return True
 
 async def bootstrap(bot: discord.Client) -> None:
     global _bootstrapped, _last_text_ts, _last_voice_ts
     if _bootstrapped: return
 
     data = await load_activity()
-    _last_text_ts  = { _key_id(k): v for k, v in (data.get("text")  or {}).items() }
-    _last_voice_ts = { _key_id(k): v for k, v in (data.get("voice") or {}).items() }
+    _last_text_ts  = _load_ts_map(data.get("text"))
+    _last_voice_ts = _load_ts_map(data.get("voice"))
 
     async def seed_textlike(ch: discord.abc.GuildChannel):
         # Seed last message timestamp for both TextChannels and VoiceChannels (voice chat)
-        kid = _key_id(ch.id)
-        if kid in _last_text_ts: return
         if REQUIRE_PUBLIC and not _is_public(ch): return
-        # Only attempt history on channels that are messageable
-        if not hasattr(ch, "history"): return
-        try:
-            async for m in ch.history(limit=1, oldest_first=False):
-                ts = m.created_at if m.created_at.tzinfo else m.created_at.replace(tzinfo=timezone.utc)
-                _last_text_ts[kid] = _iso(ts)
-                break
-        except Exception:
-            pass
+        kid = _key_id(ch.id)
+        # persisted value is enough unless the snowflake is free to read
+        if kid in _last_text_ts and not getattr(ch, "last_message_id", None): return
+        ts = await _fetch_last_message_ts(ch)
+        if ts:
+            _remember_text_ts(kid, ts)
 
+    seeds = []
     for g in bot.guilds:
         if ARCHIVE_TEXT:
-            for ch in g.text_channels:
-                await seed_textlike(ch)
+            seeds.extend(g.text_channels)
         if ARCHIVE_VOICE:
             # seed VC message timestamps too (if any)
+            seeds.extend(g.voice_channels)
             for v in g.voice_channels:
-                await seed_textlike(v)
                 if REQUIRE_PUBLIC and not _is_public(v): continue
                 if v.members:
-                    _last_voice_ts[_key_id(v.id)] = _iso(_now())
+                    _last_voice_ts[_key_id(v.id)] = _now()
+
+    # snowflake reads are instant; history fallbacks share _history_sem
+    await asyncio.gather(*(seed_textlike(ch) for ch in seeds))
 
-    await _persist()
+    await flush(force=True)  # also rewrites legacy ISO files as ints
     _bootstrapped = True
 
 async def update_from_message(message: discord.Message) -> None:
@@ -72,38 +136,36 @@ async def update_from_message(message: discord.Message) -> None:
         return
     if REQUIRE_PUBLIC and not _is_public(ch):
         return
-    _last_text_ts[_key_id(ch.id)] = _iso(_now())
-    await _persist()
+    _last_text_ts[_key_id(ch.id)] = _now()
+    _mark_dirty()
 
 async def update_from_voice_state(member, before: discord.VoiceState, after: discord.VoiceState) -> None:
     if not ARCHIVE_VOICE: return
-    now = _iso(_now())
+    now = _now()
     for vc in (before.channel, after.channel):
         if not vc: continue
         if REQUIRE_PUBLIC and not _is_public(vc): continue
         _last_voice_ts[_key_id(vc.id)] = now
-    await _persist()
+        _mark_dirty()
 
-async def _last_message_recent(channel: discord.abc.GuildChannel, cutoff: datetime) -> bool:
+async def _last_message_recent(channel: discord.abc.GuildChannel, cutoff: int) -> bool:
     kid = _key_id(channel.id)
     ts = _last_text_ts.get(kid)
-    if not ts and hasattr(channel, "history"):
-        # lazy fetch if unseen
-        try:
-            async for m in channel.history(limit=1, oldest_first=False):
-                ts_iso = _iso(m.created_at if m.created_at.tzinfo else m.created_at.replace(tzinfo=timezone.utc))
-                _last_text_ts[kid] = ts_iso
-                await _persist()
-                ts = ts_iso
-                break
-        except Exception:
-            pass
-    return bool(ts) and _parse(ts) >= cutoff
+    if not ts or ts < cutoff:
+        # Unseen: snowflake, else history. Stale: only the cached snowflake is
+        # consulted (it may know about messages sent while we were offline).
+        if ts and not getattr(channel, "last_message_id", None):
+            fetched = None
+        else:
+            fetched = await _fetch_last_message_ts(channel)
+        if fetched:
+            ts = _remember_text_ts(kid, fetched)
+    return bool(ts) and ts >= cutoff
 
 async def is_channel_active(channel: discord.abc.GuildChannel) -> bool:
     if REQUIRE_PUBLIC and not _is_public(channel):
         return True
-    cutoff = _now() - timedelta(days=INACTIVITY_DAYS)
+    cutoff = _now() - INACTIVITY_DAYS * 86400
 
     if isinstance(channel, discord.TextChannel):
         return await _last_message_recent(channel, cutoff)
@@ -112,8 +174,8 @@ async def is_channel_active(channel: discord.abc.GuildChannel) -> bool:
         # 1) live occupancy is always active
         if getattr(channel, "members", None) and len(channel.members) > 0:
             # Refresh voice ts for consistency
-            _last_voice_ts[_key_id(channel.id)] = _iso(_now())
-            await _persist()
+            _last_voice_ts[_key_id(channel.id)] = _now()
+            _mark_dirty()
             return True
 
         # 2) If configured, *require* recent message in the VC's chat
@@ -124,6 +186,6 @@ async def is_channel_active(channel: discord.abc.GuildChannel) -> bool:
         if await _last_message_recent(channel, cutoff):
             return True
         ts = _last_voice_ts.get(_key_id(channel.id))
-        return bool(ts) and _parse(ts) >= cutoff
+        return bool(ts) and ts >= cutoff
 
     return True
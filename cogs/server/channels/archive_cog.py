@@ -16,20 +16,30 @@ class ArchiveCog(commands.Cog):
         self._ready_boot = False
         self.daily_sweep.change_interval(time=SWEEP_UTC_TIME)
 
+    async def cog_unload(self):
+        self.daily_sweep.cancel()
+        self.activity_flush.cancel()
+        await activity.flush()
+
     @commands.Cog.listener()
     async def on_ready(self):
         if self._ready_boot: return
         await activity.bootstrap(self.bot)
         self.daily_sweep.start()
+        self.activity_flush.start()
         self._ready_boot = True
 
     @tasks.loop(time=SWEEP_UTC_TIME)
     async def daily_sweep(self):
         for g in self.bot.guilds:
-            cat = await mover.get_archive_category(g)
-            if not cat: continue
-            for ch in list(g.text_channels) + list(g.voice_channels):
-                await mover.archive_if_inactive(g, ch)
+            await mover.sweep_guild(g)
+
+    @tasks.loop(seconds=activity.FLUSH_INTERVAL_SECONDS)
+    async def activity_flush(self):
+        try:
+            await activity.flush()
+        except Exception as e:
+            print(f"[Archive] Activity flush failed: {e}")
 
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
@@ -91,13 +101,7 @@ class ArchiveCog(commands.Cog):
         if not cat:
             return await ctx.reply("Archive category not found. Run **!sudo_archive_ensure** first.")
 
-        count = 0
-        for ch in list(g.text_channels) + list(g.voice_channels):
-            try:
-                if await mover.archive_if_inactive(g, ch):
-                    count += 1
-            except Exception:
-                pass  # continue on errors
+        count = await mover.sweep_guild(g)
 
         await ctx.reply(f"Archived **{count}** inactive public channel(s).")
 
@@ -41,7 +41,7 @@ def _is_excluded(channel: discord.abc.GuildChannel) -> bool:
     return False
 
 
-async def archive_if_inactive(guild: discord.Guild, channel: discord.abc.GuildChannel) -> bool:
+def _is_archivable(channel: discord.abc.GuildChannel, archive_cat) -> bool:
     # hard excludes first
     if _is_excluded(channel):
         return False
@@ -55,9 +55,15 @@ async def archive_if_inactive(guild: discord.Guild, channel: discord.abc.GuildCh
     if isinstance(channel, discord.VoiceChannel) and not ARCHIVE_VOICE:
         return False
 
-    archive_cat = await get_archive_category(guild)
     if not archive_cat or is_in_archive(channel, archive_cat):
         return False
+    return True
+
+
+async def archive_if_inactive(guild: discord.Guild, channel: discord.abc.GuildChannel) -> bool:
+    archive_cat = await get_archive_category(guild)
+    if not _is_archivable(channel, archive_cat):
+        return False
     if await activity.is_channel_active(channel):
         return False
 
@@ -65,6 +71,52 @@ async def archive_if_inactive(guild: discord.Guild, channel: discord.abc.GuildCh
     return True
 
 
+# Activity checks in flight during a sweep. Most are answered from memory or the
+# cached last_message_id; the cap bounds the history() fallbacks and keeps the
+# sweep from bursting REST calls across many channels at once.
+SWEEP_CHECK_CONCURRENCY = 5
+
+
+async def sweep_guild(guild: discord.Guild) -> int:
+    """
+    Archive every inactive channel in `guild`. Activity checks run
+    concurrently (bounded); the moves themselves stay sequential so
+    channel positions are applied one at a time.
+    """
+    archive_cat = await get_archive_category(guild)
+    if not archive_cat:
+        return 0
+
+    sem = asyncio.Semaphore(SWEEP_CHECK_CONCURRENCY)
+
+    async def inactive(ch: discord.abc.GuildChannel) -> bool:
+        async with sem:
+            try:
+                return not await activity.is_channel_active(ch)
+            except Exception:
+                return False
+
+    channels = [
+        ch for ch in list(guild.text_channels) + list(guild.voice_channels)
+        if _is_archivable(ch, archive_cat)
+    ]
+    flags = await asyncio.gather(*(inactive(ch) for ch in channels))
+
+    archived = 0
+    for ch, is_inactive in zip(channels, flags):
+        if not is_inactive:
+            continue
+        try:
+            # re-check: activity may have arrived while the other checks ran
+            if await activity.is_channel_active(ch):
+                continue
+            await positions.move_to_archive(ch, archive_cat)
+            archived += 1
+        except Exception:
+            pass  # continue on errors
+    return archived
+
+
 # --- NEW: helper to move/sync a VC under Join-to-Create ---
 async def _move_vc_under_join_to_create(guild: discord.Guild, vc: discord.VoiceChannel) -> None:
     jtc = guild.get_channel(int(JOIN_TO_CREATE_CHANNEL_ID))
@@ -16,6 +16,59 @@ user_locks = defaultdict(asyncio.Lock)
 def _min_xp(rt): return getattr(rt, "min_xp", rt[1])
 def _role_id(rt): return getattr(rt, "role_id", rt[0])
 
+def desired_roles(member: discord.Member, guild: discord.Guild, total_xp: float) -> tuple[set[discord.Role], discord.Role | None]:
+    """
+    The member's role set after applying their XP tier.
+    Returns (roles, upgraded_to); upgraded_to is None unless this is a tier-up.
+    L&L tiers are exclusive; newcomer is dropped on a tier-up.
+    """
+    current = set(member.roles[1:])  # [0] is @everyone
+    eligible = [rt for rt in LOOT_AND_LEGENDS_ROLES if total_xp >= _min_xp(rt)]
+    if not eligible:
+        return current, None
+
+    best = max(eligible, key=_min_xp)
+    new_role = guild.get_role(_role_id(best))
+    if not new_role:
+        return current, None
+
+    held = [rt for rt in LOOT_AND_LEGENDS_ROLES if _role_id(rt) in {r.id for r in current}]
+    tier_ids = {_role_id(rt) for rt in LOOT_AND_LEGENDS_ROLES}
+    others = {r for r in current if r.id not in tier_ids}
+
+    # Already at or above best: keep the highest held tier, drop the rest.
+    if any(_min_xp(rt) >= _min_xp(best) for rt in held):
+        top = guild.get_role(_role_id(max(held, key=_min_xp)))
+        return others | ({top} if top else set()), None
+
+    # Upgrade: new tier replaces old tiers and newcomer.
+    others = {r for r in others if r.id != MEMBER_ROLE_ID}
+    return others | {new_role}, new_role
+
+
+async def reconcile_roles(member: discord.Member, desired: set[discord.Role], reason: str) -> bool:
+    """
+    Apply the change from member's roles to `desired` in a single PATCH.
+    Skips the call when nothing changes. edit(roles=...) replaces the whole
+    set, so the change is re-applied to freshly fetched roles: anything added
+    or removed by someone else in the meantime is kept.
+    """
+    current = set(member.roles[1:])
+    to_add, to_remove = desired - current, current - desired
+    if not to_add and not to_remove:
+        return False
+    try:
+        member = await member.guild.fetch_member(member.id)
+    except discord.NotFound:
+        return False
+    latest = set(member.roles[1:])
+    roles = (latest - to_remove) | to_add
+    if roles == latest:
+        return False
+    await member.edit(roles=sorted(roles), reason=reason)
+    return True
+
+
 async def assign_role_based_on_xp(member: Union[discord.Member, discord.User], guild: discord.Guild) -> None:
     if isinstance(member, discord.User):
         try:
@@ -32,62 +85,20 @@ async def assign_role_based_on_xp(member: Union[discord.Member, discord.User], g
             logging.info(f"XP fetch error for {member.id}: {e}")
             return
 
-        eligible = [rt for rt in LOOT_AND_LEGENDS_ROLES if total_xp >= _min_xp(rt)]
-        if not eligible:
+        desired, new_role = desired_roles(member, guild, total_xp)
+        reason = "Reached XP threshold" if new_role else "XP tier cleanup (exclusive L&L tiers)"
+        try:
+            changed = await reconcile_roles(member, desired, reason)
+        except discord.Forbidden:
             return
 
-        best = max(eligible, key=_min_xp)
-        new_role = guild.get_role(_role_id(best))
-        if not new_role:
+        # Nothing applied (e.g. a second sync before the gateway role update
+        # arrived): the tier-up was already paid and announced.
+        if not (changed and new_role):
             return
 
-        # Which L&L roles does the user currently have?
-        member_role_ids = {r.id for r in member.roles}
-        ll_roles_on_member = [rt for rt in LOOT_AND_LEGENDS_ROLES if _role_id(rt) in member_role_ids]
-
-        # If they already have >= best tier, still clean up any lower tiers lingering.
-        already_at_or_above_best = any(_min_xp(rt) >= _min_xp(best) for rt in ll_roles_on_member)
-        if already_at_or_above_best:
-            # remove any lower L&L tiers (keep the highest one(s))
-            roles_to_remove = [
-                guild.get_role(_role_id(rt))
-                for rt in ll_roles_on_member
-                if _role_id(rt) != _role_id(best)
-            ]
-            roles_to_remove = [r for r in roles_to_remove if r]
-            if roles_to_remove:
-                try:
-                    await member.remove_roles(*roles_to_remove, reason="XP tier cleanup (exclusive L&L tiers)")
-                except discord.Forbidden:
-                    pass
-            return  # nothing else to do
-
-        # They are upgrading: remove "newcomer" (if present), add new tier, then remove old tiers.
-        newcomer = guild.get_role(MEMBER_ROLE_ID)
-        if newcomer and newcomer in member.roles:
-            try:
-                await member.remove_roles(newcomer, reason="XP tier upgrade (removed newcomer)")
-            except discord.Forbidden:
-                pass
-
-        # 1) Add the new tier
-        await member.add_roles(new_role, reason="Reached XP threshold")
-
-        # 2) Remove any previously held L&L tiers (exclusivity)
-        roles_to_remove = [
-            guild.get_role(_role_id(rt))
-            for rt in ll_roles_on_member
-            if _role_id(rt) != new_role.id
-        ]
-        roles_to_remove = [r for r in roles_to_remove if r]
-        if roles_to_remove:
-            try:
-                await member.remove_roles(*roles_to_remove, reason="XP tier upgrade (exclusive L&L tiers)")
-            except discord.Forbidden:
-                pass
-
         # Rewards
-        idx = LOOT_AND_LEGENDS_ROLES.index(best)
+        idx = next(i for i, rt in enumerate(LOOT_AND_LEGENDS_ROLES) if _role_id(rt) == new_role.id)
         dollars, orbs, stars = rewards = LEVEL_UP_REWARDS.get(idx, (0, 0, 0))
         try:
             update_coins(member.id, dollars, "Level Up Rewards")
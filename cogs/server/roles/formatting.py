@@ -2,7 +2,7 @@ from __future__ import annotations
 import re, unicodedata
 from typing import Iterable, List
 import discord
-from configs.helper import send_as_webhook
+from utils.webhook_pool import send_as_webhook
 from .constants import FIELD_VALUE_LIMIT, FIELD_NAME_LIMIT, FIELDS_PER_EMBED_LIMIT
 
 def normalize(s: str | None) -> str:
@@ -4,7 +4,7 @@ from configs.config_roles import LOOT_AND_LEGENDS_PERKS
 from configs.config_channels import ANNOUNCEMENTS_CHANNEL_ID
 from configs.config_general import COIN_EMOJI, ORB_EMOJI, STAR_EMOJI
 from configs.config_logging import logging
-from configs.helper import send_as_webhook
+from utils.webhook_pool import send_as_webhook
 
 async def announce_role_upgrade(member: discord.Member, new_role: discord.Role, rewards: tuple[int, int, int]) -> None:
     perks = LOOT_AND_LEGENDS_PERKS.get(new_role.id, [])
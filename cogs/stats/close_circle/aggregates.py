@@ -0,0 +1,112 @@
+# cogs/close_circle/aggregates.py
+from .state import interaction_scores, received_scores
+from .decay import decayed, edge_value, now_ts
+
+# Incrementally maintained views over interaction_scores so the commands never
+# rescan the whole matrix:
+#   given_totals[uid]       = sum of uid's outgoing row
+#   received_totals[uid]    = sum of uid's incoming column
+#   row_max[uid]            = partner_id of uid's strongest outgoing edge
+#   mutual_scores[(lo, hi)] = s[lo][hi] + s[hi][lo]   (lo < hi)
+# Every edge decays at the same rate, so sums decay exactly like their parts:
+# totals and pair sums are stored as [value, ts] cells, and the row maximum
+# keeps its partner (decay never reorders a row).
+# received_scores (state.py) doubles as the column index: receiver -> giver -> edge,
+# sharing the very same edge lists as interaction_scores.
+given_totals: dict = {}
+received_totals: dict = {}
+row_max: dict = {}
+mutual_scores: dict = {}
+
+# Cells below this are float noise left by pruning.
+_EPSILON = 1e-6
+
+def pair_key(a: int, b: int) -> tuple:
+    return (a, b) if a < b else (b, a)
+
+def _add(counter: dict, key, diff, now: float) -> None:
+    cell = counter.get(key)
+    value = (decayed(cell[0], cell[1], now) if cell else 0) + diff
+    if value > _EPSILON:
+        counter[key] = [value, now]
+    else:
+        counter.pop(key, None)
+
+def _recompute_row_max(uid: int) -> None:
+    row = interaction_scores.get(uid)
+    if not row:
+        row_max.pop(uid, None)
+        return
+    # comparing raw scores would be skewed by differing timestamps
+    now = now_ts()
+    partner, edge = max(row.items(), key=lambda kv: edge_value(kv[1], now))
+    if edge[0] > 0:
+        row_max[uid] = partner
+    else:
+        row_max.pop(uid, None)
+
+def on_edge_change(a: int, b: int, edge, old, new, now: float) -> None:
+    """
+    Fold one edge update a→b into every aggregate in O(1) amortized.
+    `old`/`new` are the edge's values as of `now`; new == 0 means it was pruned.
+    """
+    diff = new - old
+    if not diff:
+        return
+    _add(given_totals, a, diff, now)
+    _add(received_totals, b, diff, now)
+    _add(mutual_scores, pair_key(a, b), diff, now)
+
+    if new > 0:
+        received_scores[b][a] = edge
+    else:
+        col = received_scores.get(b)
+        if col is not None:
+            col.pop(a, None)
+            if not col:
+                received_scores.pop(b, None)
+
+    cur = row_max.get(a)
+    if new > 0 and (cur is None or cur == b or new >= score_between(a, cur, now)):
+        row_max[a] = b
+    elif cur == b:
+        # the row's maximum shrank; only then is a row scan needed
+        _recompute_row_max(a)
+
+def rebuild_aggregates() -> None:
+    """Full rebuild from interaction_scores (startup / after bulk changes)."""
+    given_totals.clear()
+    received_totals.clear()
+    row_max.clear()
+    mutual_scores.clear()
+    received_scores.clear()
+    now = now_ts()
+    for a, row in interaction_scores.items():
+        for b, edge in row.items():
+            value = edge_value(edge, now)
+            if value:
+                on_edge_change(a, b, edge, 0, value, now)
+
+def score_between(a: int, b: int, now: float | None = None) -> float:
+    row = interaction_scores.get(a)
+    return edge_value(row.get(b), now) if row else 0
+
+def total_given(uid: int, now: float | None = None) -> float:
+    cell = given_totals.get(uid)
+    return decayed(cell[0], cell[1], now) if cell else 0
+
+def total_received(uid: int, now: float | None = None) -> float:
+    cell = received_totals.get(uid)
+    return decayed(cell[0], cell[1], now) if cell else 0
+
+def total_activity(uid: int, now: float | None = None) -> float:
+    if now is None:
+        now = now_ts()
+    return total_given(uid, now) + total_received(uid, now)
+
+def mutual_score(a: int, b: int, now: float | None = None) -> float:
+    cell = mutual_scores.get(pair_key(a, b))
+    return decayed(cell[0], cell[1], now) if cell else 0
+
+def top_partner(uid: int) -> int | None:
+    return row_max.get(uid)
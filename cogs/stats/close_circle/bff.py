@@ -2,7 +2,7 @@
 import discord
 from .logic import get_top_interaction_pairs
 from .display import format_pairs_embed
-from configs.helper import send_as_webhook
+from utils.webhook_pool import send_as_webhook
 
 async def bff(ctx):
     top_pairs = get_top_interaction_pairs(ctx.guild, limit=10)
@@ -2,7 +2,7 @@
 import discord
 from .logic import get_top_interactions
 from .display import format_close_circle_embed
-from configs.helper import send_as_webhook
+from utils.webhook_pool import send_as_webhook
 
 async def cc(ctx, member: discord.Member | None = None):
     target = member or ctx.author
@@ -3,16 +3,24 @@ from __future__ import annotations
 
 import logging
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 
 from configs.config_general import BOT_GUILD_ID
-from .storage import load_close_circle_data, save_close_circle_data
-from .update import update_proximity, update_reply, update_mentions, update_voice_proximity
+from .storage import load_close_circle_data, save_close_circle_data, flush_close_circle_journal
+from .compaction import compact_decayed_edges
+from .metrics import memory_stats
+from .update import update_proximity, update_reply, update_mentions, update_voice_proximity, flush_voice_proximity
 from . import cc as cc_cmd
 from . import bff as bff_cmd
 from . import ncc as ncc_cmd
 from . import nbff as nbff_cmd
 
+# Durability cadence: deltas hit the journal often, full snapshots rarely.
+JOURNAL_FLUSH_SECONDS = 15
+SNAPSHOT_MINUTES = 30
+# How often voice co-presence timelines are turned into pair credits.
+VOICE_FLUSH_MINUTES = 5
+
 class CloseCircleCog(commands.Cog):
     """Tracks interactions to surface close connections, BFFs, NCC, and NBFF."""
 
@@ -20,6 +28,40 @@ class CloseCircleCog(commands.Cog):
         self.bot = bot
         self.log = logging.getLogger(__name__)
         load_close_circle_data()
+        self.journal_loop.start()
+        self.snapshot_loop.start()
+        self.voice_flush_loop.start()
+
+    # --- persistence loops ----------------------------------------------------
+
+    @tasks.loop(seconds=JOURNAL_FLUSH_SECONDS)
+    async def journal_loop(self):
+        try:
+            flush_close_circle_journal()
+        except Exception:
+            self.log.error("[close_circle] Journal flush failed", exc_info=True)
+
+    @tasks.loop(minutes=VOICE_FLUSH_MINUTES)
+    async def voice_flush_loop(self):
+        try:
+            flush_voice_proximity()
+        except Exception:
+            self.log.error("[close_circle] Voice co-presence flush failed", exc_info=True)
+
+    @tasks.loop(minutes=SNAPSHOT_MINUTES)
+    async def snapshot_loop(self):
+        # first iteration fires immediately and would re-save what we just loaded
+        if self.snapshot_loop.current_loop == 0:
+            return
+        try:
+            # prune fully-decayed edges first so the snapshot stays bounded
+            removed = await compact_decayed_edges()
+            if removed:
+                self.log.info(f"[close_circle] Compaction pruned {removed} decayed edges")
+            save_close_circle_data()
+            self.log.info(f"[close_circle] Memory: {memory_stats()}")
+        except Exception:
+            self.log.error("[close_circle] Periodic snapshot failed", exc_info=True)
 
     # --- listeners ------------------------------------------------------------
 
@@ -50,7 +92,11 @@ class CloseCircleCog(commands.Cog):
         update_voice_proximity(member, before, after)
 
     def cog_unload(self):
+        self.journal_loop.cancel()
+        self.snapshot_loop.cancel()
+        self.voice_flush_loop.cancel()
         try:
+            flush_voice_proximity()
             save_close_circle_data()
         except Exception:
             self.log.error("[close_circle] Failed to save data on unload", exc_info=True)
@@ -73,5 +119,16 @@ class CloseCircleCog(commands.Cog):
     async def cmd_nbff(self, ctx: commands.Context):
         await nbff_cmd.nbff(ctx)
 
+    @commands.command(name="cc_stats")
+    @commands.has_permissions(administrator=True)
+    async def cmd_cc_stats(self, ctx: commands.Context):
+        lines = [f"**{k}**: `{v}`" for k, v in memory_stats().items()]
+        embed = discord.Embed(
+            title="🧠 Close Circle Memory",
+            description="\n".join(lines),
+            color=discord.Color.dark_grey(),
+        )
+        await ctx.send(embed=embed)
+
 async def setup(bot: commands.Bot):
     await bot.add_cog(CloseCircleCog(bot))
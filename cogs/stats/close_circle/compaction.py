@@ -0,0 +1,34 @@
+# cogs/close_circle/compaction.py
+import asyncio
+from .state import interaction_scores
+from .decay import edge_value, now_ts, PRUNE_FLOOR
+from .aggregates import on_edge_change
+
+# Rows examined between yields to the event loop.
+COMPACTION_BATCH = 500
+
+async def compact_decayed_edges(floor: float = PRUNE_FLOOR) -> int:
+    """
+    Background pass that drops edges whose decayed score fell below `floor`,
+    keeping memory and snapshot size bounded. Aggregates are adjusted per
+    pruned edge. Returns the number of edges removed.
+    """
+    now = now_ts()
+    removed = 0
+    for i, uid in enumerate(list(interaction_scores.keys())):
+        if i and i % COMPACTION_BATCH == 0:
+            await asyncio.sleep(0)
+        row = interaction_scores.get(uid)
+        if row is None:
+            continue
+        victims = [(other, edge, edge_value(edge, now)) for other, edge in row.items()]
+        victims = [v for v in victims if v[2] < floor]
+        # delete first so a row-max rescan only sees surviving edges
+        for other, _, _ in victims:
+            del row[other]
+        for other, edge, value in victims:
+            on_edge_change(uid, other, edge, value, 0, now)
+        removed += len(victims)
+        if not row:
+            interaction_scores.pop(uid, None)
+    return removed
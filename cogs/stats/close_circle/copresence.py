@@ -0,0 +1,86 @@
+# cogs/close_circle/copresence.py
+import time
+
+# Intervals a single channel may buffer before it is flushed on the spot,
+# so very busy rooms never hold an unbounded backlog.
+MAX_PENDING_INTERVALS = 256
+
+class VoiceCoPresence:
+    """
+    Interval-based voice co-presence.
+
+    The event path only records membership boundaries (O(1) per join/leave):
+      _open[channel_id]   = {uid: start_epoch} for people currently in the room
+      _closed[channel_id] = [(uid, start, end), ...] finished since last flush
+    flush() turns those timelines into exact pairwise overlap seconds with a
+    sweep per channel, then re-anchors open sessions at the flush time so
+    nothing is counted twice.
+    """
+
+    def __init__(self, max_pending: int = MAX_PENDING_INTERVALS):
+        self.max_pending = max_pending
+        self._open: dict[int, dict[int, float]] = {}
+        self._closed: dict[int, list] = {}
+
+    def join(self, channel_id: int, uid: int, now: float | None = None) -> None:
+        now = time.time() if now is None else now
+        self._open.setdefault(channel_id, {})[uid] = now
+
+    def leave(self, channel_id: int, uid: int, now: float | None = None) -> dict:
+        """
+        Close uid's interval in channel_id. Normally returns {}; if the room's
+        backlog hit max_pending it is flushed right away and its credits returned.
+        """
+        now = time.time() if now is None else now
+        members = self._open.get(channel_id)
+        start = members.pop(uid, None) if members else None
+        if members is not None and not members:
+            self._open.pop(channel_id, None)
+        if start is None:
+            return {}
+        closed = self._closed.setdefault(channel_id, [])
+        closed.append((uid, start, now))
+        if len(closed) >= self.max_pending:
+            credits: dict = {}
+            self._flush_channel(channel_id, now, credits)
+            return credits
+        return {}
+
+    def flush(self, now: float | None = None) -> dict:
+        """Return {(uid_a, uid_b): overlap_seconds} (uid_a < uid_b) for all rooms."""
+        now = time.time() if now is None else now
+        credits: dict = {}
+        for channel_id in set(self._closed) | set(self._open):
+            self._flush_channel(channel_id, now, credits)
+        return credits
+
+    def _flush_channel(self, channel_id: int, now: float, credits: dict) -> None:
+        intervals = self._closed.pop(channel_id, [])
+        members = self._open.get(channel_id)
+        if members:
+            intervals.extend((uid, start, now) for uid, start in members.items())
+            for uid in members:
+                members[uid] = now
+        if len(intervals) < 2:
+            return
+
+        # Sweep by start time: a new interval overlaps exactly the intervals
+        # still active when it starts, so work is proportional to real overlaps.
+        intervals.sort(key=lambda iv: iv[1])
+        active: list = []
+        for uid, start, end in intervals:
+            active = [iv for iv in active if iv[2] > start]
+            for other_uid, _, other_end in active:
+                if other_uid == uid:
+                    continue
+                overlap = min(end, other_end) - start
+                if overlap > 0:
+                    key = (uid, other_uid) if uid < other_uid else (other_uid, uid)
+                    credits[key] = credits.get(key, 0) + overlap
+            active.append((uid, start, end))
+
+    def open_sessions(self) -> int:
+        return sum(len(m) for m in self._open.values())
+
+    def pending_intervals(self) -> int:
+        return sum(len(c) for c in self._closed.values())
@@ -0,0 +1,42 @@
+# cogs/close_circle/decay.py
+import math
+import time
+from .state import interaction_scores
+
+# Scores halve every HALF_LIFE_DAYS without activity. Decay is lazy: each
+# edge is stored as [score, last_update_epoch] and only brought up to date
+# when it is read or written, so there is never a global decay sweep.
+HALF_LIFE_DAYS = 30
+# Edges that have decayed below this are dropped by compaction.
+PRUNE_FLOOR = 0.5
+
+_LAMBDA = math.log(2) / (HALF_LIFE_DAYS * 86400)
+
+def now_ts() -> float:
+    return time.time()
+
+def decayed(score, ts, now: float | None = None) -> float:
+    """Value of a (score, ts) cell as of `now`."""
+    if now is None:
+        now = time.time()
+    elapsed = now - ts
+    if elapsed <= 0 or not score:
+        return score
+    return score * math.exp(-_LAMBDA * elapsed)
+
+def edge_value(edge, now: float | None = None) -> float:
+    return decayed(edge[0], edge[1], now) if edge else 0
+
+def bump_edge(a: int, b: int, delta, now: float) -> tuple:
+    """
+    Decay edge a→b to `now`, add `delta`, stamp it. O(1).
+    Returns (edge, old_value_at_now).
+    """
+    row = interaction_scores[a]
+    edge = row.get(b)
+    if edge is None:
+        edge = row[b] = [0.0, now]
+    old = decayed(edge[0], edge[1], now)
+    edge[0] = old + delta
+    edge[1] = now
+    return edge, old
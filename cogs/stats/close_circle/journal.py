@@ -0,0 +1,66 @@
+# cogs/close_circle/journal.py
+import json
+import os
+from .state import JOURNAL_FILE, pending_deltas, journal_state
+
+# Each journal line is a compact JSON array: [gen, giver_id, receiver_id, delta, ts]
+# Lines from a generation older than the snapshot's are already folded into it.
+
+def record_delta(a: int, b: int, delta, ts: float) -> None:
+    """Queue one score delta; flushed to disk by flush_journal()."""
+    pending_deltas.append((a, b, delta, ts))
+
+def flush_journal() -> int:
+    """Append all queued deltas to the journal. Returns how many were written."""
+    if not pending_deltas:
+        return 0
+    gen = journal_state["gen"]
+    lines = [
+        json.dumps([gen, a, b, d, int(ts)], separators=(",", ":"))
+        for a, b, d, ts in pending_deltas
+    ]
+    data = ("\n".join(lines) + "\n").encode("utf-8")
+    try:
+        with open(JOURNAL_FILE, "ab+") as f:
+            if f.seek(0, os.SEEK_END):
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    # torn line left by a crash: don't glue the next delta onto it
+                    data = b"\n" + data
+            f.write(data)
+    except Exception as e:
+        print(f"[close_circle] Error appending journal: {e}")
+        return 0
+    pending_deltas.clear()
+    return len(lines)
+
+def replay_journal(min_gen: int):
+    """
+    Yield (giver_id, receiver_id, delta, ts) for journal lines at or after min_gen.
+    ts is None for lines written before decay existed.
+    """
+    if not os.path.exists(JOURNAL_FILE):
+        return
+    try:
+        with open(JOURNAL_FILE, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    gen, a, b, d, *rest = json.loads(line)
+                except Exception:
+                    # torn last line after a crash
+                    continue
+                if gen >= min_gen:
+                    yield int(a), int(b), d, (rest[0] if rest else None)
+    except Exception as e:
+        print(f"[close_circle] Error replaying journal: {e}")
+
+def reset_journal() -> None:
+    """Drop journal lines now covered by a snapshot."""
+    try:
+        if os.path.exists(JOURNAL_FILE):
+            os.remove(JOURNAL_FILE)
+    except Exception as e:
+        print(f"[close_circle] Error truncating journal: {e}")
@@ -1,51 +1,64 @@
 # cogs/close_circle/logic.py
+import heapq
+import time
 import discord
 from typing import List, Tuple
 from .state import interaction_scores
+from .aggregates import mutual_scores, row_max, score_between
+from .decay import decayed, edge_value, now_ts
 
 def get_top_interactions(user_id: int, guild: discord.Guild, limit: int = 10) -> List[Tuple[int, float]]:
     if user_id not in interaction_scores:
         return []
+    now = now_ts()
     results = []
-    for uid, score in interaction_scores[user_id].items():
+    for uid, edge in interaction_scores[user_id].items():
         member = guild.get_member(uid)
         if member and not member.bot:
-            results.append((uid, score))
-    return sorted(results, key=lambda x: x[1], reverse=True)[:limit]
+            results.append((uid, edge_value(edge, now)))
+    return heapq.nlargest(limit, results, key=lambda x: x[1])
 
-def get_top_interaction_pairs(guild: discord.Guild, limit: int = 10) -> List[Tuple[int, int, float, float]]:
-    raw: List[Tuple[int, int, float, float]] = []
-
-    max_per_user = {uid: (max(others.values()) if others else 0) for uid, others in interaction_scores.items()}
-
-    for uid1, others in interaction_scores.items():
-        for uid2, score_ij in others.items():
-            if uid1 >= uid2:
-                continue
-            score_ji = interaction_scores.get(uid2, {}).get(uid1, 0)
-            combined = score_ij + score_ji
-            if combined == 0:
-                continue
+# Pair ranking is a single pass over every edge, so it is cached briefly;
+# !bff within the window only re-filters by current guild membership.
+PAIRS_CACHE_SECONDS = 60
+_pairs_cache = {"at": None, "ranked": []}
 
-            max1 = max_per_user.get(uid1, 0)
-            max2 = max_per_user.get(uid2, 0)
-            rel1 = score_ij / max1 if max1 else 0
-            rel2 = score_ji / max2 if max2 else 0
-            mutual_rel = (rel1 + rel2) / 2
-            final_score = combined * mutual_rel
+def _rank_pairs() -> List[Tuple[float, int, int, float]]:
+    raw: List[Tuple[float, int, int, float]] = []
+    now = now_ts()
+    # One pass over the maintained pair sums; row maxima are precomputed.
+    for (uid1, uid2), cell in mutual_scores.items():
+        combined = decayed(cell[0], cell[1], now)
+        if combined <= 0:
+            continue
+        score_ij = score_between(uid1, uid2, now)
+        score_ji = max(combined - score_ij, 0)
 
-            m1 = guild.get_member(uid1)
-            m2 = guild.get_member(uid2)
-            if m1 and m2 and (not m1.bot) and (not m2.bot):
-                raw.append((uid1, uid2, final_score, mutual_rel))
+        max1 = score_between(uid1, row_max[uid1], now) if uid1 in row_max else 0
+        max2 = score_between(uid2, row_max[uid2], now) if uid2 in row_max else 0
+        rel1 = score_ij / max1 if max1 else 0
+        rel2 = score_ji / max2 if max2 else 0
+        mutual_rel = (rel1 + rel2) / 2
+        raw.append((combined * mutual_rel, uid1, uid2, mutual_rel))
+    raw.sort(key=lambda x: x[0], reverse=True)
+    return raw
 
-    raw.sort(key=lambda x: x[2], reverse=True)
+def get_top_interaction_pairs(guild: discord.Guild, limit: int = 10) -> List[Tuple[int, int, float, float]]:
+    now = time.monotonic()
+    at = _pairs_cache["at"]
+    if at is None or now - at > PAIRS_CACHE_SECONDS:
+        _pairs_cache["ranked"] = _rank_pairs()
+        _pairs_cache["at"] = now
 
     result: List[Tuple[int, int, float, float]] = []
     used = set()
-    for u1, u2, fs, mr in raw:
+    for fs, u1, u2, mr in _pairs_cache["ranked"]:
         if u1 in used or u2 in used:
             continue
+        m1 = guild.get_member(u1)
+        m2 = guild.get_member(u2)
+        if not (m1 and m2) or m1.bot or m2.bot:
+            continue
         result.append((u1, u2, fs, mr))
         used.update([u1, u2])
         if len(result) >= limit:
@@ -0,0 +1,22 @@
+# cogs/close_circle/metrics.py
+from .state import interaction_scores, received_scores, previous_message_user, reaction_history, voice_presence, pending_deltas
+from .aggregates import given_totals, received_totals, row_max, mutual_scores
+
+def memory_stats() -> dict:
+    """Sizes of every long-lived close-circle structure; should stay flat over time."""
+    return {
+        "score_rows": len(interaction_scores),
+        "score_edges": sum(len(row) for row in interaction_scores.values()),
+        "received_index": len(received_scores),
+        "given_totals": len(given_totals),
+        "received_totals": len(received_totals),
+        "row_max": len(row_max),
+        "mutual_pairs": len(mutual_scores),
+        "last_author_channels": len(previous_message_user),
+        "reaction_pairs": len(reaction_history),
+        "reaction_evicted": reaction_history.evicted,
+        "reaction_expired": reaction_history.expired,
+        "vc_sessions": voice_presence.open_sessions(),
+        "vc_pending_intervals": voice_presence.pending_intervals(),
+        "pending_deltas": len(pending_deltas),
+    }
@@ -1,74 +1,59 @@
 # cogs/close_circle/nbff.py
 import math
 import discord
-from .state import interaction_scores
-from configs.helper import send_as_webhook
+from .aggregates import total_activity, top_partner, mutual_score
+from utils.webhook_pool import send_as_webhook
 
-def _total_given(uid: int) -> int:
-    return int(sum(interaction_scores.get(uid, {}).values()))
+def _total_activity(uid: int) -> int:
+    return int(total_activity(uid))
 
-def _total_received(uid: int) -> int:
-    total = 0
-    for other_id, out_map in interaction_scores.items():
-        if other_id == uid:
-            continue
-        total += int(out_map.get(uid, 0))
-    return total
-
-def _top_partner(uid: int) -> int | None:
-    row = interaction_scores.get(uid, {})
-    if not row:
-        return None
-    return max(row.items(), key=lambda kv: kv[1])[0] if row else None
+def _is_stranger_pair(uid1: int, uid2: int) -> bool:
+    if int(mutual_score(uid1, uid2)) != 0:
+        return False
+    return top_partner(uid1) != uid2 and top_partner(uid2) != uid1
 
 async def nbff(ctx):
     guild = ctx.guild
     MIN_ACTIVE_USER = 30
     LIMIT = 10
 
-    members = [m for m in guild.members if not m.bot]
-    id_set = {m.id for m in members}
-
-    totals = {m.id: (_total_given(m.id) + _total_received(m.id)) for m in members}
-    tops = {m.id: _top_partner(m.id) for m in members}
+    # Only active members can form a pair; rank them by activity so the
+    # strongest pair (score = sqrt of the weaker side) is found first.
+    active = []
+    for m in guild.members:
+        if m.bot:
+            continue
+        act = _total_activity(m.id)
+        if act >= MIN_ACTIVE_USER:
+            active.append((act, m.id))
+    active.sort(key=lambda x: (-x[0], x[1]))
 
+    # Greedy disjoint pairing without enumerating all O(n²) pairs: walking
+    # down the ranking, each member is the weaker side of any pair with an
+    # earlier unpaired member, so the first stranger found is the best pair
+    # available for it. Stops as soon as LIMIT pairs exist.
     pairs = []
-    ids = sorted(id_set)
-    for i, uid1 in enumerate(ids):
-        act1 = totals.get(uid1, 0)
-        if act1 < MIN_ACTIVE_USER:
+    unpaired: list[tuple[int, int]] = []
+    for act, uid in active:
+        partner_idx = next(
+            (i for i, (_, other) in enumerate(unpaired) if _is_stranger_pair(other, uid)),
+            None,
+        )
+        if partner_idx is None:
+            unpaired.append((act, uid))
             continue
-        for uid2 in ids[i+1:]:
-            act2 = totals.get(uid2, 0)
-            if act2 < MIN_ACTIVE_USER:
-                continue
-            m12 = int(interaction_scores.get(uid1, {}).get(uid2, 0))
-            m21 = int(interaction_scores.get(uid2, {}).get(uid1, 0))
-            mutual = m12 + m21
-            if mutual != 0:
-                continue
-            if tops.get(uid1) == uid2 or tops.get(uid2) == uid1:
-                continue
-            score = math.sqrt(min(act1, act2))
-            pairs.append((uid1, uid2, score, float(mutual), 0.0))
+        _, other = unpaired.pop(partner_idx)
+        u1, u2 = (other, uid) if other < uid else (uid, other)
+        pairs.append((u1, u2, math.sqrt(act), 0.0, 0.0))
+        if len(pairs) >= LIMIT:
+            break
 
     if not pairs:
         return await send_as_webhook(ctx, "nbff", content="No perfectly separate ‘stranger’ pairs found 😄")
 
-    pairs.sort(key=lambda x: x[2], reverse=True)
-    used = set()
-    final = []
-    for u1, u2, score, mutual, share in pairs:
-        if u1 in used or u2 in used:
-            continue
-        final.append((u1, u2, score, mutual, share))
-        used.add(u1); used.add(u2)
-        if len(final) >= LIMIT:
-            break
-
     emojis = ["🧊","👻","🥶","🤐","😵","😿","😑","🤷","🪓","🧱"]
     lines = []
-    for idx, (u1, u2, score, mutual, share) in enumerate(final, start=1):
+    for idx, (u1, u2, score, mutual, share) in enumerate(pairs, start=1):
         m1 = guild.get_member(u1)
         m2 = guild.get_member(u2)
         if not m1 or not m2:
@@ -1,18 +1,13 @@
 # cogs/close_circle/ncc.py
 import discord
-from .state import interaction_scores
-from configs.helper import send_as_webhook
+from .aggregates import total_given, total_received, mutual_score
+from utils.webhook_pool import send_as_webhook
 
 def _total_given(uid: int) -> int:
-    return int(sum(interaction_scores.get(uid, {}).values()))
+    return int(total_given(uid))
 
 def _total_received(uid: int) -> int:
-    total = 0
-    for other_id, out_map in interaction_scores.items():
-        if other_id == uid:
-            continue
-        total += int(out_map.get(uid, 0))
-    return total
+    return int(total_received(uid))
 
 async def ncc(ctx, member: discord.Member | None = None):
     target = member or ctx.author
@@ -34,7 +29,7 @@ async def ncc(ctx, member: discord.Member | None = None):
         if total_active < MIN_ACTIVE:
             continue
 
-        toward_you = int(interaction_scores.get(other.id, {}).get(tid, 0)) + int(interaction_scores.get(tid, {}).get(other.id, 0))
+        toward_you = int(mutual_score(other.id, tid))
         if toward_you > 0:
             continue
 
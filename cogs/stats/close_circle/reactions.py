@@ -0,0 +1,65 @@
+# cogs/close_circle/reactions.py
+import time
+import zlib
+from collections import OrderedDict
+
+# Bounded replacement for the old uid -> uid -> set(emoji) history.
+# Only "has X reacted to Y recently?" is needed for the reciprocal bonus, so
+# each (giver, receiver) pair keeps just a last-seen time and a 32-bit emoji
+# fingerprint (one bit per emoji bucket) instead of the emoji strings.
+RECIPROCAL_TTL_SECONDS = 30 * 86400
+RECIPROCAL_MAX_PAIRS = 100_000
+FINGERPRINT_BITS = 32
+
+def emoji_bit(emoji_str: str) -> int:
+    return 1 << (zlib.crc32(emoji_str.encode("utf-8")) % FINGERPRINT_BITS)
+
+class ReciprocalReactions:
+    """TTL + LRU table: (giver_id, receiver_id) -> (last_seen_epoch, fingerprint)."""
+
+    def __init__(self, ttl: float = RECIPROCAL_TTL_SECONDS, max_pairs: int = RECIPROCAL_MAX_PAIRS):
+        self.ttl = ttl
+        self.max_pairs = max_pairs
+        self._pairs: OrderedDict = OrderedDict()
+        self.evicted = 0
+        self.expired = 0
+
+    def record(self, giver: int, receiver: int, emoji_str: str, now: float | None = None) -> None:
+        now = time.time() if now is None else now
+        key = (giver, receiver)
+        prev = self._pairs.pop(key, None)
+        fingerprint = (prev[1] if prev else 0) | emoji_bit(emoji_str)
+        self._pairs[key] = (now, fingerprint)
+        self._trim(now)
+
+    def has_reacted(self, giver: int, receiver: int, now: float | None = None) -> bool:
+        now = time.time() if now is None else now
+        entry = self._pairs.get((giver, receiver))
+        if entry is None:
+            return False
+        if now - entry[0] > self.ttl:
+            del self._pairs[(giver, receiver)]
+            self.expired += 1
+            return False
+        return True
+
+    def fingerprint(self, giver: int, receiver: int) -> int:
+        entry = self._pairs.get((giver, receiver))
+        return entry[1] if entry else 0
+
+    def _trim(self, now: float) -> None:
+        # Oldest-touched entries sit at the front: drop expired ones, then
+        # anything beyond the size cap.
+        while self._pairs:
+            seen = next(iter(self._pairs.values()))[0]
+            if now - seen > self.ttl:
+                self._pairs.popitem(last=False)
+                self.expired += 1
+            elif len(self._pairs) > self.max_pairs:
+                self._pairs.popitem(last=False)
+                self.evicted += 1
+            else:
+                break
+
+    def __len__(self) -> int:
+        return len(self._pairs)
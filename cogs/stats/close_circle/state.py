@@ -2,25 +2,37 @@
 import os
 from collections import defaultdict
 
-# === Persistent data file ===
+from .reactions import ReciprocalReactions
+from .copresence import VoiceCoPresence
+
+# === Persistent data files ===
+# Periodic compact snapshot of interaction_scores
 DATA_FILE = "database/close_circle_data.json"
+# Append-only journal of score deltas since the last snapshot
+JOURNAL_FILE = "database/close_circle_journal.jsonl"
 
 # === Runtime state ===
-# Interaction scoring: giver_id -> receiver_id -> score
-interaction_scores = defaultdict(lambda: defaultdict(int))
+# Interaction scoring: giver_id -> receiver_id -> [score, last_update_epoch]
+# (decayed lazily, see decay.py)
+interaction_scores = defaultdict(dict)
+
+# Message proximity: channel_id -> last author id
+previous_message_user: dict[int, int] = {}
 
-# Message proximity: channel_id -> last author (discord.Member – set at runtime)
-previous_message_user = {}
+# Recent reactions for the reciprocal bonus (bounded; see reactions.py)
+reaction_history = ReciprocalReactions()
 
-# Emoji reaction history: uid -> uid -> set(emoji)
-reaction_history = defaultdict(lambda: defaultdict(set))
+# Voice tracking: per-channel membership timelines (see copresence.py)
+voice_presence = VoiceCoPresence()
 
-# Voice tracking: member_id -> datetime (UTC)
-vc_join_times = {}
+# Journal bookkeeping: deltas not yet appended to JOURNAL_FILE, and the
+# generation they belong to (bumped every snapshot).
+pending_deltas: list = []
+journal_state = {"gen": 0}
 
 # Alias & derived
 given_scores = interaction_scores
-received_scores = defaultdict(lambda: defaultdict(int))  # built from interaction_scores
+received_scores = defaultdict(dict)  # receiver -> giver -> edge; kept in sync by aggregates.on_edge_change
 
 # Ensure the storage directory exists
 _dir = os.path.dirname(DATA_FILE)
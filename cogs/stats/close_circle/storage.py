@@ -1,52 +1,92 @@
 # cogs/close_circle/storage.py
 import json
 import os
-from .state import DATA_FILE, interaction_scores, received_scores
+from .state import DATA_FILE, interaction_scores, journal_state
+from .journal import flush_journal, replay_journal, reset_journal
+from .aggregates import rebuild_aggregates
+from .decay import bump_edge, edge_value, now_ts
+
+# v2: scores are stored already decayed to the snapshot's "at" time
+SNAPSHOT_VERSION = 2
 
 def load_close_circle_data() -> None:
     if not DATA_FILE or not DATA_FILE.endswith(".json"):
         return
+    raw = {}
     try:
-        if not os.path.exists(DATA_FILE):
-            return
-        with open(DATA_FILE, "r", encoding="utf-8") as f:
-            raw = json.load(f)
+        if os.path.exists(DATA_FILE):
+            with open(DATA_FILE, "r", encoding="utf-8") as f:
+                raw = json.load(f) or {}
     except Exception as e:
         print(f"[close_circle] Error loading data: {e}")
         return
 
+    # v1+ snapshots wrap the matrix; older files are the bare {uid: {uid: score}} map.
+    # Anything without an "at" stamp starts decaying from now.
+    now = now_ts()
+    if isinstance(raw, dict) and "scores" in raw and "v" in raw:
+        gen = int(raw.get("gen", 0))
+        at = float(raw.get("at", now))
+        scores = raw.get("scores") or {}
+    else:
+        gen = 0
+        at = now
+        scores = raw
+
     interaction_scores.clear()
-    for user_str, others in (raw or {}).items():
+    for user_str, others in scores.items():
         try:
             uid = int(user_str)
-            scores_map = {int(k): v for k, v in others.items()}
+            scores_map = {int(k): [v, at] for k, v in others.items()}
             interaction_scores[uid] = scores_map
         except Exception:
             continue
 
-    print(f"[close_circle] Loaded {len(interaction_scores)} users from {DATA_FILE}")
+    replayed = 0
+    for a, b, delta, ts in replay_journal(gen):
+        bump_edge(a, b, delta, ts if ts is not None else now)
+        replayed += 1
+    journal_state["gen"] = gen
+
+    print(f"[close_circle] Loaded {len(interaction_scores)} users from {DATA_FILE} (+{replayed} journal deltas)")
     build_directional_scores()
 
 def save_close_circle_data() -> None:
+    """Write a full compact snapshot and retire the journal it covers."""
     if not interaction_scores:
         print("[close_circle] No interaction data to save, skipping.")
         return
+    # Everything queued so far lands in the old generation; the snapshot
+    # below covers it, and new deltas go to the next generation.
+    flush_journal()
+    journal_state["gen"] += 1
+
+    at = int(now_ts())
     to_save = {}
     for uid, scores in interaction_scores.items():
         if scores:
-            filtered = {str(k): v for k, v in scores.items() if v}
+            filtered = {}
+            for k, edge in scores.items():
+                value = round(edge_value(edge, at), 3)
+                if value:
+                    filtered[str(k)] = value
             if filtered:
                 to_save[str(uid)] = filtered
+    snapshot = {"v": SNAPSHOT_VERSION, "gen": journal_state["gen"], "at": at, "scores": to_save}
     tmp = DATA_FILE + ".tmp"
     try:
         with open(tmp, "w", encoding="utf-8") as f:
-            json.dump(to_save, f, indent=2)
+            json.dump(snapshot, f, separators=(",", ":"))
         os.replace(tmp, DATA_FILE)
     except Exception as e:
         print(f"[close_circle] Error saving data: {e}")
+        return
+    reset_journal()
+
+def flush_close_circle_journal() -> int:
+    """Cheap periodic durability: append queued deltas only (O(delta))."""
+    return flush_journal()
 
 def build_directional_scores() -> None:
-    received_scores.clear()
-    for giver_id, targets in interaction_scores.items():
-        for receiver_id, score in targets.items():
-            received_scores[receiver_id][giver_id] = score
+    # received_scores, totals, row maxima and mutual pair sums in one pass
+    rebuild_aggregates()
@@ -1,37 +1,26 @@
 # cogs/close_circle/update.py
-from datetime import datetime
-from collections import defaultdict
 import discord
 
-from .state import interaction_scores, previous_message_user, reaction_history, vc_join_times
-
-def _ensure_scores_row(uid: int) -> defaultdict:
-    row = interaction_scores.get(uid)
-    if isinstance(row, defaultdict):
-        return row
-    row = defaultdict(int, row or {})
-    interaction_scores[uid] = row
-    return row
+from .state import previous_message_user, reaction_history, voice_presence
+from .journal import record_delta
+from .aggregates import on_edge_change
+from .decay import bump_edge, now_ts
 
 def _bump_score(a: int, b: int, delta: int) -> None:
-    _ensure_scores_row(a)[b] += delta
-
-def _ensure_reaction_row(uid: int) -> defaultdict:
-    row = reaction_history.get(uid)
-    if isinstance(row, defaultdict):
-        return row
-    row = defaultdict(set, row or {})
-    reaction_history[uid] = row
-    return row
+    now = now_ts()
+    edge, old = bump_edge(a, b, delta, now)
+    on_edge_change(a, b, edge, old, edge[0], now)
+    record_delta(a, b, delta, now)
 
 def update_proximity(member: discord.Member, channel_id: int) -> None:
     if member.bot:
         return
-    prev = previous_message_user.get(channel_id)
-    if prev and not prev.bot and prev.id != member.id:
-        _bump_score(member.id, prev.id, 2)
-        _bump_score(prev.id, member.id, 2)
-    previous_message_user[channel_id] = member
+    # only non-bot authors are ever stored, so the id alone is enough
+    prev_id = previous_message_user.get(channel_id)
+    if prev_id and prev_id != member.id:
+        _bump_score(member.id, prev_id, 2)
+        _bump_score(prev_id, member.id, 2)
+    previous_message_user[channel_id] = member.id
 
 def update_reply(message: discord.Message) -> None:
     if message.author.bot:
@@ -57,32 +46,43 @@ def update_reactions_proximity(reaction: discord.Reaction, user: discord.Member)
         return
     _bump_score(user.id, msg_author.id, 2)
     _bump_score(msg_author.id, user.id, 1)
-    emoji_str = str(reaction.emoji)
-    _ensure_reaction_row(user.id)[msg_author.id].add(emoji_str)
-    author_row = _ensure_reaction_row(msg_author.id)
-    if user.id in author_row:
+    reaction_history.record(user.id, msg_author.id, str(reaction.emoji))
+    if reaction_history.has_reacted(msg_author.id, user.id):
         _bump_score(user.id, msg_author.id, 4)
         _bump_score(msg_author.id, user.id, 4)
 
+# Voice co-presence is worth 0.2 points per minute spent together.
+VOICE_POINTS_PER_MINUTE = 0.2
+
+def _credit_voice_overlaps(credits: dict) -> None:
+    for (a, b), seconds in credits.items():
+        score = round(seconds / 60.0 * VOICE_POINTS_PER_MINUTE, 2)
+        if score > 0:
+            _bump_score(a, b, score)
+            _bump_score(b, a, score)
+
 def update_voice_proximity(member: discord.Member, before: discord.VoiceState, after: discord.VoiceState) -> None:
+    """O(1): only records the membership boundary; pairs are credited by flush_voice_proximity()."""
     if member.bot:
         return
     uid = member.id
     before_ch = before.channel
     after_ch = after.channel
+    if before_ch == after_ch:
+        return
+    now = now_ts()
+
+    # leaving/switching away — close the interval
+    if before_ch:
+        # a room that hit its backlog cap is flushed in the same call
+        _credit_voice_overlaps(voice_presence.leave(before_ch.id, uid, now))
 
-    # leaving/switching away — score time spent
-    if before_ch and before_ch != after_ch:
-        join_time = vc_join_times.pop(uid, None)
-        if join_time:
-            mins = (datetime.utcnow() - join_time).total_seconds() / 60.0
-            score = round(mins * 0.2, 2)
-            if score > 0:
-                for other in before_ch.members:
-                    if not other.bot and other.id != uid:
-                        _bump_score(uid, other.id, score)
-                        _bump_score(other.id, uid, score)
+    # joining a new channel — open an interval
+    if after_ch:
+        voice_presence.join(after_ch.id, uid, now)
 
-    # joining a new channel — record start
-    if after_ch and before_ch != after_ch:
-        vc_join_times[uid] = datetime.utcnow()
+def flush_voice_proximity() -> int:
+    """Credit all co-presence accumulated since the last flush. Returns pairs credited."""
+    credits = voice_presence.flush()
+    _credit_voice_overlaps(credits)
+    return len(credits)
@@ -12,7 +12,7 @@ from cogs.economy.orb.service import get_total_orbs
 from cogs.economy.diamond.service import get_total_diamonds
 from cogs.economy.star.service import get_total_stars
 
-from configs.helper import send_as_webhook
+from utils.webhook_pool import send_as_webhook
 
 
 async def show_full_stats(ctx):
@@ -4,7 +4,7 @@ import calendar
 
 from configs.config_files import BIRTHDAYS_FILE
 from utils.utils_json import load_json
-from configs.helper import send_as_webhook
+from utils.webhook_pool import send_as_webhook
 
 
 async def birthdays(ctx):
@@ -3,7 +3,7 @@ import discord
 from configs.config_channels import BOTS_PLAYGROUND_CHANNEL_ID
 from configs.config_files import WORDS_FILE
 from utils.utils_json import load_json
-from configs.helper import send_as_webhook
+from utils.webhook_pool import send_as_webhook
 
 
 async def words(ctx, member):
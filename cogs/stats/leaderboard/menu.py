@@ -7,7 +7,7 @@ from discord.ui import View, Select
 
 from configs.config_files import ACTIVITY_DATA_FILE
 from configs.config_channels import BOTS_PLAYGROUND_CHANNEL_ID
-from configs.helper import send_as_webhook
+from utils.webhook_pool import send_as_webhook
 
 from .manager import refresh_generic_leaderboard
 from .rows import compute_coins_row, coins_sort_key, format_coins_row
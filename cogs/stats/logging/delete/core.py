@@ -5,6 +5,7 @@ from datetime import datetime, timezone
 import discord
 from configs.config_logging import logging
 from configs.config_channels import BOT_PLAYGROUND_CHANNEL_ID
+from utils.log_sink import queue_log, LOG_PRIORITY_HIGH
 
 
 async def log_message_delete(bot: discord.Client, message: discord.Message) -> None:
@@ -32,6 +33,6 @@ async def log_message_delete(bot: discord.Client, message: discord.Message) -> N
                 value=message.content[:1024] if message.content else "*(no text content)*",
                 inline=False,
             )
-            await channel.send(embed=embed)
+            queue_log(channel, embed, priority=LOG_PRIORITY_HIGH)
     except Exception as e:
         logging.warning(f"[DeleteLog] Failed to log deleted message: {e}")
@@ -7,7 +7,8 @@ import re
 import discord
 from configs.config_logging import logging
 from configs.config_channels import LOGS_CHANNEL_ID
-from configs.helper import send_as_webhook, edit_webhook_message
+from configs.helper import edit_webhook_message
+from utils.webhook_pool import send_as_webhook
 
 # Tweak as desired
 MAX_PREVIEW_CHARS = 200
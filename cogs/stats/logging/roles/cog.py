@@ -3,14 +3,13 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 from typing import Iterable
-from types import SimpleNamespace
 
 import discord
 from discord.ext import commands
 
 from configs.config_channels import LOGS_CHANNEL_ID
 from configs.config_logging import logging
-from configs.helper import send_as_webhook  # webhook-only sender
+from utils.log_sink import queue_log, LOG_PRIORITY_HIGH
 
 
 def _fmt_roles(roles: Iterable[discord.Role]) -> str:
@@ -47,11 +46,8 @@ class RolesLoggingCog(commands.Cog):
             )
             embed.add_field(name=body_name, value=body_value, inline=False)
 
-            # Faux ctx with .channel for send_as_webhook
-            faux_ctx = SimpleNamespace(guild=getattr(target, "guild", None), channel=target, author=member)
-
-            # Persona key is 'roles'
-            await send_as_webhook(faux_ctx, "roles", embed=embed)
+            # Persona key is 'roles'; coalesced with other log traffic
+            queue_log(target, embed, persona="roles", priority=LOG_PRIORITY_HIGH)
 
         except Exception as e:
             logging.warning(f"[RolesLog] Failed to send roles webhook: {e}")
@@ -3,7 +3,7 @@
 import discord
 from discord.ext import commands
 
-from configs.helper import send_as_webhook
+from utils.webhook_pool import send_as_webhook
 
 from .groups import (
     all_stats,
@@ -0,0 +1,2 @@
+# cogs/message_stats/message_index/__init__.py
+from .cog import setup  # re-export for load_extension("cogs.stats.message_stats.message_index")
@@ -0,0 +1,54 @@
+# cogs/message_stats/message_index/cog.py
+from __future__ import annotations
+
+import discord
+from discord.ext import commands
+
+from configs.config_logging import logging
+from .crawler import to_row
+from .store import get_message_index
+
+
+class MessageIndexCog(commands.Cog):
+    """
+    Keeps the local message index live: new messages are inserted, edits
+    re-index content/mentions, deletes drop rows. History is filled in on
+    demand by crawler.crawl_channel().
+    """
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self.index = get_message_index()
+
+    @commands.Cog.listener("on_message")
+    async def on_message_listener(self, message: discord.Message):
+        if message.guild is None:
+            return
+        try:
+            self.index.add(to_row(message))
+        except Exception as e:
+            logging.warning(f"[MessageIndex] insert failed for {message.id}: {e}")
+
+    @commands.Cog.listener("on_raw_message_edit")
+    async def on_raw_message_edit(self, payload: discord.RawMessageUpdateEvent):
+        content = payload.data.get("content")
+        if content is None:
+            return  # embed/pin-only update
+        mentions = payload.data.get("mentions")
+        mention_ids = [int(u["id"]) for u in mentions] if mentions is not None else None
+        try:
+            self.index.update_content(payload.message_id, content, mention_ids)
+        except Exception as e:
+            logging.warning(f"[MessageIndex] edit failed for {payload.message_id}: {e}")
+
+    @commands.Cog.listener("on_raw_message_delete")
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent):
+        self.index.delete((payload.message_id,))
+
+    @commands.Cog.listener("on_raw_bulk_message_delete")
+    async def on_raw_bulk_message_delete(self, payload: discord.RawBulkMessageDeleteEvent):
+        self.index.delete(payload.message_ids)
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(MessageIndexCog(bot))
@@ -0,0 +1,71 @@
+# cogs/message_stats/message_index/crawler.py
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+
+import discord
+
+from configs.config_logging import logging
+from .store import CrawlState, IndexedMessage, get_message_index
+
+BATCH_SIZE = 200
+
+_crawl_locks: defaultdict[int, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+
+def to_row(message: discord.Message) -> IndexedMessage:
+    return IndexedMessage(
+        id=message.id,
+        channel_id=message.channel.id,
+        author_id=message.author.id,
+        created_at=int(message.created_at.timestamp()),
+        content=message.content or "",
+        mention_ids=tuple(m.id for m in message.mentions),
+    )
+
+
+async def crawl_channel(channel: discord.abc.Messageable) -> int:
+    """
+    Bring the index for `channel` up to date and return how many messages were added.
+
+    Two passes, both resumable from the stored cursor:
+      1) forward from newest_id (what was posted while we weren't looking)
+      2) backfill from oldest_id until the channel start (first run / interrupted run)
+    The cursor is advanced with every batch, so a crash only loses one batch.
+    """
+    index = get_message_index()
+    async with _crawl_locks[channel.id]:
+        state = index.crawl_state(channel.id)
+        added = 0
+
+        if state.newest_id is not None or state.complete:
+            after = discord.Object(id=state.newest_id) if state.newest_id is not None else None
+            batch: list[IndexedMessage] = []
+            async for m in channel.history(limit=None, after=after, oldest_first=True):
+                batch.append(to_row(m))
+                if len(batch) >= BATCH_SIZE:
+                    state = state._replace(newest_id=batch[-1].id)
+                    added += index.add_batch(channel.id, batch, state)
+                    batch = []
+            if batch:
+                state = state._replace(newest_id=batch[-1].id)
+                added += index.add_batch(channel.id, batch, state)
+
+        if not state.complete:
+            before = discord.Object(id=state.oldest_id) if state.oldest_id is not None else None
+            batch = []
+            async for m in channel.history(limit=None, before=before):
+                batch.append(to_row(m))
+                if len(batch) >= BATCH_SIZE:
+                    state = CrawlState(state.newest_id or batch[0].id, batch[-1].id, False)
+                    added += index.add_batch(channel.id, batch, state)
+                    batch = []
+            newest = state.newest_id or (batch[0].id if batch else None)
+            oldest = batch[-1].id if batch else state.oldest_id
+            state = CrawlState(newest, oldest, True)
+            added += index.add_batch(channel.id, batch, state)
+
+        if added:
+            logging.info(f"[MessageIndex] Indexed {added} new message(s) in #{getattr(channel, 'name', channel.id)}")
+        return added
@@ -0,0 +1,211 @@
+# cogs/message_stats/message_index/store.py
+from __future__ import annotations
+
+import sqlite3
+from typing import Iterable, NamedTuple
+
+from configs.config_logging import logging
+
+INDEX_DB_FILE = "database/message_index.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id          INTEGER PRIMARY KEY,   -- message snowflake
+    channel_id  INTEGER NOT NULL,
+    author_id   INTEGER NOT NULL,
+    created_at  INTEGER NOT NULL,      -- epoch seconds
+    content     TEXT    NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS messages_channel ON messages(channel_id, id);
+CREATE INDEX IF NOT EXISTS messages_author ON messages(author_id);
+
+CREATE TABLE IF NOT EXISTS mentions (
+    message_id  INTEGER NOT NULL,
+    user_id     INTEGER NOT NULL,
+    PRIMARY KEY (message_id, user_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS mentions_user ON mentions(user_id);
+
+-- Per-channel crawl cursor: everything in [oldest_id, newest_id] is indexed;
+-- complete=1 once the backfill reached the start of the channel.
+CREATE TABLE IF NOT EXISTS crawl_state (
+    channel_id  INTEGER PRIMARY KEY,
+    newest_id   INTEGER,
+    oldest_id   INTEGER,
+    complete    INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TRIGGER IF NOT EXISTS messages_ai AFTER INSERT ON messages BEGIN
+    INSERT INTO messages_fts(rowid, content) VALUES (new.id, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS messages_ad AFTER DELETE ON messages BEGIN
+    INSERT INTO messages_fts(messages_fts, rowid, content) VALUES ('delete', old.id, old.content);
+    DELETE FROM mentions WHERE message_id = old.id;
+END;
+CREATE TRIGGER IF NOT EXISTS messages_au AFTER UPDATE OF content ON messages BEGIN
+    INSERT INTO messages_fts(messages_fts, rowid, content) VALUES ('delete', old.id, old.content);
+    INSERT INTO messages_fts(rowid, content) VALUES (new.id, new.content);
+END;
+"""
+
+
+class IndexedMessage(NamedTuple):
+    id: int
+    channel_id: int
+    author_id: int
+    created_at: int
+    content: str
+    mention_ids: tuple[int, ...]
+
+
+class CrawlState(NamedTuple):
+    newest_id: int | None
+    oldest_id: int | None
+    complete: bool
+
+
+def _glob_escape(phrase: str) -> str:
+    return "".join(f"[{c}]" if c in "*?[" else c for c in phrase)
+
+
+class MessageIndex:
+    """
+    SQLite message store with an FTS5 index over content.
+
+    Uses the trigram tokenizer when available so substring queries (the
+    `phrase in content` semantics the count commands always had) hit the
+    index instead of scanning; otherwise falls back to instr() over the table.
+    """
+
+    def __init__(self, path: str = INDEX_DB_FILE):
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.trigram = self._create_fts()
+        self.db.executescript(_SCHEMA)
+        self.db.commit()
+
+    def _create_fts(self) -> bool:
+        exists = self.db.execute(
+            "SELECT sql FROM sqlite_master WHERE name = 'messages_fts'"
+        ).fetchone()
+        if exists:
+            return "trigram" in exists[0]
+        try:
+            self.db.execute(
+                "CREATE VIRTUAL TABLE messages_fts USING fts5("
+                "content, content='messages', content_rowid='id', tokenize='trigram')"
+            )
+            return True
+        except sqlite3.OperationalError:
+            logging.warning("[MessageIndex] FTS5 trigram tokenizer unavailable; substring queries will scan.")
+            self.db.execute(
+                "CREATE VIRTUAL TABLE messages_fts USING fts5("
+                "content, content='messages', content_rowid='id')"
+            )
+            return False
+
+    # ── writes ────────────────────────────────────────────────────────────────
+
+    def _insert(self, rows: Iterable[IndexedMessage]) -> int:
+        rows = list(rows)
+        cur = self.db.executemany(
+            "INSERT OR IGNORE INTO messages(id, channel_id, author_id, created_at, content) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [(r.id, r.channel_id, r.author_id, r.created_at, r.content) for r in rows],
+        )
+        self.db.executemany(
+            "INSERT OR IGNORE INTO mentions(message_id, user_id) VALUES (?, ?)",
+            [(r.id, uid) for r in rows for uid in r.mention_ids],
+        )
+        return cur.rowcount
+
+    def add(self, row: IndexedMessage) -> None:
+        self._insert((row,))
+        self.db.commit()
+
+    def add_batch(self, channel_id: int, rows: list[IndexedMessage], state: CrawlState) -> int:
+        """Insert a crawled batch and advance the channel cursor in one transaction."""
+        with self.db:
+            added = self._insert(rows)
+            self.db.execute(
+                "INSERT INTO crawl_state(channel_id, newest_id, oldest_id, complete) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(channel_id) DO UPDATE SET "
+                "newest_id = excluded.newest_id, oldest_id = excluded.oldest_id, complete = excluded.complete",
+                (channel_id, state.newest_id, state.oldest_id, int(state.complete)),
+            )
+        return added
+
+    def update_content(self, message_id: int, content: str, mention_ids: Iterable[int] | None) -> None:
+        with self.db:
+            cur = self.db.execute("UPDATE messages SET content = ? WHERE id = ?", (content, message_id))
+            if cur.rowcount and mention_ids is not None:
+                self.db.execute("DELETE FROM mentions WHERE message_id = ?", (message_id,))
+                self.db.executemany(
+                    "INSERT OR IGNORE INTO mentions(message_id, user_id) VALUES (?, ?)",
+                    [(message_id, uid) for uid in mention_ids],
+                )
+
+    def delete(self, message_ids: Iterable[int]) -> None:
+        with self.db:
+            self.db.executemany("DELETE FROM messages WHERE id = ?", [(i,) for i in message_ids])
+
+    # ── reads ─────────────────────────────────────────────────────────────────
+
+    def crawl_state(self, channel_id: int) -> CrawlState:
+        row = self.db.execute(
+            "SELECT newest_id, oldest_id, complete FROM crawl_state WHERE channel_id = ?", (channel_id,)
+        ).fetchone()
+        if not row:
+            return CrawlState(None, None, False)
+        return CrawlState(row[0], row[1], bool(row[2]))
+
+    def _matching(self, phrase: str) -> tuple[str, tuple]:
+        """FROM/WHERE fragment selecting messages whose content contains `phrase` (case-sensitive)."""
+        if self.trigram:
+            return (
+                "messages m JOIN messages_fts f ON f.rowid = m.id WHERE f.content GLOB ?",
+                (f"*{_glob_escape(phrase)}*",),
+            )
+        return "messages m WHERE instr(m.content, ?) > 0", (phrase,)
+
+    def count_by_author(self, channel_id: int, phrase: str) -> dict[str, int]:
+        where, args = self._matching(phrase)
+        rows = self.db.execute(
+            f"SELECT m.author_id, COUNT(*) AS n FROM {where} AND m.channel_id = ? "
+            "GROUP BY m.author_id ORDER BY n DESC",
+            (*args, channel_id),
+        ).fetchall()
+        return {str(uid): n for uid, n in rows}
+
+    def count_mentions(self, channel_id: int, phrase: str) -> dict[str, int]:
+        where, args = self._matching(phrase)
+        rows = self.db.execute(
+            f"SELECT mn.user_id, COUNT(*) AS n FROM mentions mn WHERE mn.message_id IN "
+            f"(SELECT m.id FROM {where} AND m.channel_id = ?) GROUP BY mn.user_id ORDER BY n DESC",
+            (*args, channel_id),
+        ).fetchall()
+        return {str(uid): n for uid, n in rows}
+
+    def search(self, phrase: str, channel_id: int | None = None, limit: int = 25) -> list[tuple[int, int, int, str]]:
+        """Newest matches as (message_id, channel_id, author_id, content)."""
+        where, args = self._matching(phrase)
+        if channel_id is not None:
+            where, args = f"{where} AND m.channel_id = ?", (*args, channel_id)
+        return self.db.execute(
+            f"SELECT m.id, m.channel_id, m.author_id, m.content FROM {where} ORDER BY m.id DESC LIMIT ?",
+            (*args, limit),
+        ).fetchall()
+
+    def close(self) -> None:
+        self.db.close()
+
+
+_index: MessageIndex | None = None
+
+
+def get_message_index() -> MessageIndex:
+    global _index
+    if _index is None:
+        _index = MessageIndex()
+    return _index
@@ -1,7 +1,6 @@
 # cogs/transcription/cog.py
 from __future__ import annotations
 
-import io
 import discord
 from discord.ext import commands
 
@@ -12,7 +11,7 @@ from configs.config_general import BOT_GUILD_ID
 
 from .detectors import is_voice_message
 from .service import SpeechToText, NullSTT
-from .tasks import schedule as schedule_tasks
+from .tasks import TranscriptionQueue
 
 
 class TranscriptionCog(commands.Cog):
@@ -21,6 +20,13 @@ class TranscriptionCog(commands.Cog):
     def __init__(self, bot: commands.Bot, stt: SpeechToText | None = None):
         self.bot = bot
         self.stt: SpeechToText = stt or NullSTT()
+        self.jobs = TranscriptionQueue(self.stt, on_result=self._reply_with_transcript)
+
+    async def cog_load(self) -> None:
+        self.jobs.start()
+
+    async def cog_unload(self) -> None:
+        await self.jobs.close()
 
     # Public method so you can call it from tests/elsewhere if you want
     async def process_transcription(self, message: discord.Message) -> None:
@@ -44,38 +50,24 @@ class TranscriptionCog(commands.Cog):
         if not audio_attachments:
             return
 
-        coros = [self._download_transcribe_and_reply(message, att) for att in audio_attachments]
-        if schedule_tasks:
-            schedule_tasks(coros)
-        else:
-            # No scheduler available — run sequentially
-            for c in coros:
-                await c
+        # Downloads and transcription happen on the queue's workers
+        for att in audio_attachments:
+            self.jobs.submit(message, att)
 
     @commands.Cog.listener("on_message")
     async def _on_message(self, message: discord.Message):
         await self.process_transcription(message)
 
-    async def _download_transcribe_and_reply(self, message: discord.Message, attachment: discord.Attachment) -> None:
-        try:
-            raw = await attachment.read()
-            audio_bytes = io.BytesIO(raw)
-            filename = attachment.filename or "audio"
-
-            logging.info(f"[Transcription] Downloaded {len(raw)} bytes from {filename} (msg {message.id})")
-
-            text = await self.stt.transcribe(audio_bytes=audio_bytes, filename=filename, user_id=message.author.id)
-            if not text:
-                logging.info(f"[Transcription] Empty transcript for {filename}")
-                return
-
-            reply = f"🗣️ **Transcription** ({filename}):\n{text[:1900]}"
-            await message.reply(reply, mention_author=False)
+    async def _reply_with_transcript(self, message: discord.Message, attachment: discord.Attachment, text: str | None) -> None:
+        filename = attachment.filename or "audio"
+        if not text:
+            logging.info(f"[Transcription] Empty transcript for {filename}")
+            return
 
-            logging.info(f"[Transcription] Posted transcript for {filename} (msg {message.id})")
+        reply = f"🗣️ **Transcription** ({filename}):\n{text[:1900]}"
+        await message.reply(reply, mention_author=False)
 
-        except Exception as e:
-            logging.warning(f"[Transcription] Failed processing {getattr(attachment, 'filename', 'unknown')}: {e}")
+        logging.info(f"[Transcription] Posted transcript for {filename} (msg {message.id})")
 
 
 async def setup(bot: commands.Bot):
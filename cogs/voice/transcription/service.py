@@ -1,24 +1,60 @@
 # cogs/transcription/service.py
 from __future__ import annotations
-import io
-from typing import Protocol, Optional
+import hashlib
+import time
+from typing import BinaryIO, Literal, Protocol, Optional
+
+# Where an engine's work runs in the job queue (see tasks.TranscriptionQueue):
+#   "async"   - awaited on the event loop (remote APIs)
+#   "thread"  - transcribe_file() in a thread pool (CPU engines that release the GIL)
+#   "process" - transcribe_file() in a process pool (pure-Python CPU engines; must pickle)
+RunIn = Literal["async", "thread", "process"]
 
 class SpeechToText(Protocol):
-    async def transcribe(self, audio_bytes: io.BytesIO, filename: str, user_id: int) -> Optional[str]:
+    run_in: RunIn
+
+    async def transcribe(self, audio_bytes: BinaryIO, filename: str, user_id: int) -> Optional[str]:
+        ...
+
+class FileSpeechToText(Protocol):
+    """CPU engines: a blocking call on the downloaded temp file."""
+    run_in: RunIn
+
+    def transcribe_file(self, path: str, filename: str, user_id: int) -> Optional[str]:
         ...
 
 class NullSTT:
     """
     Default no-op STT service. Replace with your provider (Whisper, Deepgram, etc.)
     """
-    async def transcribe(self, audio_bytes: io.BytesIO, filename: str, user_id: int) -> Optional[str]:
+    run_in: RunIn = "async"
+
+    async def transcribe(self, audio_bytes: BinaryIO, filename: str, user_id: int) -> Optional[str]:
         # Return None/"" to skip replying; swap in a real implementation.
         return ""
 
+class FakeSTT:
+    """
+    Local stand-in for benchmarking the queue: hashes the file (real CPU work
+    proportional to its size) and sleeps `delay` seconds per job.
+    """
+    def __init__(self, delay: float = 0.5, run_in: RunIn = "thread"):
+        self.delay = delay
+        self.run_in = run_in
+
+    def transcribe_file(self, path: str, filename: str, user_id: int) -> Optional[str]:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                h.update(chunk)
+        time.sleep(self.delay)
+        return f"(fake transcript of {filename}, {h.hexdigest()[:12]})"
+
 # Example: You can later wire a real provider:
 # class WhisperSTT:
+#     run_in = "thread"
 #     def __init__(self, model: str = "large-v3"):
 #         self.model = model
-#     async def transcribe(self, audio_bytes: io.BytesIO, filename: str, user_id: int) -> Optional[str]:
+#     def transcribe_file(self, path: str, filename: str, user_id: int) -> Optional[str]:
 #         # call your Whisper code here
 #         return "transcribed text"
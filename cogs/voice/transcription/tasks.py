@@ -1,17 +1,264 @@
 # cogs/transcription/tasks.py
 from __future__ import annotations
-from typing import Iterable, Awaitable, Optional
 
-try:
-    # Reuse your scheduler if present
-    from events.helpers import schedule_tasks as _schedule_tasks
-except Exception:
-    _schedule_tasks = None
+import asyncio
+import hashlib
+import multiprocessing
+import os
+import tempfile
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Literal, Optional
 
-def schedule(coros: Iterable[Awaitable[object]]) -> Optional[None]:
+import aiohttp
+import discord
+
+from configs.config_logging import logging
+
+from .service import NullSTT, SpeechToText
+
+WORKERS = 2                          # jobs transcribed at once (and executor size)
+MAX_QUEUED = 50                      # waiting jobs before the overflow policy kicks in
+OVERFLOW_POLICY: Literal["drop_oldest", "drop_newest"] = "drop_oldest"
+MAX_AUDIO_BYTES = 25 * 1024 * 1024   # larger attachments are skipped, never downloaded
+DOWNLOAD_CHUNK = 64 * 1024
+JOB_TIMEOUT_SECONDS = 120.0          # download + transcription
+RESULT_CACHE_SIZE = 256              # transcripts kept by audio hash
+SEEN_ATTACHMENTS = 1024              # attachment ids remembered to drop duplicate events
+
+ResultCallback = Callable[[discord.Message, discord.Attachment, Optional[str]], Awaitable[None]]
+
+
+@dataclass
+class _Job:
+    message: discord.Message
+    attachment: discord.Attachment
+    engine_call: Optional[Future] = None     # executor call, once submitted
+
+
+class TranscriptionQueue:
     """
-    Wrapper so the cog can call schedule() regardless of whether your
-    global scheduler is available. Falls back to sequential awaits (handled by caller).
+    Bounded speech-to-text job queue.
+
+    - WORKERS workers pull jobs; when MAX_QUEUED jobs are waiting the
+      OVERFLOW_POLICY drops the oldest waiting job or the new one
+    - attachments are streamed to a temp file (never held in memory) and
+      hashed on the way; identical audio is transcribed once, repeats are
+      answered from a small cache or wait on the in-flight job
+    - the engine runs where it asks to (engine.run_in): on the loop, in a
+      thread pool, or in a spawn process pool
+    - a timeout abandons a thread/process call but cannot stop it, so the
+      call keeps its engine slot and its temp file until it really ends;
+      workers wait for a free slot before taking the next job
     """
-    if _schedule_tasks:
-        _schedule_tasks(tuple(coros))
+
+    def __init__(self, engine: SpeechToText, on_result: ResultCallback, workers: int = WORKERS):
+        self.engine = engine
+        self.on_result = on_result
+        self.workers = workers
+        self._queue: deque[_Job] = deque()
+        self._ready = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+        self._session: aiohttp.ClientSession | None = None
+        self._executor: ThreadPoolExecutor | ProcessPoolExecutor | None = None
+        self._engine_slots = asyncio.Semaphore(workers)
+        self._results: OrderedDict[str, Optional[str]] = OrderedDict()
+        self._in_flight: dict[str, asyncio.Future] = {}
+        self._seen: OrderedDict[int, None] = OrderedDict()
+        self._closing = False
+        self.metrics = {"queued": 0, "dropped": 0, "deduped": 0, "done": 0, "failed": 0}
+
+    # ---------- lifecycle ----------
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._closing = False
+        run_in = getattr(self.engine, "run_in", "async")
+        if run_in == "thread":
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="stt")
+        elif run_in == "process":
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def close(self) -> None:
+        self._closing = True
+        for t in self._tasks:
+            t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    # ---------- producer ----------
+    def submit(self, message: discord.Message, attachment: discord.Attachment) -> bool:
+        """Queue one attachment. False if it was a duplicate, too large, or dropped."""
+        if isinstance(self.engine, NullSTT):
+            return False  # no engine configured: don't download audio just to get ""
+        if attachment.id in self._seen:
+            self.metrics["deduped"] += 1
+            return False
+        self._seen[attachment.id] = None
+        while len(self._seen) > SEEN_ATTACHMENTS:
+            self._seen.popitem(last=False)
+
+        if attachment.size and attachment.size > MAX_AUDIO_BYTES:
+            logging.info(f"[Transcription] Skipping {attachment.filename}: {attachment.size} bytes")
+            return False
+
+        if len(self._queue) >= MAX_QUEUED:
+            self.metrics["dropped"] += 1
+            if OVERFLOW_POLICY == "drop_newest":
+                logging.warning(f"[Transcription] Queue full; dropped {attachment.filename} (msg {message.id})")
+                return False
+            old = self._queue.popleft()
+            logging.warning(f"[Transcription] Queue full; dropped oldest job (msg {old.message.id})")
+
+        self._queue.append(_Job(message, attachment))
+        self.metrics["queued"] += 1
+        self._ready.set()
+        return True
+
+    # ---------- workers ----------
+    async def _worker(self) -> None:
+        slotted = self._executor is not None
+        while True:
+            if slotted:
+                await self._engine_slots.acquire()
+            try:
+                while not self._queue:
+                    self._ready.clear()
+                    await self._ready.wait()
+            except BaseException:
+                if slotted:
+                    self._engine_slots.release()
+                raise
+            job = self._queue.popleft()
+            try:
+                text = await asyncio.wait_for(self._process(job), timeout=JOB_TIMEOUT_SECONDS)
+                self.metrics["done"] += 1
+            except asyncio.CancelledError:
+                task = asyncio.current_task()
+                if self._closing or (task is not None and task.cancelling()):
+                    raise
+                # the job itself was cancelled underneath us: count it as a failure
+                self.metrics["failed"] += 1
+                logging.warning(f"[Transcription] Job for {job.attachment.filename} was cancelled")
+                continue
+            except Exception as e:
+                self.metrics["failed"] += 1
+                logging.warning(f"[Transcription] Failed processing {job.attachment.filename}: {e or type(e).__name__}")
+                continue
+            finally:
+                # a submitted call hands its slot back itself when it ends
+                if slotted and job.engine_call is None:
+                    self._engine_slots.release()
+            try:
+                await self.on_result(job.message, job.attachment, text)
+            except Exception as e:
+                logging.warning(f"[Transcription] Result handler failed for msg {job.message.id}: {e}")
+
+    async def _process(self, job: _Job) -> Optional[str]:
+        path, digest, size = await self._download(job.attachment)
+        try:
+            logging.info(f"[Transcription] Downloaded {size} bytes from {job.attachment.filename} (msg {job.message.id})")
+            return await self._transcribe_once(digest, path, job)
+        finally:
+            if job.engine_call is None:
+                _remove_quietly(path)
+
+    async def _download(self, attachment: discord.Attachment) -> tuple[str, str, int]:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        suffix = os.path.splitext(attachment.filename or "")[1]
+        fd, path = tempfile.mkstemp(prefix="stt_", suffix=suffix)
+        h = hashlib.sha256()
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as f:
+                async with self._session.get(attachment.url) as resp:
+                    resp.raise_for_status()
+                    async for chunk in resp.content.iter_chunked(DOWNLOAD_CHUNK):
+                        size += len(chunk)
+                        if size > MAX_AUDIO_BYTES:
+                            raise ValueError(f"audio larger than {MAX_AUDIO_BYTES} bytes")
+                        h.update(chunk)
+                        f.write(chunk)
+        except BaseException:
+            _remove_quietly(path)
+            raise
+        return path, h.hexdigest(), size
+
+    async def _transcribe_once(self, digest: str, path: str, job: _Job) -> Optional[str]:
+        if digest in self._results:
+            self.metrics["deduped"] += 1
+            self._results.move_to_end(digest)
+            return self._results[digest]
+        pending = self._in_flight.get(digest)
+        if pending is not None:
+            self.metrics["deduped"] += 1
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise  # we are the one being cancelled
+                raise RuntimeError("transcription of the same audio was cancelled") from None
+
+        fut = asyncio.get_running_loop().create_future()
+        fut.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._in_flight[digest] = fut
+        try:
+            text = await self._run_engine(path, job)
+        except asyncio.CancelledError:
+            # waiters get an ordinary failure, not a cancellation of their own
+            if not fut.done():
+                fut.set_exception(TimeoutError("transcription of the same audio was cancelled"))
+            raise
+        except Exception as e:
+            if not fut.done():
+                fut.set_exception(e)
+            raise
+        else:
+            fut.set_result(text)
+            self._results[digest] = text
+            while len(self._results) > RESULT_CACHE_SIZE:
+                self._results.popitem(last=False)
+            return text
+        finally:
+            self._in_flight.pop(digest, None)
+
+    async def _run_engine(self, path: str, job: _Job) -> Optional[str]:
+        filename = job.attachment.filename or "audio"
+        user_id = job.message.author.id
+        if self._executor is None:
+            with open(path, "rb") as f:
+                return await self.engine.transcribe(audio_bytes=f, filename=filename, user_id=user_id)
+        loop = asyncio.get_running_loop()
+        call = self._executor.submit(self.engine.transcribe_file, path, filename, user_id)
+        job.engine_call = call
+
+        def finished(_) -> None:
+            # runs when the call ends or is cancelled unstarted, even if our
+            # wait_for gave up on it long ago
+            _remove_quietly(path)
+            try:
+                loop.call_soon_threadsafe(self._engine_slots.release)
+            except RuntimeError:
+                pass  # loop already closed
+
+        call.add_done_callback(finished)
+        return await asyncio.wrap_future(call)
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
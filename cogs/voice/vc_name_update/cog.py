@@ -10,6 +10,7 @@ from discord.ext import commands, tasks
 # CHANGED: import the new formatter
 from .end_of_month import format_reset_label
 from .member_count import build_member_count_name
+from utils.rest_scheduler import schedule_mutation, channel_route, PRIORITY_COSMETIC
 
 log = logging.getLogger(__name__)
 
@@ -62,9 +63,15 @@ class VCNameUpdate(commands.Cog):
             return
 
         if channel.name != new_name:
+            # Joins/leaves can fire several renames in a burst; only the latest name is sent.
+            old_name = channel.name
+            fut = schedule_mutation(
+                channel_route(channel.id), lambda: channel.edit(name=new_name),
+                key=("vc_rename", channel.id), priority=PRIORITY_COSMETIC,
+            )
             try:
-                await channel.edit(name=new_name)
-                log.info(f"[vc_name_update] Renamed '{channel.name}' -> '{new_name}'")
+                await fut
+                log.info(f"[vc_name_update] Renamed '{old_name}' -> '{channel.name}'")
             except discord.HTTPException as e:
                 log.error(f"[vc_name_update] HTTPException while renaming {channel.id}: {e}")
             except Exception as e:
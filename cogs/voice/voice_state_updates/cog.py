@@ -12,6 +12,7 @@ from configs.config_general import BOT_GUILD_ID
 from cogs.economy.xp.service import update_xp  # thin wrapper → xp.service.update_xp
 from .move_active_vc import move_active_vc
 from .join_leave_log import log_join, log_leave
+from .join_registry import VoiceJoinRegistry
 
 log = logging.getLogger(__name__)
 
@@ -32,6 +33,8 @@ class VoiceStateUpdatesCog(commands.Cog):
         self.join_times: dict[str, datetime] = {}
         # Debounce tasks per-user to coalesce multiple voice events
         self.voice_join_tasks: dict[int, asyncio.Task] = {}
+        # Join confirmations resolved from on_voice_state_update
+        self.join_registry = VoiceJoinRegistry()
 
     # ──────────────────────────────────────────────────────────────────────────
     # Helpers
@@ -42,19 +45,9 @@ class VoiceStateUpdatesCog(commands.Cog):
         member: discord.Member,
         channel: discord.VoiceChannel,
         timeout: float = 5.0,
-        tick: float = 0.15,
     ) -> bool:
-        """Poll until the member is confirmed inside the channel."""
-        loop = asyncio.get_event_loop()
-        start = loop.time()
-        while (loop.time() - start) < timeout:
-            fresh = member.guild.get_channel(channel.id)
-            if isinstance(fresh, discord.VoiceChannel):
-                if member.voice and member.voice.channel and member.voice.channel.id == channel.id:
-                    if any(m.id == member.id for m in fresh.members):
-                        return True
-            await asyncio.sleep(tick)
-        return False
+        """Wait (event-driven, no polling) until the member is confirmed inside the channel."""
+        return await self.join_registry.wait(member, channel, timeout=timeout)
 
     async def _schedule_post_join(self, member: discord.Member, channel: discord.VoiceChannel) -> None:
         """Delayed tasks after a join event — send join log, keep room for more hooks."""
@@ -115,6 +108,8 @@ class VoiceStateUpdatesCog(commands.Cog):
             # Ignore bots and other guilds
             if not member.guild or int(member.guild.id) != int(BOT_GUILD_ID) or member.bot:
                 return
+            # Wake any post-join hook waiting on this member before handling
+            self.join_registry.observe(member.id, after.channel)
             await self._handle_voice_channel_events(member, before, after)
         except Exception as e:
             log.error(f"[voice] Unexpected error in on_voice_state_update: {e}", exc_info=True)
@@ -168,6 +163,7 @@ class VoiceStateUpdatesCog(commands.Cog):
             t = self.voice_join_tasks.pop(member.id, None)
             if t and not t.done():
                 t.cancel()
+            self.join_registry.discard(member.id)
 
         # User SWITCHES between VCs (some -> different some)
         elif before.channel and after.channel and before.channel.id != after.channel.id:
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 import discord
-from configs.helper import send_as_webhook
+from utils.webhook_pool import send_as_webhook
 
 async def log_join(member: discord.Member, channel: discord.VoiceChannel) -> None:
     await send_as_webhook(channel, "vc_join", content=f"🔊 **{member.display_name}** joined the voice channel.")
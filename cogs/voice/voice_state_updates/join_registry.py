@@ -0,0 +1,67 @@
+# cogs/voice_state_updates/join_registry.py
+from __future__ import annotations
+
+import asyncio
+from typing import Optional
+
+import discord
+
+
+class VoiceJoinRegistry:
+    """
+    Awaitable join confirmations, resolved straight from on_voice_state_update.
+
+    - expect(member_id, channel_id) → Future that resolves True once the member
+      is seen in that channel, or False if they end up somewhere else.
+    - observe(member_id, channel) is called by the listener for every event;
+      it wakes the pending waiter (if any) exactly once.
+    - Only one waiter per member is kept; a newer expect() resolves the old
+      one with False and takes its place.
+    """
+
+    def __init__(self) -> None:
+        self._waiters: dict[int, tuple[int, asyncio.Future]] = {}
+
+    def expect(self, member_id: int, channel_id: int) -> asyncio.Future:
+        self.discard(member_id)
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters[member_id] = (channel_id, fut)
+        return fut
+
+    def observe(self, member_id: int, channel: Optional[discord.abc.Connectable]) -> None:
+        entry = self._waiters.get(member_id)
+        if entry is None:
+            return
+        channel_id, fut = entry
+        self._waiters.pop(member_id, None)
+        if not fut.done():
+            fut.set_result(channel is not None and channel.id == channel_id)
+
+    def discard(self, member_id: int) -> None:
+        entry = self._waiters.pop(member_id, None)
+        if entry and not entry[1].done():
+            entry[1].set_result(False)
+
+    async def wait(self, member: discord.Member, channel: discord.VoiceChannel, timeout: float) -> bool:
+        """
+        Wait until `member` is confirmed in `channel`.
+
+        The gateway cache is already updated when the triggering event is
+        dispatched, so the common case resolves immediately without sleeping.
+        Otherwise we park on the future until the next voice event for this
+        member (or the timeout).
+        """
+        fut = self.expect(member.id, channel.id)
+        if member.voice and member.voice.channel and member.voice.channel.id == channel.id:
+            self.observe(member.id, member.voice.channel)
+        try:
+            return await asyncio.wait_for(fut, timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            entry = self._waiters.get(member.id)
+            if entry and entry[1] is fut:
+                self._waiters.pop(member.id, None)
+
+    def __len__(self) -> int:
+        return len(self._waiters)
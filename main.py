@@ -1,16 +1,11 @@
 # main.py
-import discord
 import asyncio
 import logging
 from datetime import datetime
-from configs.config_general import BOT_TOKEN, BOT_GUILD_ID
-from bot import get_bot
 
-# ✅ Get the global bot instance
-bot = get_bot()
-
-# --- One-time slash command sync via setup_hook (recommended) ---
-bot._did_tree_sync = False  # for visibility/debugging
+# Worker processes started with multiprocessing's spawn/forkserver re-import
+# this file as __mp_main__. Nothing at module level may import configs or
+# build the bot: that happens only under `if __name__ == "__main__"` below.
 
 async def _setup_hook():
     """
@@ -27,29 +22,40 @@ async def _setup_hook():
     except Exception as e:
         print(f"❌ Failed to sync app commands: {e}")
 
-# Bind setup_hook onto the bot instance
-bot.setup_hook = _setup_hook
-
-@bot.check
 async def restrict_to_english_cafe(ctx):
     if ctx.guild and ctx.guild.id != BOT_GUILD_ID:
         await ctx.send("This bot is exclusive to **Infinity Café Server** 🎉\nJoin us to use the commands: 🔗 https://discord.gg/BqvjRT6W")
         return False
     return True
 
-# Save the bot's startup time for retroactive tracking of VC activity.
-bot.start_time = datetime.utcnow()
+def configure_bot():
+    # --- One-time slash command sync via setup_hook (recommended) ---
+    bot._did_tree_sync = False  # for visibility/debugging
+
+    # Bind setup_hook onto the bot instance
+    bot.setup_hook = _setup_hook
+
+    bot.check(restrict_to_english_cafe)
 
-# Ensure these dictionaries exist on the bot instance.
-if not hasattr(bot, "join_times"):
-    bot.join_times = {}
-if not hasattr(bot, "voice_activity_tracker"):
-    bot.voice_activity_tracker = {}
+    # Save the bot's startup time for retroactive tracking of VC activity.
+    bot.start_time = datetime.utcnow()
+
+    # Ensure these dictionaries exist on the bot instance.
+    if not hasattr(bot, "join_times"):
+        bot.join_times = {}
+    if not hasattr(bot, "voice_activity_tracker"):
+        bot.voice_activity_tracker = {}
 
 async def shutdown_handler():
     """Ensure voice activity is logged before the bot shuts down."""
     print("🔻 Bot is shutting down. Saving voice activity...")
 
+    # Push out coalesced log lines that are still queued
+    try:
+        await get_log_sink().close()
+    except Exception as e:
+        print(f"⚠️ Failed to flush log sink: {e}")
+
     guild = bot.get_guild(BOT_GUILD_ID)
     if not guild:
         print("⚠️ Unable to retrieve guild. Skipping voice activity update.")
@@ -168,6 +174,7 @@ async def main():
         await bot.load_extension("cogs.stats.message_stats.ping_count")
         await bot.load_extension("cogs.stats.message_stats.message_count")
         await bot.load_extension("cogs.stats.message_stats.word_count")
+        await bot.load_extension("cogs.stats.message_stats.message_index")
         await bot.load_extension("cogs.stats.close_circle")
 
         # Games
@@ -235,6 +242,15 @@ async def main():
         await bot.close()
 
 if __name__ == "__main__":
+    import discord
+    from configs.config_general import BOT_TOKEN, BOT_GUILD_ID
+    from bot import get_bot
+    from utils.log_sink import get_log_sink
+
+    # ✅ Get the global bot instance
+    bot = get_bot()
+    configure_bot()
+
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
 
@@ -7,7 +7,7 @@ from cogs.economy.orb.service import update_orbs
 from cogs.economy.star.service import update_stars
 from cogs.economy.diamond.service import update_diamonds
 
-from configs.helper import send_as_webhook
+from utils.webhook_pool import send_as_webhook
 
 # track donation logs: (host_id, event_name) → list of (donor_id, type, amount)
 donation_logs: dict[tuple[int, str], list[tuple[int, str, int]]] = {}
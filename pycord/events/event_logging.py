@@ -3,7 +3,7 @@
 import discord
 from configs.config_channels import EVENTS_CHANNEL_ID
 from configs.config_logging import logging
-from configs.helper import send_as_webhook
+from utils.webhook_pool import send_as_webhook
 
 __all__ = [
     "log_event_message",
@@ -7,7 +7,7 @@ from datetime import datetime
 from enum import IntEnum
 
 from configs.config_logging import logging
-from configs.helper import send_as_webhook
+from utils.webhook_pool import send_as_webhook
 from .donation_view import send_donation_message
 
 
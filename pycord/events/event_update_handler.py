@@ -8,7 +8,7 @@ from .donation_view import send_donation_message, donation_logs
 from .event_ping import scheduled_donation_tasks, EventStatus, ping_interested_users, attendees
 from .event_fetch import fetch_and_log_event_image
 from .event_host_location import resolve_event_location_display, resolve_event_channel_obj
-from configs.helper import send_as_webhook
+from utils.webhook_pool import send_as_webhook
 
 __all__ = [
     "handle_scheduled_event_update",
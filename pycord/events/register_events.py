@@ -18,7 +18,7 @@ from .event_update_handler import handle_scheduled_event_update
 from .event_logging import log_event_message
 from .donation_view import send_donation_message
 from .event_ping import event_voice_channel_map, attendance_start, attendees
-from configs.helper import send_as_webhook
+from utils.webhook_pool import send_as_webhook
 from datetime import datetime
 
 CHANNEL_URL_RE = re.compile(r"discord\.com/channels/(\d+)/(\d+)")
@@ -3,7 +3,7 @@
 import discord
 from discord.ext import commands
 from cogs.server.roles.rank import get_highest_loot_legends_role_index
-from configs.helper import send_as_webhook
+from utils.webhook_pool import send_as_webhook
 from configs.config_logging import logging
 
 from .state import queue_state
@@ -2,7 +2,7 @@
 
 import discord
 from configs.config_logging import logging
-from configs.helper import send_as_webhook
+from utils.webhook_pool import send_as_webhook
 from .state import queue_state
 
 class QueueView(discord.ui.View):
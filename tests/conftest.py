@@ -0,0 +1,51 @@
+# tests/conftest.py
+"""
+The configs package holds secrets and server ids and is not part of the
+repository. When it is missing, register minimal stand-ins so the modules
+under test can be imported; a real configs package always wins.
+"""
+import logging
+import sys
+import types
+
+try:
+    import configs  # noqa: F401
+except ImportError:
+    def _module(name: str, **attrs) -> types.ModuleType:
+        mod = types.ModuleType(name)
+        mod.__dict__.update(attrs)
+        # ids, channels and the like: any other name reads as 0
+        mod.__getattr__ = lambda attr: 0
+        sys.modules[name] = mod
+        return mod
+
+    async def _noop(*args, **kwargs):
+        return None
+
+    _logger = logging.getLogger("tests")
+    configs = _module("configs")
+    configs.config_logging = _module(
+        "configs.config_logging",
+        logging=logging,
+        coins_logger=_logger,
+        orbs_logger=_logger,
+        stars_logger=_logger,
+        xp_logger=_logger,
+    )
+    configs.config_general = _module("configs.config_general", OPENAI_API_KEY="")
+    configs.config_channels = _module("configs.config_channels")
+    configs.config_files = _module("configs.config_files")
+    configs.config_roles = _module("configs.config_roles")
+    configs.config_pets = _module(
+        "configs.config_pets",
+        HUMAN_PERSONAS={},
+        HUMAN_PERSONAS_ROLE_IDS={},
+        HUMAN_PERSONAS_USER_IDS={},
+    )
+    configs.helper = _module(
+        "configs.helper",
+        PERSONAS={},
+        send_as_webhook=_noop,
+        edit_webhook_message=_noop,
+        delete_webhook_message=_noop,
+    )
@@ -0,0 +1,221 @@
+# tests/test_close_circle.py
+import json
+import random
+
+import pytest
+
+from cogs.stats.close_circle import aggregates, journal, state, storage
+from cogs.stats.close_circle.copresence import VoiceCoPresence
+from cogs.stats.close_circle.decay import HALF_LIFE_DAYS, bump_edge, decayed, edge_value
+from cogs.stats.close_circle.update import _bump_score
+
+
+@pytest.fixture(autouse=True)
+def close_circle_state(tmp_path, monkeypatch):
+    monkeypatch.setattr(journal, "JOURNAL_FILE", str(tmp_path / "journal.jsonl"))
+    monkeypatch.setattr(storage, "DATA_FILE", str(tmp_path / "data.json"))
+    state.interaction_scores.clear()
+    state.pending_deltas.clear()
+    state.journal_state["gen"] = 0
+    aggregates.rebuild_aggregates()
+    yield
+    state.interaction_scores.clear()
+    state.pending_deltas.clear()
+    aggregates.rebuild_aggregates()
+
+
+def _scores() -> dict:
+    return {a: {b: round(edge_value(e), 6) for b, e in row.items()} for a, row in state.interaction_scores.items()}
+
+
+# ── journal ──────────────────────────────────────────────────────────────────
+
+def test_replay_skips_torn_tail(tmp_path):
+    journal.record_delta(1, 2, 5, 1000)
+    journal.record_delta(2, 1, 3, 1000)
+    assert journal.flush_journal() == 2
+    with open(journal.JOURNAL_FILE, "a", encoding="utf-8") as f:
+        f.write('[0,1,2,')  # crash mid-write
+
+    assert list(journal.replay_journal(0)) == [(1, 2, 5, 1000), (2, 1, 3, 1000)]
+
+
+def test_append_after_torn_tail_starts_a_new_line():
+    journal.record_delta(1, 2, 5, 1000)
+    journal.flush_journal()
+    with open(journal.JOURNAL_FILE, "a", encoding="utf-8") as f:
+        f.write('[0,1,2,')
+
+    journal.record_delta(3, 4, 2, 2000)
+    journal.flush_journal()
+
+    assert list(journal.replay_journal(0)) == [(1, 2, 5, 1000), (3, 4, 2, 2000)]
+
+
+def test_replay_ignores_generations_before_snapshot():
+    journal.record_delta(1, 2, 5, 1000)
+    journal.flush_journal()
+    state.journal_state["gen"] = 1
+    journal.record_delta(1, 2, 7, 1000)
+    journal.flush_journal()
+
+    assert [d for _, _, d, _ in journal.replay_journal(1)] == [7]
+
+
+def test_load_restores_snapshot_plus_journal(monkeypatch):
+    monkeypatch.setattr(storage, "now_ts", lambda: 1000.0)
+    monkeypatch.setattr("cogs.stats.close_circle.update.now_ts", lambda: 1000.0)
+    monkeypatch.setattr(aggregates, "now_ts", lambda: 1000.0)
+    _bump_score(1, 2, 10)
+    storage.save_close_circle_data()
+    assert not state.pending_deltas
+
+    _bump_score(1, 2, 4)
+    _bump_score(2, 3, 6)
+    storage.flush_close_circle_journal()
+    with open(journal.JOURNAL_FILE, "a", encoding="utf-8") as f:
+        f.write('[1,9,9')
+    expected = _scores()
+
+    state.interaction_scores.clear()
+    storage.load_close_circle_data()
+
+    assert _scores() == expected
+    assert state.journal_state["gen"] == 1
+    assert aggregates.total_given(1, 1000.0) == pytest.approx(14)
+
+
+def test_snapshot_retires_the_journal():
+    _bump_score(1, 2, 10)
+    storage.save_close_circle_data()
+
+    with open(storage.DATA_FILE, encoding="utf-8") as f:
+        snapshot = json.load(f)
+    assert snapshot["gen"] == 1
+    assert snapshot["scores"] == {"1": {"2": 10.0}}
+    assert list(journal.replay_journal(0)) == []
+
+
+# ── aggregates ───────────────────────────────────────────────────────────────
+
+def _brute_force(now: float):
+    given, received, mutual, best = {}, {}, {}, {}
+    for a, row in state.interaction_scores.items():
+        for b, edge in row.items():
+            v = edge_value(edge, now)
+            given[a] = given.get(a, 0) + v
+            received[b] = received.get(b, 0) + v
+            key = aggregates.pair_key(a, b)
+            mutual[key] = mutual.get(key, 0) + v
+        if row:
+            best[a] = max(row, key=lambda b: edge_value(row[b], now))
+    return given, received, mutual, best
+
+
+def _assert_aggregates_match(now: float):
+    given, received, mutual, best = _brute_force(now)
+    for uid, v in given.items():
+        assert aggregates.total_given(uid, now) == pytest.approx(v)
+    for uid, v in received.items():
+        assert aggregates.total_received(uid, now) == pytest.approx(v)
+    for (a, b), v in mutual.items():
+        assert aggregates.mutual_score(a, b, now) == pytest.approx(v)
+    for uid, partner in best.items():
+        top = aggregates.top_partner(uid)
+        assert aggregates.score_between(uid, top, now) == pytest.approx(
+            aggregates.score_between(uid, partner, now)
+        )
+
+
+def test_incremental_aggregates_match_a_full_scan(monkeypatch):
+    rng = random.Random(7)
+    clock = {"now": 0.0}
+    monkeypatch.setattr("cogs.stats.close_circle.update.now_ts", lambda: clock["now"])
+    monkeypatch.setattr(aggregates, "now_ts", lambda: clock["now"])
+
+    for _ in range(300):
+        clock["now"] += rng.uniform(0, 86400)
+        a, b = rng.sample(range(1, 9), 2)
+        _bump_score(a, b, rng.choice([1, 2, 3, 5]))
+
+    _assert_aggregates_match(clock["now"])
+    # decay alone keeps them in step: nothing is touched for 90 days
+    _assert_aggregates_match(clock["now"] + 90 * 86400)
+
+    aggregates.rebuild_aggregates()
+    _assert_aggregates_match(clock["now"])
+
+
+def test_received_index_shares_edges():
+    _bump_score(1, 2, 3)
+    assert state.received_scores[2][1] is state.interaction_scores[1][2]
+
+
+# ── lazy decay ───────────────────────────────────────────────────────────────
+
+def test_score_halves_after_one_half_life():
+    half_life = HALF_LIFE_DAYS * 86400
+    assert decayed(8.0, 0, half_life) == pytest.approx(4.0)
+    assert decayed(8.0, 0, 2 * half_life) == pytest.approx(2.0)
+    assert decayed(8.0, 100, 50) == 8.0  # never grows backwards in time
+
+
+def test_bump_decays_before_adding():
+    half_life = HALF_LIFE_DAYS * 86400
+    edge, old = bump_edge(1, 2, 8, 0)
+    assert old == 0 and edge == [8, 0]
+
+    edge, old = bump_edge(1, 2, 1, half_life)
+    assert old == pytest.approx(4.0)
+    assert edge[0] == pytest.approx(5.0)
+    assert edge[1] == half_life
+
+
+# ── voice co-presence ────────────────────────────────────────────────────────
+
+def test_sweep_credits_exact_overlaps():
+    vc = VoiceCoPresence()
+    vc.join(10, 1, now=0)
+    vc.join(10, 2, now=60)
+    vc.join(10, 3, now=120)
+    vc.leave(10, 1, now=180)
+    vc.leave(10, 2, now=240)
+    vc.join(20, 4, now=0)   # alone in another room
+
+    credits = vc.flush(now=300)
+
+    assert credits == {(1, 2): 120, (1, 3): 60, (2, 3): 120}
+
+
+def test_open_sessions_are_not_counted_twice():
+    vc = VoiceCoPresence()
+    vc.join(10, 1, now=0)
+    vc.join(10, 2, now=0)
+
+    assert vc.flush(now=100) == {(1, 2): 100}
+    assert vc.flush(now=150) == {(1, 2): 50}
+    assert vc.open_sessions() == 2
+
+
+def test_rejoining_the_same_room_counts_once():
+    vc = VoiceCoPresence()
+    vc.join(10, 1, now=0)
+    vc.join(10, 2, now=0)
+    vc.leave(10, 2, now=50)
+    vc.join(10, 2, now=70)
+
+    assert vc.flush(now=100) == {(1, 2): 80}
+
+
+def test_busy_room_flushes_on_leave():
+    vc = VoiceCoPresence(max_pending=2)
+    vc.join(10, 1, now=0)
+    vc.join(10, 2, now=0)
+    vc.join(10, 3, now=0)
+
+    assert vc.leave(10, 1, now=10) == {}
+    credits = vc.leave(10, 2, now=20)
+
+    assert credits == {(1, 2): 10, (1, 3): 10, (2, 3): 20}
+    assert vc.pending_intervals() == 0
+    assert vc.flush(now=30) == {}
@@ -0,0 +1,96 @@
+# tests/test_export.py
+import asyncio
+import gzip
+import json
+import os
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from cogs.admin.backup import _export
+from cogs.admin.backup._export import export_channel
+
+
+class FakeChannel:
+    def __init__(self, channel_id: int = 7):
+        self.id = channel_id
+        self.name = "general"
+        self.messages = []
+
+    def add(self, count: int) -> None:
+        for _ in range(count):
+            message_id = len(self.messages) + 1
+            self.messages.append(SimpleNamespace(
+                id=message_id, channel=self, author=SimpleNamespace(id=1, name="ann"),
+                created_at=datetime(2024, 1, 1, tzinfo=timezone.utc), edited_at=None,
+                content=f"message {message_id}", reference=None, embeds=[], attachments=[],
+            ))
+
+    def history(self, *, limit, after, oldest_first):
+        async def gen():
+            for m in self.messages:
+                if after is None or m.id > after.id:
+                    yield m
+        return gen()
+
+
+@pytest.fixture(autouse=True)
+def export_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(_export, "EXPORT_DIR", str(tmp_path / "exports"))
+    monkeypatch.setattr(_export, "CURSOR_FILE", str(tmp_path / "cursors.json"))
+    monkeypatch.setattr(_export, "BATCH_SIZE", 3)
+
+
+def _ids(path: str) -> list[int]:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line)["id"] for line in f]
+
+
+def test_later_runs_only_append_new_messages():
+    ch = FakeChannel()
+    ch.add(5)
+    first = asyncio.run(export_channel(ch))
+    ch.add(2)
+    second = asyncio.run(export_channel(ch))
+
+    assert (first.exported, second.exported, second.total) == (5, 2, 7)
+    assert _ids(second.path) == list(range(1, 8))
+
+
+def test_batch_written_without_a_cursor_is_not_duplicated(monkeypatch):
+    ch = FakeChannel()
+    ch.add(7)
+    real_save = _export.save_json
+    calls = {"n": 0}
+
+    def crash_on_second_cursor(path, data):
+        calls["n"] += 1
+        if calls["n"] == 2:
+            raise RuntimeError("killed")       # batch 2 is on disk, its cursor is not
+        real_save(path, data)
+
+    monkeypatch.setattr(_export, "save_json", crash_on_second_cursor)
+    with pytest.raises(RuntimeError):
+        asyncio.run(export_channel(ch))
+    monkeypatch.setattr(_export, "save_json", real_save)
+
+    result = asyncio.run(export_channel(ch))
+
+    assert result.total == 7
+    assert _ids(result.path) == list(range(1, 8))
+
+
+def test_lost_cursor_rewrites_the_transcript():
+    ch = FakeChannel()
+    ch.add(4)
+    asyncio.run(export_channel(ch, "html"))
+    os.remove(_export.CURSOR_FILE)
+
+    result = asyncio.run(export_channel(ch, "html"))
+
+    with gzip.open(result.path, "rt", encoding="utf-8") as f:
+        text = f.read()
+    assert text.count("<!DOCTYPE html>") == 1
+    assert text.count('class="m"') == 4
+    assert result.total == 4
@@ -0,0 +1,87 @@
+# tests/test_extraction_pool.py
+import asyncio
+
+import pytest
+
+from cogs.engagement.quiz_maker import extraction_pool
+from cogs.engagement.quiz_maker.extraction_pool import ExtractionPool
+
+
+def _pids(pool: ExtractionPool) -> set[int]:
+    return {w.proc.pid for w in pool._workers}
+
+
+def _run(pool: ExtractionPool, coro):
+    try:
+        return asyncio.run(coro)
+    finally:
+        pool.close()
+
+
+def test_workers_are_reused_between_files():
+    pool = ExtractionPool()
+
+    async def go():
+        first = await pool.extract("a.txt", b"hello")
+        pids = _pids(pool)
+        second = await pool.extract("b.txt", b"world")
+        return first, second, pids, _pids(pool)
+
+    first, second, before, after = _run(pool, go())
+    assert (first, second) == ("hello", "world")
+    assert before == after and len(after) == 1
+
+
+def test_parse_errors_keep_the_worker():
+    pool = ExtractionPool()
+
+    async def go():
+        with pytest.raises(RuntimeError):
+            await pool.extract("broken.pdf", b"not a pdf")
+        pids = _pids(pool)
+        return pids, await pool.extract("b.txt", b"ok"), _pids(pool)
+
+    before, text, after = _run(pool, go())
+    assert text == "ok" and before == after
+
+
+def test_workers_are_recycled(monkeypatch):
+    monkeypatch.setattr(extraction_pool, "MAX_JOBS_PER_WORKER", 1)
+    pool = ExtractionPool()
+
+    async def go():
+        await pool.extract("a.txt", b"one")
+        assert not pool._workers
+        await pool.extract("b.txt", b"two")
+        return pool._workers
+
+    assert not _run(pool, go())
+
+
+def test_timeout_replaces_only_that_worker(monkeypatch):
+    pool = ExtractionPool()
+
+    async def go():
+        monkeypatch.setattr(extraction_pool, "EXTRACTION_TIMEOUT_SECONDS", 0)
+        with pytest.raises(RuntimeError, match="too long"):
+            await pool.extract("big.txt", b"x" * (20 * 1024 * 1024))
+        assert not pool._workers
+        monkeypatch.setattr(extraction_pool, "EXTRACTION_TIMEOUT_SECONDS", 30.0)
+        return await pool.extract("a.txt", b"after")
+
+    assert _run(pool, go()) == "after"
+
+
+def test_dead_idle_worker_is_replaced():
+    pool = ExtractionPool()
+
+    async def go():
+        await pool.extract("a.txt", b"one")
+        [worker] = pool._idle
+        worker.proc.kill()
+        worker.proc.join()
+        text = await pool.extract("b.txt", b"two")
+        return text, worker in pool._workers
+
+    text, still_tracked = _run(pool, go())
+    assert text == "two" and not still_tracked
@@ -0,0 +1,96 @@
+# tests/test_join_registry.py
+import asyncio
+from types import SimpleNamespace
+
+from cogs.voice.voice_state_updates.join_registry import VoiceJoinRegistry
+
+
+def _channel(channel_id: int):
+    return SimpleNamespace(id=channel_id)
+
+
+def _member(member_id: int, channel=None):
+    voice = SimpleNamespace(channel=channel) if channel is not None else None
+    return SimpleNamespace(id=member_id, voice=voice)
+
+
+def test_member_already_in_the_channel_resolves_immediately():
+    async def go():
+        registry = VoiceJoinRegistry()
+        room = _channel(10)
+        joined = await registry.wait(_member(1, room), room, timeout=5)
+        return registry, joined
+
+    registry, joined = asyncio.run(go())
+    assert joined is True
+    assert len(registry) == 0
+
+
+def test_wait_is_woken_by_the_matching_event():
+    async def go():
+        registry = VoiceJoinRegistry()
+        room = _channel(10)
+        waiter = asyncio.create_task(registry.wait(_member(1), room, timeout=5))
+        await asyncio.sleep(0)
+        registry.observe(2, room)              # someone else: ignored
+        registry.observe(1, room)
+        return registry, await waiter
+
+    registry, joined = asyncio.run(go())
+    assert joined is True
+    assert len(registry) == 0
+
+
+def test_event_for_another_channel_resolves_false():
+    async def go():
+        registry = VoiceJoinRegistry()
+        waiter = asyncio.create_task(registry.wait(_member(1), _channel(10), timeout=5))
+        await asyncio.sleep(0)
+        registry.observe(1, _channel(11))
+        first = await waiter
+
+        waiter = asyncio.create_task(registry.wait(_member(1), _channel(10), timeout=5))
+        await asyncio.sleep(0)
+        registry.observe(1, None)              # left voice entirely
+        return first, await waiter
+
+    assert asyncio.run(go()) == (False, False)
+
+
+def test_discard_releases_the_waiter():
+    async def go():
+        registry = VoiceJoinRegistry()
+        waiter = asyncio.create_task(registry.wait(_member(1), _channel(10), timeout=5))
+        await asyncio.sleep(0)
+        registry.discard(1)
+        registry.discard(1)                    # nothing left to discard
+        return registry, await waiter
+
+    registry, joined = asyncio.run(go())
+    assert joined is False
+    assert len(registry) == 0
+
+
+def test_timeout_returns_false_and_forgets_the_waiter():
+    async def go():
+        registry = VoiceJoinRegistry()
+        joined = await registry.wait(_member(1), _channel(10), timeout=0.01)
+        registry.observe(1, _channel(10))      # late event is a no-op
+        return registry, joined
+
+    registry, joined = asyncio.run(go())
+    assert joined is False
+    assert len(registry) == 0
+
+
+def test_newer_expect_replaces_the_old_waiter():
+    async def go():
+        registry = VoiceJoinRegistry()
+        old = registry.expect(1, 10)
+        new = registry.expect(1, 11)
+        registry.observe(1, _channel(11))
+        return registry, old.result(), new.result()
+
+    registry, old, new = asyncio.run(go())
+    assert (old, new) == (False, True)
+    assert len(registry) == 0
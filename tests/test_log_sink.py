@@ -0,0 +1,167 @@
+# tests/test_log_sink.py
+import asyncio
+
+import discord
+import pytest
+
+from utils import log_sink
+from utils.log_sink import (
+    LOG_PRIORITY_HIGH,
+    LOG_PRIORITY_LOW,
+    MAX_EMBED_CHARS_PER_MESSAGE,
+    MAX_EMBEDS_PER_MESSAGE,
+    LogSink,
+)
+
+
+class FakeChannel:
+    def __init__(self, channel_id: int, order: list | None = None):
+        self.id = channel_id
+        self.sent: list[dict] = []
+        self.order = order if order is not None else []
+
+    async def send(self, **kwargs):
+        self.sent.append(kwargs)
+        self.order.append(self.id)
+
+
+def _embed(chars: int = 10) -> discord.Embed:
+    return discord.Embed(description="x" * chars)
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+@pytest.fixture
+def webhook_sends(monkeypatch):
+    sent = []
+
+    async def fake_send_as_webhook(channel, persona, **kwargs):
+        sent.append((channel.id, persona, kwargs))
+        return object()
+
+    monkeypatch.setattr(log_sink, "send_as_webhook", fake_send_as_webhook)
+    return sent
+
+
+def test_packs_at_most_ten_embeds_per_message():
+    async def go():
+        sink = LogSink(flush_interval=3600)
+        ch = FakeChannel(1)
+        for _ in range(MAX_EMBEDS_PER_MESSAGE + 2):
+            sink.submit(ch, _embed())
+        await sink.close()
+        return ch, sink
+
+    ch, sink = _run(go())
+    assert [len(m["embeds"]) for m in ch.sent] == [MAX_EMBEDS_PER_MESSAGE, 2]
+    assert sink.metrics["sent_messages"] == 2
+    assert sink.metrics["sent_entries"] == MAX_EMBEDS_PER_MESSAGE + 2
+
+
+def test_splits_on_the_embed_character_budget():
+    async def go():
+        sink = LogSink(flush_interval=3600)
+        ch = FakeChannel(1)
+        for _ in range(7):
+            sink.submit(ch, _embed(1000))
+        await sink.close()
+        return ch
+
+    ch = _run(go())
+    sizes = [sum(len(e) for e in m["embeds"]) for m in ch.sent]
+    assert sizes == [6000, 1000]
+    assert all(s <= MAX_EMBED_CHARS_PER_MESSAGE for s in sizes)
+
+
+def test_groups_by_channel_and_persona(webhook_sends):
+    async def go():
+        sink = LogSink(flush_interval=3600)
+        a, b = FakeChannel(1), FakeChannel(2)
+        sink.submit(a, _embed())
+        sink.submit(b, _embed())
+        sink.submit(a, _embed(), persona="cat")
+        sink.submit(a, _embed())
+        await sink.close()
+        return a, b
+
+    a, b = _run(go())
+    assert [len(m["embeds"]) for m in a.sent] == [2]
+    assert [len(m["embeds"]) for m in b.sent] == [1]
+    assert [(cid, persona, len(kw["embeds"])) for cid, persona, kw in webhook_sends] == [(1, "cat", 1)]
+
+
+def test_content_lines_are_joined():
+    async def go():
+        sink = LogSink(flush_interval=3600)
+        ch = FakeChannel(1)
+        sink.submit(ch, content="first")
+        sink.submit(ch, content="second")
+        await sink.close()
+        return ch
+
+    ch = _run(go())
+    assert [m["content"] for m in ch.sent] == ["first\nsecond"]
+
+
+def test_high_priority_drains_first():
+    async def go():
+        sink = LogSink(flush_interval=3600)
+        order = []
+        low, high = FakeChannel(1, order), FakeChannel(2, order)
+        sink.submit(low, _embed(), priority=LOG_PRIORITY_LOW)
+        sink.submit(high, _embed(), priority=LOG_PRIORITY_HIGH)
+        await sink.close()
+        return order
+
+    assert _run(go()) == [2, 1]
+
+
+def test_overflow_evicts_lower_priority_first():
+    async def go():
+        sink = LogSink(flush_interval=3600, max_queued=2)
+        ch = FakeChannel(1)
+        assert sink.submit(ch, content="low", priority=LOG_PRIORITY_LOW)
+        assert sink.submit(ch, content="high 1", priority=LOG_PRIORITY_HIGH)
+        assert sink.submit(ch, content="high 2", priority=LOG_PRIORITY_HIGH)
+        # nothing below HIGH left to evict
+        assert not sink.submit(ch, content="high 3", priority=LOG_PRIORITY_HIGH)
+        await sink.close()
+        return ch, sink
+
+    ch, sink = _run(go())
+    assert [m["content"] for m in ch.sent] == ["high 1\nhigh 2"]
+    assert sink.metrics["dropped"][LOG_PRIORITY_LOW] == 1
+    assert sink.metrics["dropped"][LOG_PRIORITY_HIGH] == 1
+
+
+def test_duplicate_ids_are_dropped():
+    async def go():
+        sink = LogSink(flush_interval=3600)
+        ch = FakeChannel(1)
+        assert sink.submit(ch, content="once", deduplication_id="test-log-sink-dupe")
+        assert not sink.submit(ch, content="once", deduplication_id="test-log-sink-dupe")
+        await sink.close()
+        return ch, sink
+
+    ch, sink = _run(go())
+    assert len(ch.sent) == 1
+    assert sink.metrics["deduped"] == 1
+
+
+def test_full_group_wakes_the_flusher():
+    async def go():
+        sink = LogSink(flush_interval=3600)
+        ch = FakeChannel(1)
+        for _ in range(MAX_EMBEDS_PER_MESSAGE):
+            sink.submit(ch, _embed())
+        for _ in range(20):
+            await asyncio.sleep(0)
+            if ch.sent:
+                break
+        sent_before_close = [len(m["embeds"]) for m in ch.sent]
+        await sink.close()
+        return sent_before_close
+
+    assert _run(go()) == [MAX_EMBEDS_PER_MESSAGE]
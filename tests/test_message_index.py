@@ -0,0 +1,77 @@
+# tests/test_message_index.py
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from cogs.stats.message_stats.message_index import cog as index_cog
+from cogs.stats.message_stats.message_index.store import IndexedMessage, MessageIndex
+
+CHANNEL = 100
+
+
+@pytest.fixture
+def index(tmp_path):
+    idx = MessageIndex(str(tmp_path / "index.sqlite3"))
+    idx.add(IndexedMessage(1, CHANNEL, 10, 0, "hello world", (20,)))
+    idx.add(IndexedMessage(2, CHANNEL, 11, 0, "hello there", (20, 21)))
+    idx.add(IndexedMessage(3, CHANNEL, 10, 0, "unrelated", ()))
+    yield idx
+    idx.close()
+
+
+@pytest.fixture
+def cog(index, monkeypatch):
+    monkeypatch.setattr(index_cog, "get_message_index", lambda: index)
+    return index_cog.MessageIndexCog(bot=None)
+
+
+def _edit(message_id: int, **data):
+    return SimpleNamespace(message_id=message_id, data=data)
+
+
+def test_edit_reindexes_content(cog, index):
+    asyncio.run(cog.on_raw_message_edit(_edit(3, content="hello again", mentions=[])))
+
+    assert index.count_by_author(CHANNEL, "hello") == {"10": 2, "11": 1}
+    assert index.count_by_author(CHANNEL, "unrelated") == {}
+    assert [row[0] for row in index.search("again")] == [3]
+
+
+def test_edit_replaces_mentions(cog, index):
+    asyncio.run(cog.on_raw_message_edit(_edit(2, content="hello there", mentions=[{"id": "22"}])))
+
+    assert index.count_mentions(CHANNEL, "hello") == {"20": 1, "22": 1}
+
+
+def test_edit_without_mentions_field_keeps_them(cog, index):
+    asyncio.run(cog.on_raw_message_edit(_edit(2, content="hello there!")))
+
+    assert index.count_mentions(CHANNEL, "hello") == {"20": 2, "21": 1}
+
+
+def test_embed_only_update_is_ignored(cog, index):
+    asyncio.run(cog.on_raw_message_edit(_edit(1, embeds=[])))
+
+    assert [row[3] for row in index.search("hello world")] == ["hello world"]
+
+
+def test_edit_of_unknown_message_is_a_no_op(cog, index):
+    asyncio.run(cog.on_raw_message_edit(_edit(99, content="hello", mentions=[{"id": "5"}])))
+
+    assert index.count_mentions(CHANNEL, "hello") == {"20": 2, "21": 1}
+
+
+def test_delete_drops_row_text_and_mentions(cog, index):
+    asyncio.run(cog.on_raw_message_delete(SimpleNamespace(message_id=2)))
+
+    assert index.count_by_author(CHANNEL, "hello") == {"10": 1}
+    assert index.count_mentions(CHANNEL, "hello") == {"20": 1}
+    assert index.search("there") == []
+
+
+def test_bulk_delete(cog, index):
+    asyncio.run(cog.on_raw_bulk_message_delete(SimpleNamespace(message_ids={1, 2})))
+
+    assert index.count_by_author(CHANNEL, "hello") == {}
+    assert [row[0] for row in index.search("unrelated")] == [3]
@@ -0,0 +1,126 @@
+# tests/test_purge_range.py
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import discord
+
+from cogs.admin.delete.purge import range as purge
+from cogs.admin.delete.purge.range import BULK_DELETE_MAX, purge_range
+
+
+def _http_error(cls=discord.HTTPException):
+    return cls(SimpleNamespace(status=404 if cls is discord.NotFound else 500, reason="test"), "test")
+
+
+class FakeMessage:
+    def __init__(self, channel, message_id: int, author_id: int, age: timedelta, error=None):
+        self.channel = channel
+        self.id = message_id
+        self.author = SimpleNamespace(id=author_id)
+        self.created_at = datetime.now(timezone.utc) - age
+        self.error = error
+
+    async def delete(self):
+        if self.error is not None:
+            raise self.error
+        self.channel.single_deletes.append(self.id)
+
+
+class FakeChannel:
+    def __init__(self):
+        self.messages: list[FakeMessage] = []
+        self.history_calls: list[dict] = []
+        self.bulk_deletes: list[list[int]] = []
+        self.single_deletes: list[int] = []
+
+    def add(self, message_id: int, *, author_id: int = 1, age: timedelta = timedelta(hours=1), error=None):
+        self.messages.append(FakeMessage(self, message_id, author_id, age, error))
+
+    def history(self, *, limit, after, before, oldest_first):
+        self.history_calls.append({"limit": limit, "after": after.id, "before": before.id, "oldest_first": oldest_first})
+
+        async def gen():
+            # Discord only returns the requested window, newest first
+            for m in sorted(self.messages, key=lambda m: m.id, reverse=True):
+                if after.id < m.id < before.id:
+                    yield m
+        return gen()
+
+    async def delete_messages(self, chunk):
+        self.bulk_deletes.append(sorted(m.id for m in chunk))
+
+
+def test_only_the_range_is_fetched():
+    ch = FakeChannel()
+    for i in range(1, 11):
+        ch.add(i)
+
+    deleted, failed = asyncio.run(purge_range(ch, 3, 7))
+
+    assert ch.history_calls == [{"limit": None, "after": 2, "before": 8, "oldest_first": False}]
+    assert ch.bulk_deletes == [[3, 4, 5, 6, 7]]
+    assert (deleted, failed) == (5, 0)
+
+
+def test_young_messages_go_out_in_chunks_of_100():
+    ch = FakeChannel()
+    for i in range(1, 251):
+        ch.add(i)
+
+    deleted, failed = asyncio.run(purge_range(ch, 1, 250))
+
+    assert [len(c) for c in ch.bulk_deletes] == [BULK_DELETE_MAX, BULK_DELETE_MAX, 50]
+    assert sorted(i for c in ch.bulk_deletes for i in c) == list(range(1, 251))
+    assert not ch.single_deletes
+    assert deleted == 250
+
+
+def test_old_messages_are_deleted_one_by_one():
+    ch = FakeChannel()
+    ch.add(1, age=timedelta(days=30))
+    ch.add(2, age=timedelta(days=20))
+    ch.add(3)
+
+    deleted, failed = asyncio.run(purge_range(ch, 1, 3))
+
+    assert ch.bulk_deletes == [[3]]
+    assert sorted(ch.single_deletes) == [1, 2]
+    assert (deleted, failed) == (3, 0)
+
+
+def test_author_filter():
+    ch = FakeChannel()
+    for i in range(1, 7):
+        ch.add(i, author_id=1 if i % 2 else 2)
+
+    deleted, _ = asyncio.run(purge_range(ch, 1, 6, author_id=2))
+
+    assert ch.bulk_deletes == [[2, 4, 6]]
+    assert deleted == 3
+
+
+def test_failures_are_counted_and_vanished_messages_ignored():
+    ch = FakeChannel()
+    ch.add(1, age=timedelta(days=30), error=_http_error(discord.NotFound))
+    ch.add(2, age=timedelta(days=30), error=_http_error())
+    ch.add(3, age=timedelta(days=30))
+
+    deleted, failed = asyncio.run(purge_range(ch, 1, 3))
+
+    assert (deleted, failed) == (1, 1)
+
+
+def test_progress_is_reported_at_the_end(monkeypatch):
+    monkeypatch.setattr(purge, "PROGRESS_EVERY_SECONDS", 3600)
+    ch = FakeChannel()
+    for i in range(1, 4):
+        ch.add(i)
+    reports = []
+
+    async def progress(deleted, failed):
+        reports.append((deleted, failed))
+
+    asyncio.run(purge_range(ch, 1, 3, progress=progress))
+
+    assert reports == [(3, 0)]
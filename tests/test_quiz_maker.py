@@ -0,0 +1,322 @@
+# tests/test_quiz_maker.py
+import asyncio
+import json
+import threading
+
+import pytest
+
+from cogs.engagement.quiz_maker import adaptive, question_cache
+from cogs.engagement.quiz_maker.chunking import allocate_questions, split_into_sections
+from cogs.engagement.quiz_maker.question_cache import QuestionCache
+from cogs.engagement.quiz_maker.quiz_session import Question, QuizSession
+from cogs.engagement.quiz_maker.stats import QuizResult, QuizStatsStore
+
+
+# ── chunking ─────────────────────────────────────────────────────────────────
+
+def _paragraphs(count: int, size: int) -> str:
+    return "\n\n".join(f"Paragraph {i}. " + "word " * (size // 5) for i in range(count))
+
+
+def test_sections_respect_the_size_limit_and_keep_all_text():
+    text = _paragraphs(40, 900)
+    sections = split_into_sections(text, section_chars=3000)
+
+    assert len(sections) > 1
+    assert all(len(s) <= 3000 for s in sections)
+    assert "".join(sections).replace("\n", "").replace(" ", "") == text.replace("\n", "").replace(" ", "")
+
+
+def test_oversized_paragraph_is_split_on_sentences():
+    block = " ".join(f"Sentence number {i} is here." for i in range(400))
+    sections = split_into_sections(block, section_chars=1000)
+
+    assert all(len(s) <= 1000 for s in sections)
+    assert all(s.endswith(".") for s in sections)
+
+
+def test_empty_text_has_no_sections():
+    assert split_into_sections("   \n\n ") == []
+
+
+def test_allocation_sums_to_the_request_and_spans_the_document():
+    sections = ["x" * 1000] * 20
+    counts = allocate_questions(sections, 10, max_sections=5)
+
+    assert sum(counts) == 10
+    used = [i for i, c in enumerate(counts) if c]
+    assert len(used) == 5
+    assert used[0] == 0 and used[-1] >= 15     # first and last part of the document
+
+
+def test_allocation_follows_section_length():
+    counts = allocate_questions(["x" * 3000, "x" * 1000], 8)
+
+    assert counts == [6, 2]
+
+
+def test_every_picked_section_gets_a_question():
+    counts = allocate_questions(["x" * 10_000, "x" * 10, "x" * 10], 3)
+
+    assert counts == [1, 1, 1]
+
+
+def test_fewer_questions_than_sections():
+    counts = allocate_questions(["x"] * 10, 2)
+
+    assert sum(counts) == 2 and counts.count(1) == 2
+
+
+# ── question cache ───────────────────────────────────────────────────────────
+
+class FakeGenerator:
+    """Stands in for build_questions_from_text: numbered, never-repeating questions."""
+
+    def __init__(self):
+        self.calls: list[int] = []
+        self.fail = False
+
+    async def __call__(self, client, text, n, *, level, model, existing_questions):
+        self.calls.append(n)
+        if self.fail:
+            raise RuntimeError("model unavailable")
+        start = sum(self.calls[:-1])
+        return [
+            Question(prompt=f"Q{start + i}", choices=["a", "b", "c", "d"], correct_index=1, explanation="")
+            for i in range(n)
+        ]
+
+
+@pytest.fixture
+def generator(monkeypatch):
+    gen = FakeGenerator()
+    monkeypatch.setattr(question_cache, "build_questions_from_text", gen)
+    return gen
+
+
+def _ask(cache: QuestionCache, n: int, text: str = "document", **kwargs) -> list[Question]:
+    async def go():
+        try:
+            return await cache.get_questions(None, text, n, model="test-model", **kwargs)
+        finally:
+            await cache.flush()                # what the debounce timer would do
+    return asyncio.run(go())
+
+
+def test_repeat_requests_are_served_from_the_cache(tmp_path, generator):
+    cache = QuestionCache(tmp_path / "cache.json")
+    first = _ask(cache, 5)
+    reloaded = QuestionCache(tmp_path / "cache.json")
+    second = _ask(reloaded, 5)
+
+    assert generator.calls == [5, 5]           # second round tops up, new prompts only
+    assert not {q.prompt for q in first} & {q.prompt for q in second}
+
+
+def test_round_restarts_once_the_pool_is_full(tmp_path, generator, monkeypatch):
+    monkeypatch.setattr(question_cache, "MAX_POOL_QUESTIONS", 6)
+    cache = QuestionCache(tmp_path / "cache.json")
+
+    first = _ask(cache, 3)
+    second = _ask(cache, 3)
+    third = _ask(cache, 3)
+
+    assert generator.calls == [3, 3]
+    assert len({q.prompt for q in first + second}) == 6
+    assert {q.prompt for q in third} <= {q.prompt for q in first + second}
+
+
+def test_answers_stay_correct_after_shuffling(tmp_path, generator):
+    cache = QuestionCache(tmp_path / "cache.json")
+    for q in _ask(cache, 10):
+        assert q.choices[q.correct_index] == "b"
+
+
+def test_failed_top_up_falls_back_to_a_new_round(tmp_path, generator):
+    cache = QuestionCache(tmp_path / "cache.json")
+    served = {q.prompt for q in _ask(cache, 4)}
+    generator.fail = True
+
+    again = _ask(cache, 4)
+
+    assert {q.prompt for q in again} == served
+
+
+def test_failed_generation_with_nothing_cached_raises(tmp_path, generator):
+    cache = QuestionCache(tmp_path / "cache.json")
+    generator.fail = True
+
+    with pytest.raises(RuntimeError):
+        _ask(cache, 3)
+    assert cache._load() == {}
+    assert cache._locks == {}
+
+
+def test_existing_questions_are_not_served(tmp_path, generator, monkeypatch):
+    monkeypatch.setattr(question_cache, "MAX_POOL_QUESTIONS", 4)
+    cache = QuestionCache(tmp_path / "cache.json")
+    _ask(cache, 4)                             # pool full and fully served
+
+    picked = _ask(cache, 2, existing_questions=["Q0", "Q1"])
+
+    assert not {q.prompt for q in picked} & {"Q0", "Q1"}
+
+
+def test_eviction_drops_least_recently_used_documents(tmp_path, generator, monkeypatch):
+    cache = QuestionCache(tmp_path / "cache.json")
+    _ask(cache, 3, text="old")
+    _ask(cache, 3, text="new")
+    size = max(e["size"] for e in cache._load().values())
+    # room for one slightly larger document, not two
+    monkeypatch.setattr(question_cache, "MAX_CACHE_BYTES", int(size * 1.5))
+
+    _ask(cache, 1, text="new")
+
+    with open(tmp_path / "cache.json", encoding="utf-8") as f:
+        entries = json.load(f)
+    assert len(entries) == 1
+    assert len(next(iter(entries.values()))["questions"]) == 4
+
+
+def test_saves_are_debounced_and_encoded_off_the_loop(tmp_path, generator, monkeypatch):
+    monkeypatch.setattr(question_cache, "SAVE_DELAY_SECONDS", 0.01)
+    cache = QuestionCache(tmp_path / "cache.json")
+    writes = []
+    real_write = cache._write
+
+    def write(snapshot):
+        writes.append(threading.current_thread() is threading.main_thread())
+        real_write(snapshot)
+    cache._write = write
+
+    async def go():
+        for _ in range(3):
+            await cache.get_questions(None, "document", 2, model="test-model")
+        assert writes == []                    # nothing written yet
+        await asyncio.sleep(0.05)
+
+    asyncio.run(go())
+
+    assert writes == [False]                   # one write, from a worker thread
+    assert len(QuestionCache(tmp_path / "cache.json")._load()) == 1
+
+
+def test_flush_now_writes_pending_changes(tmp_path, generator):
+    cache = QuestionCache(tmp_path / "cache.json")
+    asyncio.run(cache.get_questions(None, "document", 2, model="test-model"))
+    assert not (tmp_path / "cache.json").exists()
+
+    cache.flush_now()
+
+    assert len(QuestionCache(tmp_path / "cache.json")._load()) == 1
+
+
+# ── adaptive prefetch ────────────────────────────────────────────────────────
+
+def _adaptive_session() -> QuizSession:
+    return QuizSession(user_id=1, channel_id=1, questions=[], level="adaptive", source_text="document")
+
+
+async def _hanging_prefetch() -> asyncio.Task:
+    started = asyncio.Event()
+
+    async def prefetch():
+        started.set()
+        await asyncio.sleep(3600)
+
+    task = asyncio.create_task(prefetch())
+    await started.wait()
+    return task
+
+
+def test_cancelled_prefetch_leaves_the_caller_to_generate_live():
+    async def go():
+        session = _adaptive_session()
+        task = session.prefetch_tasks["medium"] = await _hanging_prefetch()
+        asyncio.get_running_loop().call_later(0.01, task.cancel)
+        return await adaptive._take_prefetched(session, "medium", 3)
+
+    assert asyncio.run(go()) == []
+
+
+def test_cancelling_the_waiter_still_propagates():
+    async def go():
+        session = _adaptive_session()
+        task = session.prefetch_tasks["medium"] = await _hanging_prefetch()
+        waiter = asyncio.create_task(adaptive._take_prefetched(session, "medium", 3))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        alive = not task.done()
+        task.cancel()
+        return alive
+
+    assert asyncio.run(go())                   # the shared prefetch keeps running
+
+
+# ── stats store ──────────────────────────────────────────────────────────────
+
+def _result(user_id: int, score: int, total: int = 10, guild_id: int = 1, fastest: float = 2.0) -> QuizResult:
+    return QuizResult(
+        user_id=user_id, guild_id=guild_id, channel_id=5, score=score, total_questions=total,
+        percent=score * 100.0 / total, difficulty_mode="medium", total_time=30.0, average_time=3.0,
+        fastest_time=fastest, slowest_time=5.0, timestamp=0.0,
+    )
+
+
+def test_stats_survive_a_restart_via_index_and_log_tail(tmp_path, monkeypatch):
+    monkeypatch.setattr("cogs.engagement.quiz_maker.stats.INDEX_FLUSH_EVERY", 3)
+    store = QuizStatsStore(tmp_path / "quiz_stats.json")
+    for score in (5, 7, 9, 4):                 # index covers 3, the 4th is log tail
+        store.add_result(_result(1, score))
+    store.add_result(_result(2, 10, fastest=1.0))
+
+    reloaded = QuizStatsStore(tmp_path / "quiz_stats.json")
+    stats = reloaded.get_user_stats(1, 1)
+
+    assert stats["quizzes_played"] == 4
+    assert stats["total_score"] == 25
+    assert stats["best_score"] == 9
+    assert stats["avg_percent"] == pytest.approx(62.5)
+    assert [e["user_id"] for e in reloaded.get_leaderboard(1)] == [2, 1]
+
+
+def test_torn_last_line_is_skipped_and_next_append_is_clean(tmp_path):
+    store = QuizStatsStore(tmp_path / "quiz_stats.json")
+    store.add_result(_result(1, 5))
+    with store.log_path.open("ab") as f:
+        f.write(b'{"user_id": 1, "sco')         # crash mid-append
+
+    reloaded = QuizStatsStore(tmp_path / "quiz_stats.json")
+    assert reloaded.get_user_stats(1, 1)["quizzes_played"] == 1
+    reloaded.add_result(_result(1, 7))
+
+    again = QuizStatsStore(tmp_path / "quiz_stats.json")
+    stats = again.get_user_stats(1, 1)
+    assert stats["quizzes_played"] == 2
+    assert stats["total_score"] == 12
+
+
+def test_rebuilds_when_the_log_is_shorter_than_the_index(tmp_path, monkeypatch):
+    monkeypatch.setattr("cogs.engagement.quiz_maker.stats.INDEX_FLUSH_EVERY", 1)
+    store = QuizStatsStore(tmp_path / "quiz_stats.json")
+    store.add_result(_result(1, 5))
+    store.add_result(_result(1, 6))
+    store.log_path.write_text(json.dumps(_result(3, 8).__dict__) + "\n")   # log replaced
+
+    reloaded = QuizStatsStore(tmp_path / "quiz_stats.json")
+
+    assert reloaded.get_user_stats(1, 1) is None
+    assert reloaded.get_user_stats(1, 3)["total_score"] == 8
+
+
+def test_legacy_json_is_imported(tmp_path):
+    legacy = tmp_path / "quiz_stats.json"
+    legacy.write_text(json.dumps([_result(1, 3).__dict__, _result(1, 4, guild_id=None).__dict__]))
+
+    store = QuizStatsStore(legacy)
+
+    assert store.get_user_stats(1, 1)["total_score"] == 3
+    assert store.get_user_stats(None, 1)["total_score"] == 4
+    assert store.log_path.exists()
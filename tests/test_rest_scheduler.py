@@ -0,0 +1,220 @@
+# tests/test_rest_scheduler.py
+import asyncio
+import time
+
+import pytest
+
+from utils import rest_scheduler
+from utils.rest_scheduler import (
+    PRIORITY_BOOKKEEPING,
+    PRIORITY_COSMETIC,
+    PRIORITY_USER_FACING,
+    MutationScheduler,
+    member_route,
+    reaction_route,
+)
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def _recorder(log: list, name, delay: float = 0.0):
+    async def mutation():
+        log.append(name)
+        if delay:
+            await asyncio.sleep(delay)
+        return name
+    return lambda: mutation()
+
+
+def test_queued_mutations_with_the_same_key_coalesce():
+    async def go():
+        sched = MutationScheduler(max_in_flight=1)
+        ran = []
+        futures = [
+            sched.submit(member_route(1, 42), _recorder(ran, f"nick {i}"), key=("nick", 42))
+            for i in range(3)
+        ]
+        results = await asyncio.gather(*futures)
+        return sched, ran, futures, results
+
+    sched, ran, futures, results = _run(go())
+    assert ran == ["nick 2"]                   # latest wins
+    assert results == ["nick 2"] * 3
+    assert sched.metrics["coalesced"] == 2
+    assert sched.metrics["executed"] == 1
+
+
+def test_coalescing_only_applies_before_the_job_starts():
+    async def go():
+        sched = MutationScheduler(max_in_flight=1)
+        ran = []
+        first = sched.submit(member_route(1, 42), _recorder(ran, "a", delay=0.01), key="k")
+        await asyncio.sleep(0.001)             # "a" is running now
+        second = sched.submit(member_route(1, 42), _recorder(ran, "b"), key="k")
+        await asyncio.gather(first, second)
+        return ran, first, second
+
+    ran, first, second = _run(go())
+    assert ran == ["a", "b"]
+    assert first.result() == "a" and second.result() == "b"
+
+
+def test_higher_priority_runs_first():
+    async def go():
+        sched = MutationScheduler(max_in_flight=1)
+        ran = []
+        futures = [
+            sched.submit("r:cosmetic", _recorder(ran, "cosmetic"), priority=PRIORITY_COSMETIC),
+            sched.submit("r:bookkeeping", _recorder(ran, "bookkeeping"), priority=PRIORITY_BOOKKEEPING),
+            sched.submit("r:user", _recorder(ran, "user"), priority=PRIORITY_USER_FACING),
+        ]
+        await asyncio.gather(*futures)
+        return ran
+
+    assert _run(go()) == ["user", "bookkeeping", "cosmetic"]
+
+
+def test_coalescing_can_raise_priority():
+    async def go():
+        sched = MutationScheduler(max_in_flight=1)
+        ran = []
+        futures = [
+            sched.submit("r:1", _recorder(ran, "other"), priority=PRIORITY_BOOKKEEPING),
+            sched.submit("r:2", _recorder(ran, "roles"), key="roles", priority=PRIORITY_COSMETIC),
+            sched.submit("r:2", _recorder(ran, "roles"), key="roles", priority=PRIORITY_USER_FACING),
+        ]
+        await asyncio.gather(*futures)
+        return ran
+
+    assert _run(go()) == ["roles", "other"]
+
+
+def test_one_call_in_flight_per_route():
+    async def go():
+        sched = MutationScheduler(max_in_flight=4)
+        active = {"now": 0, "max": 0}
+
+        async def mutation():
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+            await asyncio.sleep(0.005)
+            active["now"] -= 1
+
+        await asyncio.gather(*(sched.submit(member_route(1, 42), mutation) for _ in range(5)))
+        return active["max"]
+
+    assert _run(go()) == 1
+
+
+def test_different_members_run_concurrently():
+    async def go():
+        sched = MutationScheduler(max_in_flight=4)
+        active = {"now": 0, "max": 0}
+
+        async def mutation():
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+            await asyncio.sleep(0.005)
+            active["now"] -= 1
+
+        await asyncio.gather(*(sched.submit(member_route(1, m), mutation) for m in range(8)))
+        return active["max"]
+
+    assert _run(go()) == 4
+
+
+def test_fifo_within_a_priority_across_routes():
+    async def go():
+        sched = MutationScheduler(max_in_flight=1)
+        ran = []
+        futures = [sched.submit(f"r:{i % 3}", _recorder(ran, i)) for i in range(6)]
+        await asyncio.gather(*futures)
+        return ran
+
+    assert _run(go()) == list(range(6))
+
+
+def test_cancelling_one_caller_leaves_the_shared_job_alone():
+    async def go():
+        sched = MutationScheduler(max_in_flight=1)
+        ran = []
+        blocker = sched.submit("r:busy", _recorder(ran, "blocker", delay=0.01))
+        first = sched.submit(member_route(1, 42), _recorder(ran, "nick"), key="nick")
+        second = sched.submit(member_route(1, 42), _recorder(ran, "nick"), key="nick")
+        first.cancel()
+        return await second, first.cancelled(), await blocker, ran
+
+    result, first_cancelled, _, ran = _run(go())
+    assert result == "nick" and first_cancelled
+    assert ran == ["blocker", "nick"]
+
+
+def test_cancelled_mutation_fails_its_callers_and_keeps_the_worker():
+    async def go():
+        sched = MutationScheduler(max_in_flight=1)
+
+        async def cancelled():
+            raise asyncio.CancelledError
+
+        fut = sched.submit(member_route(1, 42), cancelled)
+        with pytest.raises(RuntimeError):
+            await fut
+        return sched, await sched.submit(member_route(1, 42), _recorder([], "after"))
+
+    sched, ok = _run(go())
+    assert ok == "after"
+    assert sched.metrics["failed"] == 1
+
+
+def test_cosmetic_work_is_shed_when_the_queue_is_full():
+    async def go():
+        sched = MutationScheduler(max_in_flight=1, max_queued=2)
+        ran = []
+        kept = [sched.submit(f"r:{i}", _recorder(ran, i)) for i in range(2)]
+        shed = sched.submit("r:c", _recorder(ran, "cosmetic"), priority=PRIORITY_COSMETIC)
+        assert shed.done() and shed.result() is None
+        urgent = sched.submit("r:u", _recorder(ran, "urgent"), priority=PRIORITY_USER_FACING)
+        await asyncio.gather(*kept, urgent)
+        return sched, ran
+
+    sched, ran = _run(go())
+    assert "cosmetic" not in ran and "urgent" in ran
+    assert sched.metrics["shed"] == 1
+
+
+def test_failures_reach_the_caller():
+    async def go():
+        sched = MutationScheduler(max_in_flight=1)
+
+        async def boom():
+            raise ValueError("nope")
+
+        fut = sched.submit(member_route(1, 42), boom)
+        with pytest.raises(ValueError):
+            await fut
+        ok = await sched.submit(member_route(1, 42), _recorder([], "after"))
+        return sched, ok
+
+    sched, ok = _run(go())
+    assert ok == "after"
+    assert sched.metrics["failed"] == 1
+
+
+def test_route_spacing_delays_the_next_call(monkeypatch):
+    monkeypatch.setitem(rest_scheduler.ROUTE_SPACING, "reactions", 0.05)
+
+    async def go():
+        sched = MutationScheduler(max_in_flight=2)
+        stamps = []
+
+        async def mutation():
+            stamps.append(time.monotonic())
+
+        route = reaction_route(7)
+        await asyncio.gather(sched.submit(route, mutation), sched.submit(route, mutation))
+        return stamps
+
+    first, second = _run(go())
+    assert second - first >= 0.05
@@ -0,0 +1,95 @@
+# tests/test_role_assign.py
+import asyncio
+from dataclasses import dataclass
+
+import pytest
+
+from cogs.server.roles import assign
+
+EVERYONE, NEWCOMER, BRONZE, SILVER = 1, 2, 100, 200
+
+
+@dataclass(frozen=True, order=True)
+class FakeRole:
+    id: int
+
+
+class FakeGuild:
+    def __init__(self):
+        self.server_roles: set[int] = set()   # what Discord currently has for the member
+        self.edits: list[set[int]] = []
+
+    def get_role(self, role_id):
+        return FakeRole(role_id)
+
+    async def fetch_member(self, member_id):
+        return FakeMember(self, member_id, self.server_roles)
+
+
+class FakeMember:
+    bot = False
+
+    def __init__(self, guild: FakeGuild, member_id: int, role_ids):
+        self.guild = guild
+        self.id = member_id
+        self.roles = [FakeRole(EVERYONE)] + [FakeRole(r) for r in sorted(role_ids)]
+
+    async def edit(self, *, roles, reason):
+        self.guild.server_roles = {r.id for r in roles}
+        self.guild.edits.append(set(self.guild.server_roles))
+
+
+@pytest.fixture
+def payouts(monkeypatch):
+    paid = []
+    monkeypatch.setattr(assign, "LOOT_AND_LEGENDS_ROLES", [(BRONZE, 0), (SILVER, 50)])
+    monkeypatch.setattr(assign, "LEVEL_UP_REWARDS", {1: (10, 1, 1)})
+    monkeypatch.setattr(assign, "MEMBER_ROLE_ID", NEWCOMER)
+    monkeypatch.setattr(assign, "get_xp", lambda user_id: 60)
+    monkeypatch.setattr(assign, "update_coins", lambda uid, amount, reason: paid.append(("coins", amount)))
+    monkeypatch.setattr(assign, "update_orbs", lambda uid, amount, reason: paid.append(("orbs", amount)))
+    monkeypatch.setattr(assign, "update_stars", lambda uid, amount, reason: paid.append(("stars", amount)))
+
+    async def announce(member, role, rewards):
+        paid.append(("announce", role.id))
+    monkeypatch.setattr(assign, "announce_role_upgrade", announce)
+    return paid
+
+
+def test_tier_up_is_one_edit_and_one_payout(payouts):
+    guild = FakeGuild()
+    guild.server_roles = {NEWCOMER, BRONZE, 7}
+    stale = FakeMember(guild, 5, guild.server_roles)
+
+    asyncio.run(assign.assign_role_based_on_xp(stale, guild))
+
+    assert guild.edits == [{SILVER, 7}]
+    assert payouts == [("coins", 10), ("orbs", 1), ("stars", 1), ("announce", SILVER)]
+
+
+def test_repeat_sync_before_the_gateway_update_pays_nothing(payouts):
+    guild = FakeGuild()
+    guild.server_roles = {NEWCOMER, BRONZE}
+    stale = FakeMember(guild, 5, guild.server_roles)
+
+    async def go():
+        await assign.assign_role_based_on_xp(stale, guild)
+        # the cached member still shows BRONZE: the second sync computes the same upgrade
+        await assign.assign_role_based_on_xp(stale, guild)
+
+    asyncio.run(go())
+
+    assert len(guild.edits) == 1
+    assert [p for p in payouts if p[0] == "announce"] == [("announce", SILVER)]
+    assert [p for p in payouts if p[0] == "coins"] == [("coins", 10)]
+
+
+def test_roles_added_elsewhere_are_kept(payouts):
+    guild = FakeGuild()
+    guild.server_roles = {NEWCOMER, BRONZE}
+    stale = FakeMember(guild, 5, guild.server_roles)
+    guild.server_roles = {NEWCOMER, BRONZE, 9}         # granted after our snapshot
+
+    asyncio.run(assign.assign_role_based_on_xp(stale, guild))
+
+    assert guild.edits == [{SILVER, 9}]
@@ -0,0 +1,248 @@
+# tests/test_transcription_queue.py
+import asyncio
+import hashlib
+import os
+import tempfile
+import threading
+from types import SimpleNamespace
+
+from cogs.voice.transcription import tasks
+from cogs.voice.transcription.service import FakeSTT, NullSTT
+from cogs.voice.transcription.tasks import MAX_AUDIO_BYTES, TranscriptionQueue
+
+
+class CountingSTT:
+    """Async engine that records calls and can be held open by a test."""
+    run_in = "async"
+
+    def __init__(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.hold = False
+
+    async def transcribe(self, audio_bytes, filename, user_id):
+        self.calls += 1
+        if self.hold:
+            await self.release.wait()
+        return f"text of {audio_bytes.read().decode()}"
+
+
+def _message(message_id: int):
+    return SimpleNamespace(id=message_id, author=SimpleNamespace(id=1))
+
+
+def _attachment(attachment_id: int, audio: bytes = b"audio", size: int | None = None):
+    return SimpleNamespace(
+        id=attachment_id, filename=f"voice-{attachment_id}.ogg", url="", size=len(audio) if size is None else size,
+        audio=audio,
+    )
+
+
+async def _local_download(attachment):
+    fd, path = tempfile.mkstemp(prefix="stt_test_")
+    with os.fdopen(fd, "wb") as f:
+        f.write(attachment.audio)
+    return path, hashlib.sha256(attachment.audio).hexdigest(), len(attachment.audio)
+
+
+def _queue(engine, results: list | None = None, workers: int = 2) -> TranscriptionQueue:
+    async def on_result(message, attachment, text):
+        if results is not None:
+            results.append((message.id, text))
+
+    q = TranscriptionQueue(engine, on_result=on_result, workers=workers)
+    q._download = _local_download
+    return q
+
+
+async def _until(predicate, timeout: float = 2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not reached")
+        await asyncio.sleep(0.001)
+
+
+# ── overflow ─────────────────────────────────────────────────────────────────
+
+def test_overflow_drops_the_oldest_waiting_job(monkeypatch):
+    monkeypatch.setattr(tasks, "MAX_QUEUED", 3)
+    monkeypatch.setattr(tasks, "OVERFLOW_POLICY", "drop_oldest")
+    q = _queue(CountingSTT())
+
+    accepted = [q.submit(_message(i), _attachment(i)) for i in range(5)]
+
+    assert accepted == [True] * 5
+    assert [job.message.id for job in q._queue] == [2, 3, 4]
+    assert q.metrics["dropped"] == 2
+
+
+def test_overflow_can_reject_the_new_job(monkeypatch):
+    monkeypatch.setattr(tasks, "MAX_QUEUED", 3)
+    monkeypatch.setattr(tasks, "OVERFLOW_POLICY", "drop_newest")
+    q = _queue(CountingSTT())
+
+    accepted = [q.submit(_message(i), _attachment(i)) for i in range(5)]
+
+    assert accepted == [True, True, True, False, False]
+    assert [job.message.id for job in q._queue] == [0, 1, 2]
+
+
+def test_oversized_and_null_engine_jobs_are_never_queued():
+    q = _queue(CountingSTT())
+    assert not q.submit(_message(1), _attachment(1, size=MAX_AUDIO_BYTES + 1))
+
+    null = _queue(NullSTT())
+    assert not null.submit(_message(2), _attachment(2))
+    assert not q._queue and not null._queue
+
+
+# ── dedupe ───────────────────────────────────────────────────────────────────
+
+def test_repeated_attachment_events_are_dropped():
+    q = _queue(CountingSTT())
+
+    assert q.submit(_message(1), _attachment(7))
+    assert not q.submit(_message(1), _attachment(7))
+    assert len(q._queue) == 1
+    assert q.metrics["deduped"] == 1
+
+
+def test_identical_audio_is_transcribed_once():
+    async def go():
+        engine = CountingSTT()
+        results = []
+        q = _queue(engine, results)
+        q.start()
+        q.submit(_message(1), _attachment(1, b"same"))
+        q.submit(_message(2), _attachment(2, b"same"))
+        await _until(lambda: len(results) == 2)
+        q.submit(_message(3), _attachment(3, b"same"))   # served from the result cache
+        await _until(lambda: len(results) == 3)
+        await q.close()
+        return engine, results
+
+    engine, results = asyncio.run(go())
+    assert engine.calls == 1
+    assert sorted(results) == [(1, "text of same"), (2, "text of same"), (3, "text of same")]
+
+
+def test_in_flight_duplicate_waits_for_the_first_job():
+    async def go():
+        engine = CountingSTT()
+        engine.hold = True
+        results = []
+        q = _queue(engine, results)
+        q.start()
+        q.submit(_message(1), _attachment(1, b"same"))
+        q.submit(_message(2), _attachment(2, b"same"))
+        await _until(lambda: engine.calls == 1 and q.metrics["deduped"] == 1)
+        engine.release.set()
+        await _until(lambda: len(results) == 2)
+        await q.close()
+        return engine, results
+
+    engine, results = asyncio.run(go())
+    assert engine.calls == 1
+    assert {text for _, text in results} == {"text of same"}
+
+
+def test_timed_out_job_fails_its_waiters_but_keeps_workers(monkeypatch):
+    monkeypatch.setattr(tasks, "JOB_TIMEOUT_SECONDS", 0.05)
+
+    async def go():
+        engine = CountingSTT()
+        engine.hold = True
+        results = []
+        q = _queue(engine, results)
+        q.start()
+        q.submit(_message(1), _attachment(1, b"slow"))
+        q.submit(_message(2), _attachment(2, b"slow"))
+        await _until(lambda: q.metrics["failed"] == 2)
+        alive = [not t.done() for t in q._tasks]
+
+        engine.hold = False
+        q.submit(_message(3), _attachment(3, b"fast"))
+        await _until(lambda: len(results) == 1)
+        await q.close()
+        return alive, results
+
+    alive, results = asyncio.run(go())
+    assert alive == [True, True]
+    assert results == [(3, "text of fast")]
+
+
+def test_close_stops_the_workers():
+    async def go():
+        q = _queue(CountingSTT())
+        q.start()
+        tasks_ = list(q._tasks)
+        await q.close()
+        return tasks_
+
+    assert all(t.done() for t in asyncio.run(go()))
+
+
+def test_blocking_engines_run_in_the_thread_pool():
+    async def go():
+        results = []
+        q = _queue(FakeSTT(delay=0, run_in="thread"), results)
+        q.start()
+        q.submit(_message(1), _attachment(1, b"abc"))
+        await _until(lambda: results)
+        await q.close()
+        return results
+
+    [(message_id, text)] = asyncio.run(go())
+    assert message_id == 1 and text.startswith("(fake transcript of voice-1.ogg")
+
+
+
+class BlockingSTT:
+    """Thread engine whose calls block until the test lets them go."""
+    run_in = "thread"
+
+    def __init__(self):
+        self.gate = threading.Event()
+        self.lock = threading.Lock()
+        self.running = 0
+        self.calls = 0
+
+    def transcribe_file(self, path, filename, user_id):
+        with self.lock:
+            self.running += 1
+            self.calls += 1
+        self.gate.wait(5)
+        with self.lock:
+            self.running -= 1
+        with open(path, "rb") as f:        # still there after our job timed out
+            return f"text of {f.read().decode()}"
+
+
+def test_timed_out_calls_keep_their_slot_until_they_end(monkeypatch, tmp_path):
+    monkeypatch.setattr(tasks, "JOB_TIMEOUT_SECONDS", 0.05)
+
+    async def go():
+        engine = BlockingSTT()
+        results = []
+        q = _queue(engine, results)
+        q.start()
+        for i in range(4):
+            q.submit(_message(i), _attachment(i, f"audio {i}".encode()))
+        # the first two jobs time out, but their calls are still running
+        await _until(lambda: q.metrics["failed"] == 2)
+        await asyncio.sleep(0.2)
+        blocked = (engine.running, len(q._queue), q.metrics["failed"])
+
+        engine.gate.set()
+        await _until(lambda: q.metrics["done"] == 2)
+        await _until(lambda: not os.listdir(tmp))
+        await q.close()
+        return engine, blocked, results
+
+    tmp = str(tmp_path)
+    monkeypatch.setattr(tempfile, "tempdir", tmp)
+    engine, blocked, results = asyncio.run(go())
+    assert blocked == (2, 2, 2)      # the waiting jobs were not started, nor timed out
+    assert engine.calls == 4
+    assert sorted(results) == [(2, "text of audio 2"), (3, "text of audio 3")]
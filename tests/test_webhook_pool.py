@@ -0,0 +1,61 @@
+# tests/test_webhook_pool.py
+import asyncio
+from types import SimpleNamespace
+
+import discord
+import pytest
+
+from utils.webhook_pool import UNKNOWN_WEBHOOK, WebhookPool
+
+
+def _not_found(code: int) -> discord.NotFound:
+    return discord.NotFound(SimpleNamespace(status=404, reason="Not Found"), {"code": code, "message": "test"})
+
+
+class FakeHook:
+    def __init__(self, errors: list):
+        self.errors = errors
+        self.sent = 0
+
+    async def send(self, **kwargs):
+        if self.errors:
+            raise self.errors.pop(0)
+        self.sent += 1
+        return "message"
+
+
+@pytest.fixture
+def pool(tmp_path):
+    return WebhookPool(bot=None, path=str(tmp_path / "pool.json"))
+
+
+def _seed(pool: WebhookPool, channel_id: int, hook: FakeHook) -> None:
+    pool._hooks[channel_id] = hook
+    pool._tokens[channel_id] = {"id": 1, "token": "t"}
+
+
+def test_unknown_webhook_is_recreated_once(pool):
+    stale, fresh = FakeHook([_not_found(UNKNOWN_WEBHOOK)]), FakeHook([])
+    _seed(pool, 5, stale)
+
+    async def recreate(channel):
+        return fresh
+    pool._adopt_or_create = recreate
+
+    result = asyncio.run(pool.send(SimpleNamespace(id=5), username="cat"))
+
+    assert result == "message"
+    assert fresh.sent == 1
+    assert pool.metrics["recovered"] == 1
+
+
+def test_other_not_found_errors_keep_the_webhook(pool):
+    hook = FakeHook([_not_found(10003)])       # unknown channel
+    _seed(pool, 5, hook)
+
+    with pytest.raises(discord.NotFound):
+        asyncio.run(pool.send(SimpleNamespace(id=5), username="cat"))
+
+    assert pool._hooks[5] is hook
+    assert 5 in pool._tokens
+    assert pool.metrics["recovered"] == 0
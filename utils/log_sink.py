@@ -0,0 +1,233 @@
+# utils/log_sink.py
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+
+import discord
+
+from configs.config_logging import logging
+from utils.webhook_pool import send_as_webhook, is_duplicate
+
+# Priorities: higher drains first and survives overflow longer.
+LOG_PRIORITY_HIGH = 2     # audit trail: coin transactions, role changes, deletions
+LOG_PRIORITY_NORMAL = 1   # economy feed: donations, streaks, invite rewards
+LOG_PRIORITY_LOW = 0      # ambient: presence "is Online!"
+
+FLUSH_INTERVAL_SECONDS = 2.0
+MAX_QUEUED = 1000
+# Discord limits per message
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
+MAX_CONTENT_CHARS = 2000
+
+_ALLOWED_MENTIONS = discord.AllowedMentions(users=True, roles=False, everyone=False)
+
+
+@dataclass
+class _LogEntry:
+    channel: discord.abc.Messageable
+    persona: str | None
+    embed: discord.Embed | None
+    content: str | None
+
+
+class LogSink:
+    """
+    Coalescing outbound sink for log-channel traffic.
+
+    submit() is synchronous and never touches the network: entries are queued
+    per priority and a single background task packs them into as few messages
+    as possible (up to 10 embeds each, grouped by destination channel and
+    persona). A group that fills a whole message wakes the flusher early.
+    The queue is bounded; on overflow the oldest lowest-priority entry is
+    dropped and counted.
+    """
+
+    def __init__(self, flush_interval: float = FLUSH_INTERVAL_SECONDS, max_queued: int = MAX_QUEUED):
+        self.flush_interval = flush_interval
+        self.max_queued = max_queued
+        self._queues: dict[int, deque[_LogEntry]] = {
+            p: deque() for p in (LOG_PRIORITY_HIGH, LOG_PRIORITY_NORMAL, LOG_PRIORITY_LOW)
+        }
+        self._group_sizes: dict[tuple, int] = {}
+        self._wake: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self.metrics = {
+            "queued": 0,
+            "sent_messages": 0,
+            "sent_entries": 0,
+            "deduped": 0,
+            "send_failures": 0,
+            "dropped": {p: 0 for p in self._queues},
+        }
+
+    # ── producer side ─────────────────────────────────────────────────────────
+
+    def submit(
+        self,
+        channel: discord.abc.Messageable | None,
+        embed: discord.Embed | None = None,
+        *,
+        content: str | None = None,
+        persona: str | None = None,
+        priority: int = LOG_PRIORITY_NORMAL,
+        deduplication_id: str | None = None,
+    ) -> bool:
+        """Queue one log line. Returns False if it was dropped (dupe/overflow/no channel)."""
+        if channel is None or (embed is None and not content):
+            return False
+        if deduplication_id is not None and is_duplicate(deduplication_id):
+            self.metrics["deduped"] += 1
+            return False
+
+        if self._size() >= self.max_queued and not self._make_room(priority):
+            self.metrics["dropped"][priority] += 1
+            return False
+
+        entry = _LogEntry(channel=channel, persona=persona, embed=embed, content=content)
+        self._queues[priority].append(entry)
+        self.metrics["queued"] += 1
+
+        key = self._group_key(entry)
+        size = self._group_sizes.get(key, 0) + 1
+        self._group_sizes[key] = size
+        self._ensure_running()
+        if size >= MAX_EMBEDS_PER_MESSAGE and self._wake is not None:
+            self._wake.set()
+        return True
+
+    def _size(self) -> int:
+        return sum(len(q) for q in self._queues.values())
+
+    def _make_room(self, priority: int) -> bool:
+        # evict the oldest entry of the lowest priority strictly below ours
+        for p in sorted(self._queues):
+            if p >= priority:
+                break
+            q = self._queues[p]
+            if q:
+                victim = q.popleft()
+                self._forget(victim)
+                self.metrics["dropped"][p] += 1
+                return True
+        return False
+
+    @staticmethod
+    def _group_key(entry: _LogEntry) -> tuple:
+        return (entry.channel.id, entry.persona)
+
+    def _forget(self, entry: _LogEntry) -> None:
+        key = self._group_key(entry)
+        left = self._group_sizes.get(key, 0) - 1
+        if left > 0:
+            self._group_sizes[key] = left
+        else:
+            self._group_sizes.pop(key, None)
+
+    # ── consumer side ─────────────────────────────────────────────────────────
+
+    def _ensure_running(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        self._wake = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logging.warning(f"[LogSink] Flush failed: {e}")
+
+    async def flush(self) -> None:
+        """Drain everything queued right now, highest priority first."""
+        for priority in sorted(self._queues, reverse=True):
+            q = self._queues[priority]
+            if not q:
+                continue
+            groups: dict[tuple, list[_LogEntry]] = {}
+            while q:
+                entry = q.popleft()
+                self._forget(entry)
+                groups.setdefault(self._group_key(entry), []).append(entry)
+            for entries in groups.values():
+                for batch in self._pack(entries):
+                    await self._send(batch)
+
+    @staticmethod
+    def _pack(entries: list[_LogEntry]) -> list[list[_LogEntry]]:
+        batches: list[list[_LogEntry]] = []
+        cur: list[_LogEntry] = []
+        n_embeds = embed_chars = content_chars = 0
+        for e in entries:
+            e_len = len(e.embed) if e.embed is not None else 0
+            c_len = len(e.content) + 1 if e.content else 0
+            full = (
+                (e.embed is not None and n_embeds >= MAX_EMBEDS_PER_MESSAGE)
+                or embed_chars + e_len > MAX_EMBED_CHARS_PER_MESSAGE
+                or content_chars + c_len > MAX_CONTENT_CHARS
+            )
+            if cur and full:
+                batches.append(cur)
+                cur, n_embeds, embed_chars, content_chars = [], 0, 0, 0
+            cur.append(e)
+            n_embeds += e.embed is not None
+            embed_chars += e_len
+            content_chars += c_len
+        if cur:
+            batches.append(cur)
+        return batches
+
+    async def _send(self, batch: list[_LogEntry]) -> None:
+        head = batch[0]
+        embeds = [e.embed for e in batch if e.embed is not None]
+        content = "\n".join(e.content for e in batch if e.content) or None
+        kwargs = {"embeds": embeds or None, "content": content, "allowed_mentions": _ALLOWED_MENTIONS}
+        try:
+            if head.persona:
+                msg = await send_as_webhook(head.channel, head.persona, **kwargs)
+                ok = msg is not None
+            else:
+                await head.channel.send(**{k: v for k, v in kwargs.items() if v is not None})
+                ok = True
+        except Exception as e:
+            logging.warning(f"[LogSink] Send to {getattr(head.channel, 'id', '?')} failed: {e}")
+            ok = False
+        if ok:
+            self.metrics["sent_messages"] += 1
+            self.metrics["sent_entries"] += len(batch)
+        else:
+            self.metrics["send_failures"] += 1
+
+    async def close(self) -> None:
+        """Stop the flusher and push out whatever is still queued."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+        await self.flush()
+
+
+_sink: LogSink | None = None
+
+
+def get_log_sink() -> LogSink:
+    global _sink
+    if _sink is None:
+        _sink = LogSink()
+    return _sink
+
+
+def queue_log(channel, embed: discord.Embed | None = None, **kwargs) -> bool:
+    """Shorthand for get_log_sink().submit(...)."""
+    return get_log_sink().submit(channel, embed, **kwargs)
@@ -0,0 +1,326 @@
+# utils/rest_scheduler.py
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Hashable
+
+import discord
+
+from configs.config_logging import logging
+
+# Priority classes (lower value runs first)
+PRIORITY_USER_FACING = 0   # someone is waiting on it: admin commands, shop purchases
+PRIORITY_BOOKKEEPING = 1   # state must converge: XP roles, donation reaction removal
+PRIORITY_COSMETIC = 2      # nice to have: nickname suffixes, auto-reactions, VC counters
+
+# Mutations in flight across all routes
+MAX_IN_FLIGHT = 4
+# Above this depth new cosmetic work is shed instead of queued
+MAX_QUEUED = 2000
+# Minimum gap between calls on the same route, by route kind (Discord buckets)
+ROUTE_SPACING = {
+    "reactions": 0.25,   # reaction add/remove is ~1 per 0.25 s per channel
+}
+
+MutationFactory = Callable[[], Awaitable[Any]]
+
+
+def member_route(guild_id: int, member_id: int) -> str:
+    """
+    Role and nickname edits for one member. Edits to the same member are
+    serialized; discord.py still paces the shared guild member bucket.
+    """
+    return f"guild:{guild_id}:member:{member_id}"
+
+
+def reaction_route(channel_id: int) -> str:
+    return f"channel:{channel_id}:reactions"
+
+
+def channel_route(channel_id: int) -> str:
+    return f"channel:{channel_id}:edit"
+
+
+def message_route(channel_id: int) -> str:
+    """Message edits are bucketed per channel, separately from channel edits."""
+    return f"channel:{channel_id}:messages"
+
+
+def _consume(future: asyncio.Future) -> None:
+    # fire-and-forget callers never look at the result; don't warn about it
+    future.cancelled() or future.exception()
+
+
+@dataclass
+class _Mutation:
+    route: str
+    key: Hashable | None
+    factory: MutationFactory
+    priority: int
+    future: asyncio.Future
+    seq: int
+    enqueued_at: float = field(default_factory=time.monotonic)
+    taken: bool = False
+
+
+class MutationScheduler:
+    """
+    Central queue for REST mutations that would otherwise be fired ad hoc.
+
+    - One call in flight per route (a route ≈ a Discord rate-limit bucket,
+      or a single member for role/nickname edits),
+      with per-kind spacing and a cooldown when a 429 leaks through.
+    - Priority classes: user-facing > bookkeeping > cosmetic.
+    - Coalescing: a mutation submitted with a `key` that is already queued
+      (not started) replaces the queued one — latest wins, and every caller
+      gets the same result. Three nickname refreshes become one edit.
+    - Each caller gets its own shielded view of the result, so one caller
+      being cancelled never cancels the mutation for the others.
+    - Work is passed as a factory (e.g. `lambda: member.edit(...)`) so
+      replaced mutations never create a coroutine.
+
+    Queued jobs live in a heap per route; routes that are free to run sit in
+    a ready heap keyed by their best job, and cooling routes in a timer heap,
+    so taking the next job never rescans the backlog. Heap entries are
+    invalidated lazily (a taken or re-prioritized job is skipped on pop).
+    """
+
+    def __init__(self, max_in_flight: int = MAX_IN_FLIGHT, max_queued: int = MAX_QUEUED):
+        self.max_in_flight = max_in_flight
+        self.max_queued = max_queued
+        # route -> heap of (priority, seq, job)
+        self._route_jobs: dict[str, list[tuple[int, int, _Mutation]]] = {}
+        # (priority, seq, route) for idle routes whose head job can run now
+        self._ready: list[tuple[int, int, str]] = []
+        # (ready_at, route) for idle routes still in their spacing/429 cooldown
+        self._cooling: list[tuple[float, str]] = []
+        self._depth: dict[int, int] = {p: 0 for p in (PRIORITY_USER_FACING, PRIORITY_BOOKKEEPING, PRIORITY_COSMETIC)}
+        self._seq = itertools.count()
+        self._pending: dict[Hashable, _Mutation] = {}
+        self._busy_routes: set[str] = set()
+        self._route_ready_at: dict[str, float] = {}
+        self._wake: asyncio.Event | None = None
+        self._workers: list[asyncio.Task] = []
+        self.metrics = {
+            "submitted": 0,
+            "coalesced": 0,
+            "executed": 0,
+            "failed": 0,
+            "shed": 0,
+            "rate_limited": 0,
+            "max_depth": 0,
+            "wait_seconds_total": 0.0,
+        }
+
+    # ── producer side ─────────────────────────────────────────────────────────
+
+    def submit(
+        self,
+        route: str,
+        factory: MutationFactory,
+        *,
+        key: Hashable | None = None,
+        priority: int = PRIORITY_BOOKKEEPING,
+    ) -> asyncio.Future:
+        """Queue a mutation. Await the returned future for its result (optional)."""
+        self.metrics["submitted"] += 1
+        loop = asyncio.get_running_loop()
+
+        if key is not None and key in self._pending:
+            job = self._pending[key]
+            job.factory = factory
+            if priority < job.priority:
+                # the old heap entry goes stale; the job keeps its place in line
+                self._depth[job.priority] -= 1
+                self._depth[priority] += 1
+                job.priority = priority
+                heapq.heappush(self._route_jobs[job.route], (priority, job.seq, job))
+                self._offer(job.route)
+            self.metrics["coalesced"] += 1
+            return self._handle(job.future)
+
+        future = loop.create_future()
+        future.add_done_callback(_consume)
+
+        if priority == PRIORITY_COSMETIC and self.depth() >= self.max_queued:
+            self.metrics["shed"] += 1
+            future.set_result(None)
+            return future
+
+        job = _Mutation(route=route, key=key, factory=factory, priority=priority, future=future, seq=next(self._seq))
+        heapq.heappush(self._route_jobs.setdefault(route, []), (priority, job.seq, job))
+        self._depth[priority] += 1
+        if key is not None:
+            self._pending[key] = job
+        self.metrics["max_depth"] = max(self.metrics["max_depth"], self.depth())
+
+        self._ensure_workers()
+        self._offer(route)
+        self._wake.set()
+        return self._handle(future)
+
+    @staticmethod
+    def _handle(future: asyncio.Future) -> asyncio.Future:
+        """A per-caller view of a shared result: cancelling it leaves the job and other callers alone."""
+        outer = asyncio.shield(future)
+        outer.add_done_callback(_consume)
+        return outer
+
+    def depth(self) -> int:
+        return sum(self._depth.values())
+
+    def depth_by_priority(self) -> dict[int, int]:
+        return dict(self._depth)
+
+    # ── consumer side ─────────────────────────────────────────────────────────
+
+    def _ensure_workers(self) -> None:
+        self._workers = [w for w in self._workers if not w.done()]
+        if self._wake is None:
+            self._wake = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        while len(self._workers) < self.max_in_flight:
+            self._workers.append(loop.create_task(self._worker()))
+
+    def _head(self, route: str) -> tuple[int, int, _Mutation] | None:
+        """The route's next live job, dropping stale heap entries on the way."""
+        heap = self._route_jobs.get(route)
+        while heap:
+            priority, seq, job = heap[0]
+            if not job.taken and job.priority == priority:
+                return heap[0]
+            heapq.heappop(heap)
+        self._route_jobs.pop(route, None)
+        return None
+
+    def _offer(self, route: str) -> None:
+        """Make an idle route with queued work visible to the workers."""
+        if route in self._busy_routes:
+            return
+        head = self._head(route)
+        if head is None:
+            return
+        ready_at = self._route_ready_at.get(route, 0.0)
+        if ready_at > time.monotonic():
+            heapq.heappush(self._cooling, (ready_at, route))
+        else:
+            heapq.heappush(self._ready, (head[0], head[1], route))
+
+    def _take_ready(self) -> tuple[_Mutation | None, float | None]:
+        """Highest-priority job whose route is free; else seconds until a route cools down."""
+        now = time.monotonic()
+        while self._cooling and self._cooling[0][0] <= now:
+            _, route = heapq.heappop(self._cooling)
+            if self._route_ready_at.get(route, 0.0) <= now:
+                self._route_ready_at.pop(route, None)
+            self._offer(route)
+
+        while self._ready:
+            priority, seq, route = heapq.heappop(self._ready)
+            if route in self._busy_routes:
+                continue  # re-offered when the running job finishes
+            head = self._head(route)
+            if head is None or head[:2] != (priority, seq):
+                continue  # stale: the route's current head has its own entry
+            heapq.heappop(self._route_jobs[route])
+            if not self._route_jobs[route]:
+                del self._route_jobs[route]
+            job = head[2]
+            job.taken = True
+            self._depth[job.priority] -= 1
+            if job.key is not None and self._pending.get(job.key) is job:
+                del self._pending[job.key]
+            return job, None
+
+        if self._cooling:
+            return None, max(self._cooling[0][0] - now, 0.0)
+        return None, None
+
+    async def _worker(self) -> None:
+        while True:
+            job, wait = self._take_ready()
+            if job is None:
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._run(job)
+            # a route freed up: let idle workers rescan
+            self._wake.set()
+
+    async def _run(self, job: _Mutation) -> None:
+        self._busy_routes.add(job.route)
+        self.metrics["wait_seconds_total"] += time.monotonic() - job.enqueued_at
+        kind = job.route.rsplit(":", 1)[-1]
+        spacing = ROUTE_SPACING.get(kind, 0.0)
+        try:
+            result = await job.factory()
+            self.metrics["executed"] += 1
+            if not job.future.done():
+                job.future.set_result(result)
+        except discord.HTTPException as e:
+            self.metrics["failed"] += 1
+            if e.status == 429:
+                self.metrics["rate_limited"] += 1
+                spacing = max(spacing, float(getattr(e, "retry_after", 1.0) or 1.0))
+            logging.warning(f"[RestScheduler] {job.route} mutation failed: {e}")
+            if not job.future.done():
+                job.future.set_exception(e)
+        except asyncio.CancelledError:
+            self.metrics["failed"] += 1
+            task = asyncio.current_task()
+            if task is not None and task.cancelling():
+                raise  # the worker itself is being stopped
+            # the mutation was cancelled underneath us: the worker carries on
+            logging.warning(f"[RestScheduler] {job.route} mutation was cancelled")
+        except Exception as e:
+            self.metrics["failed"] += 1
+            logging.warning(f"[RestScheduler] {job.route} mutation raised: {e}")
+            if not job.future.done():
+                job.future.set_exception(e)
+        finally:
+            if not job.future.done():
+                # callers get an ordinary failure, never a future left pending
+                job.future.set_exception(RuntimeError(f"{job.route} mutation was cancelled"))
+            self._busy_routes.discard(job.route)
+            if spacing:
+                ready_at = time.monotonic() + spacing
+                self._route_ready_at[job.route] = ready_at
+                heapq.heappush(self._cooling, (ready_at, job.route))
+            else:
+                self._offer(job.route)
+
+    def snapshot_metrics(self) -> dict:
+        executed = self.metrics["executed"] + self.metrics["failed"]
+        return {
+            **self.metrics,
+            "depth": self.depth_by_priority(),
+            "avg_wait_seconds": (self.metrics["wait_seconds_total"] / executed) if executed else 0.0,
+        }
+
+
+_scheduler: MutationScheduler | None = None
+
+
+def get_mutation_scheduler() -> MutationScheduler:
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = MutationScheduler()
+    return _scheduler
+
+
+def schedule_mutation(
+    route: str,
+    factory: MutationFactory,
+    *,
+    key: Hashable | None = None,
+    priority: int = PRIORITY_BOOKKEEPING,
+) -> asyncio.Future:
+    """Shorthand for get_mutation_scheduler().submit(...)."""
+    return get_mutation_scheduler().submit(route, factory, key=key, priority=priority)
@@ -13,6 +13,7 @@ from configs.config_channels import (
     BOT_PLAYGROUND_CHANNEL_ID
 )
 from configs.config_channels import LOGS_CHANNEL_ID
+from utils.log_sink import queue_log, LOG_PRIORITY_HIGH
 from openai import OpenAI
 
 # Initialize OpenAI client (needed for GPT emoji functions)
@@ -22,7 +23,7 @@ client = OpenAI(api_key=OPENAI_API_KEY)
 from bot import get_bot
 bot = get_bot()
 
-async def log_coin_transaction(ctx, sender: discord.Member, receiver: discord.Member, coins: int, status: str):
+async def log_coin_transaction(ctx, sender: discord.Member, receiver: discord.Member, coins: int, status: str, fee: int = 0):
     """
     Logs a coin transaction to the staff logs channel.
     """
@@ -35,13 +36,14 @@ async def log_coin_transaction(ctx, sender: discord.Member, receiver: discord.Me
                 f"**Sender:** {sender.mention} ({sender.id})\n"
                 f"**Receiver:** {receiver.mention} ({receiver.id})\n"
                 f"**Amount:**  🪙 {coins}\n"
-                f"**Status:** {status.capitalize()}"
+                + (f"**Fee:**  🪙 {fee}\n" if fee else "")
+                + f"**Status:** {status.capitalize()}"
             ),
             color=color,
             timestamp=discord.utils.utcnow()
         )
         embed.set_footer(text=f"Initiated by {ctx.author}", icon_url=ctx.author.avatar.url if ctx.author.avatar else None)
-        await channel.send(embed=embed)
+        queue_log(channel, embed, priority=LOG_PRIORITY_HIGH)
 
 def increment_json_count(filepath, user_id: int):
     data = load_json(filepath)
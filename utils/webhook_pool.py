@@ -0,0 +1,196 @@
+# utils/webhook_pool.py
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict, defaultdict
+
+import discord
+
+from configs.config_logging import logging
+from configs.helper import PERSONAS
+from configs.config_pets import HUMAN_PERSONAS
+from utils.utils_json import load_json, save_json
+
+# channel_id -> {"id": webhook_id, "token": webhook_token}
+WEBHOOK_POOL_FILE = "database/webhook_pool.json"
+WEBHOOK_NAME = "Infinity Bot"
+# Log pool metrics every N sends
+METRICS_LOG_EVERY = 500
+# How many recent deduplication ids are remembered
+DEDUPE_MEMORY = 2048
+# Discord JSON error code for "Unknown Webhook"
+UNKNOWN_WEBHOOK = 10015
+
+
+class WebhookPool:
+    """
+    One webhook per channel, reused for every persona.
+
+    - Lazily created (or adopted if the bot already owns one) on first send.
+    - id/token persisted to WEBHOOK_POOL_FILE so restarts don't re-fetch.
+    - Rebuilt from the token with the bot's own HTTP session (no extra
+      aiohttp sessions, views keep working).
+    - If Discord says the webhook is gone, it is dropped and recreated once.
+    - Persona name/avatar are per-send overrides, never a new webhook.
+    """
+
+    def __init__(self, bot: discord.Client, path: str = WEBHOOK_POOL_FILE):
+        self.bot = bot
+        self.path = path
+        self._hooks: dict[int, discord.Webhook] = {}
+        self._tokens: dict[int, dict] = {}
+        for cid, entry in (load_json(path, default_value={}) or {}).items():
+            try:
+                self._tokens[int(cid)] = {"id": int(entry["id"]), "token": str(entry["token"])}
+            except Exception:
+                continue
+        self._locks: defaultdict[int, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self.metrics = {
+            "sends": 0,
+            "cache_hits": 0,      # webhook already in memory
+            "restored": 0,        # rebuilt from the persisted token
+            "adopted": 0,         # found an existing bot-owned webhook
+            "created": 0,
+            "recovered": 0,       # webhook was deleted, recreated
+            "failures": 0,
+            "rest_calls_saved": 0,
+        }
+
+    def _persist(self) -> None:
+        save_json(self.path, {str(cid): entry for cid, entry in self._tokens.items()})
+
+    async def get(self, channel: discord.abc.GuildChannel) -> discord.Webhook:
+        cid = channel.id
+        hook = self._hooks.get(cid)
+        if hook is not None:
+            self.metrics["cache_hits"] += 1
+            # a per-call lookup would have been a GET /channels/{id}/webhooks
+            self.metrics["rest_calls_saved"] += 1
+            return hook
+
+        async with self._locks[cid]:
+            hook = self._hooks.get(cid)
+            if hook is not None:
+                self.metrics["cache_hits"] += 1
+                self.metrics["rest_calls_saved"] += 1
+                return hook
+
+            saved = self._tokens.get(cid)
+            if saved:
+                hook = discord.Webhook.partial(saved["id"], saved["token"], client=self.bot)
+                self.metrics["restored"] += 1
+                self.metrics["rest_calls_saved"] += 1
+            else:
+                hook = await self._adopt_or_create(channel)
+            self._hooks[cid] = hook
+            return hook
+
+    async def _adopt_or_create(self, channel) -> discord.Webhook:
+        me = self.bot.user
+        hook = None
+        for wh in await channel.webhooks():
+            if wh.token and wh.user and me and wh.user.id == me.id:
+                hook = wh
+                self.metrics["adopted"] += 1
+                break
+        if hook is None:
+            hook = await channel.create_webhook(name=WEBHOOK_NAME)
+            self.metrics["created"] += 1
+        self._tokens[channel.id] = {"id": hook.id, "token": hook.token}
+        self._persist()
+        return hook
+
+    def invalidate(self, channel_id: int) -> None:
+        self._hooks.pop(channel_id, None)
+        if self._tokens.pop(channel_id, None) is not None:
+            self._persist()
+
+    async def send(self, channel, *, username: str, avatar_url: str | None = None, **kwargs):
+        """Send as `username` through the channel's pooled webhook. Returns the WebhookMessage."""
+        host = channel
+        if isinstance(channel, discord.Thread):
+            # webhooks live on the parent; the thread is a send target
+            host = channel.parent
+            kwargs["thread"] = channel
+
+        self.metrics["sends"] += 1
+        if self.metrics["sends"] % METRICS_LOG_EVERY == 0:
+            logging.info(f"[Webhook] Pool metrics: {self.metrics}")
+        for attempt in range(2):
+            hook = await self.get(host)
+            try:
+                return await hook.send(username=username, avatar_url=avatar_url, wait=True, **kwargs)
+            except discord.NotFound as e:
+                if e.code != UNKNOWN_WEBHOOK:
+                    # unknown channel/thread/message: the webhook itself is fine
+                    raise
+                # deleted from the channel settings (or token revoked)
+                self.invalidate(host.id)
+                if attempt:
+                    raise
+                self.metrics["recovered"] += 1
+                for f in [kwargs.get("file"), *(kwargs.get("files") or [])]:
+                    if f is not None:
+                        f.reset()
+
+
+_pool: WebhookPool | None = None
+_recent_dedupe_ids: OrderedDict[str, None] = OrderedDict()
+
+
+def get_webhook_pool() -> WebhookPool:
+    global _pool
+    if _pool is None:
+        from bot import get_bot
+        _pool = WebhookPool(get_bot())
+    return _pool
+
+
+def is_duplicate(deduplication_id: str) -> bool:
+    """True if this id was already seen recently; otherwise remember it."""
+    if deduplication_id in _recent_dedupe_ids:
+        return True
+    _recent_dedupe_ids[deduplication_id] = None
+    while len(_recent_dedupe_ids) > DEDUPE_MEMORY:
+        _recent_dedupe_ids.popitem(last=False)
+    return False
+
+
+def _resolve_persona(pet_type: str) -> tuple[str, str | None]:
+    # PERSONAS entries are {"name", "avatar"} (see the avatar/profile cogs that
+    # register "custom"); human personas only guarantee a "name".
+    persona = PERSONAS.get(pet_type) or HUMAN_PERSONAS.get(pet_type) or {}
+    return persona.get("name") or pet_type, persona.get("avatar")
+
+
+async def send_as_webhook(target, pet_type: str, **kwargs):
+    """
+    Post as a persona. `target` can be a Context, Message, channel/thread or
+    anything with a `.channel`. Returns the sent message, or None on failure.
+
+    `deduplication_id` (optional) drops repeat sends with the same id.
+    """
+    dedupe = kwargs.pop("deduplication_id", None)
+    if dedupe is not None and is_duplicate(dedupe):
+        return None
+
+    channel = getattr(target, "channel", target)
+    # None means "not given" for every optional send field
+    kwargs = {k: v for k, v in kwargs.items() if v is not None}
+
+    if not isinstance(channel, (discord.TextChannel, discord.Thread, discord.VoiceChannel, discord.StageChannel)):
+        # DMs and other non-webhook channels: plain send
+        try:
+            return await channel.send(**kwargs)
+        except Exception as e:
+            logging.warning(f"[Webhook] Plain send fallback failed: {e}")
+            return None
+
+    username, avatar_url = _resolve_persona(pet_type)
+    pool = get_webhook_pool()
+    try:
+        return await pool.send(channel, username=username, avatar_url=avatar_url, **kwargs)
+    except Exception as e:
+        pool.metrics["failures"] += 1
+        logging.warning(f"[Webhook] send_as_webhook({pet_type}) failed in #{getattr(channel, 'name', channel)}: {e}")
+        return None